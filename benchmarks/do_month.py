@@ -0,0 +1,107 @@
+"""
+Benchmark of State_Data.do_month - measures the time of one month and the
+number of Arithmetic_Dict objects (Resources, Soldiers, ...) allocated
+during it. Time of State_Data.digest and memory kept by the state are
+measured for comparison (see benchmarks/memory.py for details of memory).
+Run from the repository root:
+python -m benchmarks.do_month [MONTHS] [COHORTS]
+"""
+import json
+import sys
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Generator
+
+from sources.abstract_interface.memory_usage import state_size
+from sources.auxiliaries.arithmetic_dict import Arithmetic_Dict
+from sources.state.state_data import State_Data
+
+
+def load_starting_state(richness: float = 5) -> State_Data:
+    """
+    Loads the starting save, with all resources multiplied by richness so
+    that the country survives long enough to be measured.
+    """
+    with open("saves/starting/starting_state.json", 'r',
+              encoding="utf-8") as load_file:
+        data = json.load(load_file)
+    for social_class in data["classes"].values():
+        for res in social_class["resources"]:
+            social_class["resources"][res] *= richness
+    for res in data["government"]["resources"]:
+        data["government"]["resources"][res] *= richness
+    return State_Data.from_dict(data)
+
+
+@contextmanager
+def count_allocations() -> Generator[list[int], None, None]:
+    """
+    Counts Arithmetic_Dict objects (including subclasses) created inside the
+    with block. The yielded list's only element is the count.
+    """
+    counter = [0]
+    old_new = Arithmetic_Dict.__dict__.get("__new__")
+
+    def counting_new(cls: type, *args: Any, **kwargs: Any) -> Any:
+        counter[0] += 1
+        return dict.__new__(cls)
+
+    Arithmetic_Dict.__new__ = counting_new  # type: ignore
+    try:
+        yield counter
+    finally:
+        if old_new is None:
+            del Arithmetic_Dict.__new__  # type: ignore
+        else:
+            Arithmetic_Dict.__new__ = old_new  # type: ignore
+
+
+def run(months: int = 60, cohorts: int = 0) -> dict[str, float]:
+    """
+    Runs the given number of months and returns the measurements. If cohorts
+    is positive, classes are split into that many wealth cohorts.
+    """
+    state = load_starting_state()
+    if cohorts > 0:
+        state.split_into_cohorts(cohorts)
+    with count_allocations() as allocations:
+        for _ in range(months):
+            state.do_month()
+
+    state = load_starting_state()
+    if cohorts > 0:
+        state.split_into_cohorts(cohorts)
+    start = perf_counter()
+    digest_elapsed = 0.0
+    for _ in range(months):
+        state.do_month()
+        digest_start = perf_counter()
+        state.digest()
+        digest_elapsed += perf_counter() - digest_start
+    elapsed = perf_counter() - start - digest_elapsed
+
+    return {
+        "months": months,
+        "cohorts": cohorts,
+        "allocations_per_month": allocations[0] / months,
+        "ms_per_month": 1000 * elapsed / months,
+        "ms_per_digest": 1000 * digest_elapsed / months,
+        "kib_per_state": state_size(state).size / 1024
+    }
+
+
+def main(arguments: list[str]) -> None:
+    months = int(arguments[1]) if len(arguments) > 1 else 60
+    cohorts = int(arguments[2]) if len(arguments) > 2 else 0
+    results = run(months, cohorts)
+    split = f" with {cohorts} cohorts" if cohorts > 0 else ""
+    print(f"do_month over {results['months']} months{split}:")
+    print(f"  Arithmetic_Dict allocations per month: "
+          f"{results['allocations_per_month']:.1f}")
+    print(f"  time per month: {results['ms_per_month']:.3f} ms")
+    print(f"  time per state digest: {results['ms_per_digest']:.3f} ms")
+    print(f"  memory kept by the state: {results['kib_per_state']:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,281 @@
+"""
+Golden-trace parity harness - replays a corpus of command scripts and
+compares the data of every month (Month_Data.flat_values) with traces
+recorded before, reporting the largest relative error of every metric.
+Optimizations of do_month, Market or Arithmetic_Dict mustn't change the
+results. Scenarios are described in golden_traces/scenarios.json and their
+traces are stored next to it in a binary format (see write_trace).
+Scenarios are replayed in parallel.
+Run from the repository root:
+python -m benchmarks.golden [check|record] [WORKERS] [SCENARIO ...]
+"""
+import json
+import os.path
+import struct
+import sys
+import zlib
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import chain
+from os import cpu_count
+from typing import Any, Iterable, NamedTuple
+
+from sources.abstract_interface.comparison import relative_gap
+from sources.state.month_data import FLAT_KEYS
+from sources.state.state_data_base_and_do_month import (EveryoneDeadError,
+                                                        RebellionError)
+
+from .do_month import load_starting_state
+
+TRACES_DIR = os.path.join(os.path.dirname(__file__), "golden_traces")
+SCENARIOS_FILE_NAME = "scenarios.json"
+# Beginning of every trace file, followed by the length of the JSON header
+TRACE_MAGIC = b"KGT1"
+# Largest relative error (see relative_gap) which still passes the check
+TOLERANCE = 1e-9
+
+
+class Trace(NamedTuple):
+    """
+    Flat values of the months of a scenario, with the names of the metrics
+    (FLAT_KEYS when the trace was recorded). error is the name of the
+    exception which ended the scenario (e.g. RebellionError), if any.
+    """
+    keys: tuple[str, ...]
+    months: list[tuple[float, ...]]
+    error: str | None
+
+
+class Metric_Error(NamedTuple):
+    """
+    The largest relative error of a metric in a scenario.
+    """
+    metric: str
+    month: int
+    expected: float
+    actual: float
+    error: float
+
+
+class Parity_Report(NamedTuple):
+    """
+    Result of checking a scenario. errors are the largest errors of the
+    metrics which differ, the largest first. Months and errors ending the
+    scenario are given as recorded and as replayed now.
+    """
+    scenario: str
+    expected_months: int
+    months: int
+    expected_error: str | None
+    error: str | None
+    errors: list[Metric_Error]
+
+    def passed(self, tolerance: float = TOLERANCE) -> bool:
+        """
+        Returns whether the replay matches the trace.
+        """
+        return self.expected_months == self.months and \
+            self.expected_error == self.error and \
+            all(error.error <= tolerance for error in self.errors)
+
+
+def load_scenarios(traces_dir: str = TRACES_DIR) -> dict[str, Any]:
+    """
+    Returns descriptions of the scenarios - dicts with commands executed
+    on the starting state with resources multiplied by richness, split into
+    cohorts (if given).
+    """
+    with open(os.path.join(traces_dir, SCENARIOS_FILE_NAME), 'r',
+              encoding="utf-8") as file:
+        return json.load(file)
+
+
+def replay_scenario(scenario: dict[str, Any]) -> Trace:
+    """
+    Executes the commands of the scenario and returns data of its months.
+    """
+    state = load_starting_state(scenario.get("richness", 1))
+    if scenario.get("cohorts", 0) > 0:
+        state.split_into_cohorts(scenario["cohorts"])
+    months: list[tuple[float, ...]] = []
+    for line in scenario["commands"]:
+        command = line.split(' ')
+        if command[0] != "next":
+            state.execute_commands([line])
+            continue
+        for _ in range(int(command[1])):
+            try:
+                month_data = state.do_month()
+            except (EveryoneDeadError, RebellionError) as e:
+                return Trace(FLAT_KEYS, months, type(e).__name__)
+            months.append(month_data.flat_values())
+    return Trace(FLAT_KEYS, months, None)
+
+
+def write_trace(path: str, trace: Trace) -> None:
+    """
+    Writes the trace to a binary file: TRACE_MAGIC, the length of the JSON
+    header (unsigned 32-bit little-endian), the header (keys, number of
+    months and error) and zlib-compressed values of the months, as 64-bit
+    little-endian floats.
+    """
+    header = json.dumps({
+        "keys": list(trace.keys),
+        "months": len(trace.months),
+        "error": trace.error
+    }).encode("utf-8")
+    values = array('d', chain.from_iterable(trace.months))
+    if sys.byteorder == "big":
+        values.byteswap()
+    with open(path, 'wb') as file:
+        file.write(TRACE_MAGIC)
+        file.write(struct.pack("<I", len(header)))
+        file.write(header)
+        file.write(zlib.compress(values.tobytes(), 9))
+
+
+def read_trace(path: str) -> Trace:
+    """
+    Reads a trace written by write_trace.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    if data[:len(TRACE_MAGIC)] != TRACE_MAGIC:
+        raise ValueError(f"{path} is not a trace file")
+    start = len(TRACE_MAGIC) + 4
+    (header_length,) = struct.unpack("<I", data[len(TRACE_MAGIC):start])
+    header = json.loads(data[start:start + header_length])
+    values = array('d')
+    values.frombytes(zlib.decompress(data[start + header_length:]))
+    if sys.byteorder == "big":
+        values.byteswap()
+    width = len(header["keys"])
+    if len(values) != width * header["months"]:
+        raise ValueError(f"{path} is truncated")
+    months = [tuple(values[index:index + width])
+              for index in range(0, len(values), width)]
+    return Trace(tuple(header["keys"]), months, header["error"])
+
+
+def trace_path(name: str, traces_dir: str = TRACES_DIR) -> str:
+    return os.path.join(traces_dir, f"{name}.trace")
+
+
+def compare_traces(name: str, expected: Trace, actual: Trace
+                   ) -> Parity_Report:
+    """
+    Compares the months the traces have in common, metric by metric.
+    """
+    if set(expected.keys) - set(actual.keys):
+        raise ValueError(f"trace of {name} was recorded with different "
+                         "metrics - record it again")
+    indices = [actual.keys.index(key) for key in expected.keys]
+    largest: list[Metric_Error | None] = [None] * len(indices)
+    for month, (values1, values2) in enumerate(zip(expected.months,
+                                                   actual.months)):
+        for position, (expected_value, index) in enumerate(zip(values1,
+                                                               indices)):
+            actual_value = values2[index]
+            if expected_value == actual_value:
+                continue
+            error = relative_gap(expected_value, actual_value)
+            current = largest[position]
+            if current is None or error > current.error:
+                largest[position] = Metric_Error(
+                    expected.keys[position], month, expected_value,
+                    actual_value, error
+                )
+    errors = sorted((error for error in largest if error is not None),
+                    key=lambda error: error.error, reverse=True)
+    return Parity_Report(name, len(expected.months), len(actual.months),
+                         expected.error, actual.error, errors)
+
+
+def check_scenario(name: str, traces_dir: str = TRACES_DIR
+                   ) -> Parity_Report:
+    """
+    Replays the scenario and compares it with its recorded trace.
+    """
+    scenario = load_scenarios(traces_dir)[name]
+    return compare_traces(name, read_trace(trace_path(name, traces_dir)),
+                          replay_scenario(scenario))
+
+
+def record_scenario(name: str, traces_dir: str = TRACES_DIR) -> int:
+    """
+    Replays the scenario and records its trace. Returns the number of
+    months recorded.
+    """
+    trace = replay_scenario(load_scenarios(traces_dir)[name])
+    write_trace(trace_path(name, traces_dir), trace)
+    return len(trace.months)
+
+
+def check(names: Iterable[str] | None = None,
+          executor: Executor | None = None, traces_dir: str = TRACES_DIR
+          ) -> list[Parity_Report]:
+    """
+    Checks the given scenarios (all if None), in parallel if an executor
+    is given.
+    """
+    names = list(load_scenarios(traces_dir) if names is None else names)
+    if executor is None:
+        return [check_scenario(name, traces_dir) for name in names]
+    return list(executor.map(check_scenario, names,
+                             [traces_dir] * len(names)))
+
+
+def record(names: Iterable[str] | None = None,
+           executor: Executor | None = None, traces_dir: str = TRACES_DIR
+           ) -> dict[str, int]:
+    """
+    Records traces of the given scenarios (all if None), in parallel if an
+    executor is given. Returns the numbers of months recorded.
+    """
+    names = list(load_scenarios(traces_dir) if names is None else names)
+    if executor is None:
+        months = [record_scenario(name, traces_dir) for name in names]
+    else:
+        months = list(executor.map(record_scenario, names,
+                                   [traces_dir] * len(names)))
+    return dict(zip(names, months))
+
+
+def describe_report(report: Parity_Report, top: int = 5) -> list[str]:
+    """
+    Returns lines describing the report, with its top largest errors.
+    """
+    status = "ok" if report.passed() else "FAILED"
+    result = [f"{report.scenario}: {status}, {report.months} months, max "
+              f"relative error "
+              f"{report.errors[0].error if report.errors else 0:.3g}"]
+    if report.months != report.expected_months:
+        result.append(f"  recorded {report.expected_months} months")
+    if report.error != report.expected_error:
+        result.append(f"  ended with {report.error}, recorded "
+                      f"{report.expected_error}")
+    for error in report.errors[:top]:
+        result.append(f"  {error.metric} (month {error.month}): "
+                      f"{error.expected!r} -> {error.actual!r} "
+                      f"({error.error:.3g})")
+    return result
+
+
+def main(arguments: list[str]) -> int:
+    mode = arguments[1] if len(arguments) > 1 else "check"
+    workers = int(arguments[2]) if len(arguments) > 2 else cpu_count() or 1
+    names = arguments[3:] or None
+    with ProcessPoolExecutor(workers) as executor:
+        if mode == "record":
+            for name, months in record(names, executor).items():
+                print(f"{name}: recorded {months} months")
+            return 0
+        reports = check(names, executor)
+    for report in reports:
+        for line in describe_report(report):
+            print(line)
+    return 0 if all(report.passed() for report in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
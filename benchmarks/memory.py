@@ -0,0 +1,48 @@
+"""
+Memory benchmark of State_Data.do_month - measures memory allocated by every
+phase of a month with tracemalloc, memory kept by a state and by a History
+of the simulated months, and the peak of remaking that history.
+Run from the repository root:
+python -m benchmarks.memory [MONTHS] [COHORTS]
+"""
+import sys
+from typing import Any
+
+from sources.abstract_interface.history import History
+from sources.abstract_interface.memory_usage import (history_memory,
+                                                     profile_months)
+from sources.cli.cli_commands import describe_memory
+
+from .do_month import load_starting_state
+
+
+def run(months: int = 60, cohorts: int = 0) -> dict[str, Any]:
+    """
+    Profiles the given number of months and returns the measurements. If
+    cohorts is positive, classes are split into that many wealth cohorts.
+    """
+    state = load_starting_state()
+    if cohorts > 0:
+        state.split_into_cohorts(cohorts)
+    report = profile_months(state, months)
+    history = History(state.to_dict(), [f"next {report.months}"])
+    return {
+        "months": report.months,
+        "cohorts": cohorts,
+        "report": report,
+        "history": history_memory(history)
+    }
+
+
+def main(arguments: list[str]) -> None:
+    months = int(arguments[1]) if len(arguments) > 1 else 60
+    cohorts = int(arguments[2]) if len(arguments) > 2 else 0
+    results = run(months, cohorts)
+    split = f" with {cohorts} cohorts" if cohorts > 0 else ""
+    print(f"Memory of do_month over {results['months']} months{split}:")
+    for line in describe_memory(results["report"], results["history"]):
+        print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,68 @@
+"""
+Benchmark of Provinces_State_Data.do_provinces_month - measures the time of one month
+of a country made of many copies of the starting state, stepped sequentially
+and with local phases sharded across worker processes.
+Run from the repository root:
+python -m benchmarks.provinces [PROVINCES] [WORKERS] [MONTHS]
+"""
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from os import cpu_count
+from time import perf_counter
+
+from sources.state.provinces_state_data import Provinces_State_Data
+
+from .do_month import load_starting_state
+
+
+def create_country(provinces: int) -> Provinces_State_Data:
+    """
+    Creates a country with the given number of rich starting provinces.
+    """
+    return Provinces_State_Data.from_states(
+        [load_starting_state() for _ in range(provinces)]
+    )
+
+
+def time_months(provinces: int, months: int,
+                executor: Executor | None = None, workers: int = 1
+                ) -> float:
+    """
+    Returns the average time of one month in milliseconds.
+    """
+    country = create_country(provinces)
+    start = perf_counter()
+    for _ in range(months):
+        country.do_provinces_month(executor, workers)
+    return 1000 * (perf_counter() - start) / months
+
+
+def run(provinces: int = 64, workers: int = cpu_count() or 1,
+        months: int = 12) -> dict[str, float]:
+    """
+    Runs the given number of months both ways and returns the measurements.
+    """
+    sequential = time_months(provinces, months)
+    with ProcessPoolExecutor(workers) as executor:
+        sharded = time_months(provinces, months, executor, workers)
+    return {
+        "provinces": provinces,
+        "workers": workers,
+        "months": months,
+        "sequential_ms_per_month": sequential,
+        "sharded_ms_per_month": sharded
+    }
+
+
+def main(arguments: list[str]) -> None:
+    values = [int(argument) for argument in arguments[1:4]]
+    results = run(*values)
+    print(f"do_month of {results['provinces']} provinces over "
+          f"{results['months']} months:")
+    print(f"  sequential: {results['sequential_ms_per_month']:.1f} ms")
+    print(f"  {results['workers']} workers: "
+          f"{results['sharded_ms_per_month']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,108 @@
+"""
+Load test of the simulation server - many concurrent clients, each with its
+own session, send requests and measure their latencies. Unless a port is
+given, a server is started in this process.
+Run from the repository root:
+python -m benchmarks.server_load [SESSIONS] [REQUESTS] [WORKERS] \
+[MAX_SESSIONS] [PORT]
+"""
+import asyncio
+import json
+import sys
+from time import perf_counter
+from typing import Any
+
+from sources.server.server import Simulation_Server
+
+from .do_month import load_starting_state
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                  data: dict[str, Any]) -> dict[str, Any]:
+    writer.write(json.dumps(data).encode() + b'\n')
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def client(port: int, requests: int, latencies: list[float],
+                 state: dict[str, Any]) -> int:
+    """
+    Creates a session and sends it the given number of requests, cycling
+    through months, commands and history queries. Appends latencies of the
+    requests to latencies and returns the number of failed requests.
+    """
+    reader, writer = await asyncio.open_connection(
+        "127.0.0.1", port, limit=1 << 24
+    )
+    response = await request(reader, writer, {"op": "create", "state": state})
+    session = response["session"]
+    mix = [
+        {"op": "next", "session": session},
+        {"op": "command", "session": session,
+         "command": "state population"},
+        {"op": "next", "session": session},
+        {"op": "history", "session": session, "stat": "prices",
+         "months": 1}
+    ]
+    failed = 0
+    for number in range(requests):
+        start = perf_counter()
+        response = await request(reader, writer, mix[number % len(mix)])
+        latencies.append(perf_counter() - start)
+        failed += not response["ok"]
+    await request(reader, writer, {"op": "close", "session": session})
+    writer.close()
+    return failed
+
+
+async def load_test(sessions: int, requests: int, port: int
+                    ) -> dict[str, float]:
+    state = load_starting_state().to_dict()
+    latencies: list[float] = []
+    start = perf_counter()
+    failed = await asyncio.gather(*(
+        client(port, requests, latencies, state) for _ in range(sessions)
+    ))
+    elapsed = perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "failed": sum(failed),
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": 1000 * latencies[len(latencies) // 2],
+        "p99_ms": 1000 * latencies[int(0.99 * (len(latencies) - 1))]
+    }
+
+
+async def run_with_server(sessions: int, requests: int, workers: int,
+                          max_sessions: int) -> dict[str, float]:
+    with Simulation_Server(workers, max_sessions) as server:
+        tcp_server = await server.start()
+        port = tcp_server.sockets[0].getsockname()[1]
+        async with tcp_server:
+            results = await load_test(sessions, requests, port)
+        results["evictions"] = server.evictions
+    return results
+
+
+def main(arguments: list[str]) -> None:
+    values = [int(argument) for argument in arguments[1:6]]
+    values += [64, 20, 4, 32][len(values):]
+    sessions, requests, workers, max_sessions = values[:4]
+    if len(values) > 4:
+        results = asyncio.run(load_test(sessions, requests, values[4]))
+    else:
+        results = asyncio.run(
+            run_with_server(sessions, requests, workers, max_sessions)
+        )
+    print(f"{sessions} sessions, {requests} requests each:")
+    print(f"  failed requests: {results['failed']}")
+    print(f"  throughput: {results['throughput']:.1f} requests/s")
+    print(f"  latency p50: {results['p50_ms']:.2f} ms, "
+          f"p99: {results['p99_ms']:.2f} ms")
+    if "evictions" in results:
+        print(f"  evictions: {results['evictions']}")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -1,6 +1,8 @@
+import json
 import sys
 import argparse
 from sources.auxiliaries import globals
+from sources.auxiliaries.trace import Trace
 
 
 def main(arguments: list[str]):
@@ -14,15 +16,61 @@ def main(arguments: list[str]):
                       'launch the program in the command line')
     mode.add_argument('-g', '--gui', action='store_true', help='whether to '
                       'launch the program with graphical user interface')
+    mode.add_argument('-s', '--script', help='file with commands to execute '
+                      'without prompts, - means standard input', type=str)
+    mode.add_argument('--server', help='port on which to serve many game '
+                      'sessions, with JSON requests (one per line)', type=int)
+    mode.add_argument('--verify', help='name of the save to verify by '
+                      'replaying its history in parallel segments', type=str,
+                      metavar='SAVE')
+    mode.add_argument('--sensitivity', help='name of the save whose state to '
+                      'analyse - elasticities of the outcomes of the next '
+                      'months with respect to every modifier are printed',
+                      type=str, metavar='SAVE')
     parser.add_argument('-l', '--load', help='name of the save from which to '
                         'load game state; not given means a new game is '
                         'started', nargs=1, type=str, default=['starting'])
     parser.add_argument('-d', '--debug', action='store_true', help='whether to'
                         ' launch the program in debug mode')
+    parser.add_argument('--trace-size', help='how many of the newest debug '
+                        'trace events to keep', type=int, default=10000)
+    parser.add_argument('-o', '--output', help='file to write the output of '
+                        'the script to, instead of standard output', type=str)
+    parser.add_argument('--workers', help='number of worker processes of '
+                        '--replicates, --verify and --sensitivity (the number '
+                        'of processors by default), and of threads the server '
+                        'runs commands in (4 by default)', type=int)
+    parser.add_argument('--months', help='number of months simulated by '
+                        '--sensitivity (24 by default)', type=int)
+    parser.add_argument('--max-sessions', help='number of sessions the '
+                        'server keeps in memory, others are saved to disk',
+                        type=int, default=64)
+    parser.add_argument('--max-memory', help='megabytes of pickled sessions '
+                        'the server keeps in memory, others are saved to disk',
+                        type=float)
+    parser.add_argument('--seed', help='seed of the random numbers of the '
+                        'game (of the first replicate with --replicates)',
+                        type=int)
+    parser.add_argument('--skip-cycles', help='relative tolerance with which '
+                        'steady states and 12-month cycles are detected - '
+                        'they are then skipped instead of calculated',
+                        type=float, metavar='TOLERANCE')
+    parser.add_argument('--replicates', help='number of replicates of the '
+                        'script to run (with different seeds) - statistics of'
+                        ' their months are printed as JSON', type=int,
+                        default=0)
+    answer = parser.add_mutually_exclusive_group()
+    answer.add_argument('-y', '--yes', action='store_true', help='confirm '
+                        'all prompts of the script (e.g. overwriting saves)')
+    answer.add_argument('-n', '--no', action='store_true', help='abort all '
+                        'prompts of the script (default)')
     args = parser.parse_args(arguments[1:])
 
     if args.debug:
         globals.debug = True
+        globals.trace = Trace(args.trace_size)
+    if args.skip_cycles is not None:
+        globals.cycle_tolerance = args.skip_cycles
 
     if args.gui:
         from sources.gui.gui import graphical_user_interface
@@ -30,6 +78,55 @@ def main(arguments: list[str]):
     elif args.cli:
         from sources.cli.cli import command_line_interface
         command_line_interface(args.load[0])
+    elif args.server is not None:
+        from sources.server.server import SERVER_WORKERS, run_server
+        run_server(args.server, workers=args.workers or SERVER_WORKERS,
+                   max_resident=args.max_sessions,
+                   max_size=int(args.max_memory * 1e6)
+                   if args.max_memory else None)
+    elif args.verify:
+        from concurrent.futures import ProcessPoolExecutor
+        from sources.abstract_interface.checkpoints import verify_save
+        from sources.cli.cli_commands import describe_divergence
+        with ProcessPoolExecutor(args.workers) as executor:
+            divergence = verify_save(args.verify, executor)
+        print(describe_divergence(divergence))
+        sys.exit(0 if divergence is None else 1)
+    elif args.sensitivity:
+        from concurrent.futures import ProcessPoolExecutor
+        from sources.abstract_interface.interface import Interface
+        from sources.abstract_interface.sensitivity import (
+            SENSITIVITY_MONTHS, analyse)
+        from sources.cli.cli_commands import describe_sensitivity
+        state = Interface(args.sensitivity).state
+        with ProcessPoolExecutor(args.workers) as executor:
+            analysis = analyse(state, args.months or SENSITIVITY_MONTHS,
+                               executor=executor)
+        print("\n".join(describe_sensitivity(analysis)))
+    elif args.script:
+        from sources.cli.cli import run_script
+        globals.confirmation = args.yes
+        script = open(args.script, 'r', encoding="utf-8") \
+            if args.script != '-' else sys.stdin
+        output = open(args.output, 'w', encoding="utf-8") \
+            if args.output else None
+        try:
+            if args.replicates > 0:
+                from concurrent.futures import ProcessPoolExecutor
+                from sources.abstract_interface.ensemble import run_ensemble
+                with ProcessPoolExecutor(args.workers) as executor:
+                    ensemble = run_ensemble(
+                        args.load[0], list(script), args.replicates,
+                        args.seed or 0, executor, confirmation=args.yes
+                    )
+                json.dump(ensemble.summary(), output or sys.stdout)
+                sys.exit(0)
+            sys.exit(run_script(args.load[0], script, output, args.seed))
+        finally:
+            if script is not sys.stdin:
+                script.close()
+            if output is not None:
+                output.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import json
+from concurrent.futures import Executor
+from typing import Any, Iterator, NamedTuple, Sequence
+
+from ..state.state_data import State_Data
+
+CHECKPOINTS_FILE_NAME = "checkpoints.json"
+# Months between consecutive state snapshots - segments between them are
+# replayed independently when a save is verified
+CHECKPOINT_INTERVAL = 120
+
+
+def line_months(line: str) -> int:
+    """
+    Returns the number of months the given history line ends - "next" and
+    "skip" lines end months, other lines are commands of the current month.
+    """
+    command = line.split(' ')
+    return int(command[1]) if command[0] in {"next", "skip"} else 0
+
+
+def line_steps(line: str) -> int:
+    """
+    Returns the number of steps of the given history line - "next" lines
+    have a step for every month, other lines (also "skip") a single step.
+    """
+    return line_months(line) if line.startswith("next ") else 1
+
+
+def replay(state: State_Data, history_lines: Sequence[str], line: int = 0,
+           step: int = 0) -> Iterator[tuple[int, int]]:
+    """
+    Executes the history lines on the state one step at a time, starting
+    after the given number of steps of the given line. After each step,
+    yields its position - tuple (index of the line, steps of the line done).
+    """
+    for index in range(line, len(history_lines)):
+        history_line = history_lines[index]
+        if history_line.split(' ')[0] == "next":
+            for done in range(step + 1, line_steps(history_line) + 1):
+                state.do_month()
+                yield index, done
+        elif step == 0:
+            state.execute_commands([history_line])
+            yield index, 1
+        step = 0
+
+
+class Checkpoints_Mark(NamedTuple):
+    """
+    A point in the recording of Checkpoints, with the digests and snapshots
+    recorded after it.
+    """
+    digests: int
+    snapshots: int
+    last_snapshot: int
+    new_digests: list[str]
+    new_snapshots: list[dict[str, Any]]
+
+
+class Checkpoints:
+    """
+    Digests of the state after every step of its history (see line_steps)
+    and snapshots of the state every interval months, which allow the
+    history to be verified in independent segments.
+    Attributes:
+    digests - State_Data.digest after each step
+    snapshots - dicts with the position of the snapshot (keys "line" and
+                "step", as yielded by replay), the number of steps before it
+                ("steps"), the state's dict ("state") and its digest
+                ("digest")
+    """
+    def __init__(self, state: State_Data,
+                 interval: int = CHECKPOINT_INTERVAL) -> None:
+        """
+        Creates checkpoints of a history starting from the given state.
+        """
+        if interval < 1:
+            raise ValueError("interval must be positive")
+        self.interval = interval
+        self.digests: list[str] = []
+        self.snapshots: list[dict[str, Any]] = []
+        self._last_snapshot: int = state.year * 12 + state.month.value
+
+    def record(self, state: State_Data, line: int, step: int) -> None:
+        """
+        Records the state after a step at the given position.
+        """
+        state_digest = state.digest()
+        self.digests.append(state_digest)
+        months = state.year * 12 + state.month.value
+        if months - self._last_snapshot >= self.interval:
+            self._last_snapshot = months
+            self.snapshots.append({
+                "line": line,
+                "step": step,
+                "steps": len(self.digests),
+                "state": state.to_dict(),
+                "digest": state_digest
+            })
+
+    def mark(self, since: Checkpoints_Mark | None = None
+             ) -> Checkpoints_Mark:
+        """
+        Returns a mark of the current point of the recording, keeping what
+        was recorded after the given mark (if it is given).
+        """
+        if since is None:
+            return Checkpoints_Mark(len(self.digests), len(self.snapshots),
+                                    self._last_snapshot, [], [])
+        return Checkpoints_Mark(
+            since.digests, since.snapshots, self._last_snapshot,
+            self.digests[since.digests:], self.snapshots[since.snapshots:]
+        )
+
+    def restore(self, mark: Checkpoints_Mark) -> None:
+        """
+        Brings the recording back (or forward) to the given mark.
+        """
+        self.digests[mark.digests:] = mark.new_digests
+        self.snapshots[mark.snapshots:] = mark.new_snapshots
+        self._last_snapshot = mark.last_snapshot
+
+    def matches(self, history_lines: Sequence[str]) -> bool:
+        """
+        Returns whether the checkpoints were recorded for every step of the
+        given history.
+        """
+        return sum(line_steps(line) for line in history_lines) == \
+            len(self.digests)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "digests": self.digests,
+            "snapshots": self.snapshots
+        }
+
+
+class Divergence(NamedTuple):
+    """
+    The first step of a save's history whose replay doesn't match the save's
+    checkpoints or fails.
+    line - index of the history line of the step
+    step - number of the step within the line (from 1)
+    command - the history line
+    year, month - date of the state after the step (or when it failed)
+    reason - description of the mismatch or the exception
+    """
+    line: int
+    step: int
+    command: str
+    year: int
+    month: str
+    reason: str
+
+
+class _Segment(NamedTuple):
+    """
+    Part of a history between two snapshots (or its start or end).
+    """
+    state: dict[str, Any]
+    state_digest: str | None
+    line: int
+    step: int
+    steps: int
+    end: dict[str, Any] | None
+
+
+def _next_step(history_lines: Sequence[str], line: int, step: int
+               ) -> tuple[int, int]:
+    """
+    Returns the position of the step after the given one.
+    """
+    if step == 0 or line >= len(history_lines):
+        return line, 1
+    if step < line_steps(history_lines[line]):
+        return line, step + 1
+    return line + 1, 1
+
+
+def verify_segment(segment: _Segment, history_lines: Sequence[str],
+                   digests: Sequence[str] | None) -> Divergence | None:
+    """
+    Replays the segment of the history and compares the state after every
+    step with the recorded digests and the state at the segment's end with
+    the next snapshot. If digests are None, the segment is only replayed.
+    Returns the first divergence, or None if the segment matches. Can be
+    run in a worker process.
+    """
+    state = State_Data.from_dict(segment.state)
+    line, step = segment.line, segment.step
+
+    def divergence(line: int, step: int, reason: str) -> Divergence:
+        command = history_lines[line] if line < len(history_lines) else ""
+        return Divergence(line, step, command, state.year, state.month.name,
+                          reason)
+
+    if segment.state_digest is not None and \
+            state.digest() != segment.state_digest:
+        return divergence(line, step, "the snapshot doesn't match its digest")
+    steps = segment.steps
+    end = segment.end
+    try:
+        for line, step in replay(state, history_lines, line, step):
+            if digests is not None and steps < len(digests) and \
+                    state.digest() != digests[steps]:
+                return divergence(
+                    line, step, "the state doesn't match the checkpoint"
+                )
+            steps += 1
+            if end is not None and (line, step) == (end["line"], end["step"]):
+                break
+    except Exception as e:
+        line, step = _next_step(history_lines, line, step)
+        return divergence(line, step, f"{e.__class__.__name__}: {e}")
+    if end is None:
+        if digests is not None and steps != len(digests):
+            return divergence(
+                line, step, f"the history has {steps} steps, the checkpoints"
+                f" {len(digests)}"
+            )
+    elif steps != end["steps"]:
+        return divergence(line, step, "the history ends before the snapshot")
+    elif state.digest() != end["digest"]:
+        return divergence(line, step, "the state doesn't match the snapshot")
+    return None
+
+
+def verify_save(dirname: str, executor: Executor | None = None,
+                saves_dir: str = "saves") -> Divergence | None:
+    """
+    Verifies the given save by replaying its history and comparing it with
+    the save's checkpoints. Segments between consecutive snapshots are
+    replayed independently - by the executor (e.g. a ProcessPoolExecutor)
+    if one is given, so verifying a long save takes about as long as
+    replaying one segment. Returns the first divergence, or None if the save
+    is valid. A save without checkpoints is only replayed.
+    """
+    directory = f"{saves_dir}/{dirname}"
+    with open(f"{directory}/starting_state.json", 'r',
+              encoding="utf-8") as file:
+        starting_state = json.load(file)
+    with open(f"{directory}/history.txt", 'r', encoding="utf-8") as file:
+        history_lines = file.read().splitlines()
+    try:
+        with open(f"{directory}/{CHECKPOINTS_FILE_NAME}", 'r',
+                  encoding="utf-8") as file:
+            checkpoints = json.load(file)
+    except FileNotFoundError:
+        checkpoints = {"digests": None, "snapshots": []}
+    digests: list[str] | None = checkpoints["digests"]
+    snapshots: list[dict[str, Any]] = checkpoints["snapshots"]
+
+    segments = [_Segment(starting_state, None, 0, 0, 0,
+                         snapshots[0] if snapshots else None)]
+    for index, snapshot in enumerate(snapshots):
+        segments.append(_Segment(
+            snapshot["state"], snapshot["digest"], snapshot["line"],
+            snapshot["step"], snapshot["steps"],
+            snapshots[index + 1] if index + 1 < len(snapshots) else None
+        ))
+
+    if executor is None:
+        for segment in segments:
+            result = verify_segment(segment, history_lines, digests)
+            if result is not None:
+                return result
+        return None
+    futures = [
+        executor.submit(verify_segment, segment, history_lines, digests)
+        for segment in segments
+    ]
+    for future in futures:
+        result = future.result()
+        if result is not None:
+            return result
+    return None
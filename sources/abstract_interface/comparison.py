@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+from itertools import islice
+from typing import Iterator, NamedTuple
+
+from ..auxiliaries.enums import Month
+from ..state.month_data import FLAT_KEYS
+from .checkpoints import line_months
+from .history import History
+
+# Number of the largest gaps between metrics reported by compare_histories
+TOP_GAPS = 10
+
+
+class Metric_Gap(NamedTuple):
+    """
+    Difference between the values of a metric (one of FLAT_KEYS) in two
+    histories at the given month (counting January 0 as month 0). gap is
+    the difference relative to the larger of the values (or to 1, if both
+    are smaller).
+    """
+    metric: str
+    month: int
+    first: float
+    second: float
+    gap: float
+
+
+class Comparison(NamedTuple):
+    """
+    Result of compare_histories. The histories are compared from month
+    start, for the months both of them have; first_months and second_months
+    are the numbers of months each of them has since start. divergence is
+    the first gap above the tolerance and gaps are the largest gaps of
+    different metrics, the largest first.
+    """
+    start: int
+    months: int
+    first_months: int
+    second_months: int
+    divergence: Metric_Gap | None
+    gaps: list[Metric_Gap]
+
+
+def load_history(dirname: str, saves_dir: str = "saves") -> History:
+    """
+    Loads the history of the given save.
+    """
+    directory = f"{saves_dir}/{dirname}"
+    with open(f"{directory}/starting_state.json", 'r',
+              encoding="utf-8") as file:
+        starting_state = json.load(file)
+    with open(f"{directory}/history.txt", 'r', encoding="utf-8") as file:
+        history_lines = file.read().splitlines()
+    return History(starting_state, history_lines)
+
+
+def starting_month(history: History) -> int:
+    """
+    Returns the number of the first month of the history (counting January
+    0 as month 0).
+    """
+    starting_state = history.starting_state_dict
+    return starting_state["year"] * 12 + \
+        Month[starting_state["month"]].value
+
+
+def months_since(history: History, month: int) -> int:
+    """
+    Returns the number of months the history has from the given one,
+    counted from its lines, without remaking them.
+    """
+    months = sum(line_months(line) for line in history.history_lines)
+    return max(months - max(month - starting_month(history), 0), 0)
+
+
+def relative_gap(first: float, second: float) -> float:
+    """
+    Returns the difference between the values relative to the larger of
+    them (or to 1, if both are smaller).
+    """
+    return abs(first - second) / max(abs(first), abs(second), 1)
+
+
+def _months_from(history: History, month: int
+                 ) -> Iterator[tuple[float, ...]]:
+    """
+    Yields flat values of the months of the history from the given one.
+    """
+    months = history.iterate_months()
+    skipped = max(month - starting_month(history), 0)
+    for month_data in islice(months, skipped, None):
+        yield month_data.flat_values()
+
+
+def iterate_deltas(first: History, second: History
+                   ) -> Iterator[tuple[int, tuple[float, ...]]]:
+    """
+    Yields the numbers of the months both histories have and the
+    differences between the second and the first history's metrics in these
+    months (in FLAT_KEYS order). The months are remade one by one, so only
+    two months of data are held at once.
+    """
+    start = max(starting_month(first), starting_month(second))
+    for month, (values1, values2) in enumerate(
+            zip(_months_from(first, start), _months_from(second, start)),
+            start):
+        yield month, tuple(
+            value2 - value1 for value1, value2 in zip(values1, values2)
+        )
+
+
+def compare_histories(first: History, second: History,
+                      tolerance: float = 0, top: int = TOP_GAPS
+                      ) -> Comparison:
+    """
+    Compares the histories month by month, starting from the later of their
+    starting months. Metrics are compared with the given relative tolerance
+    (see relative_gap). The months are remade one by one - only the largest
+    gap of every metric is kept.
+    """
+    start = max(starting_month(first), starting_month(second))
+    months1 = _months_from(first, start)
+    months2 = _months_from(second, start)
+    # Columns indexed by the metric's position in FLAT_KEYS
+    largest = [0.0] * len(FLAT_KEYS)
+    largest_at: list[Metric_Gap | None] = [None] * len(FLAT_KEYS)
+    divergence: Metric_Gap | None = None
+
+    months = 0
+    while True:
+        values1 = next(months1, None)
+        values2 = next(months2, None)
+        if values1 is None or values2 is None:
+            break
+        month = start + months
+        months += 1
+        if values1 == values2:
+            continue
+        for index, (value1, value2) in enumerate(zip(values1, values2)):
+            if value1 == value2:
+                continue
+            gap = relative_gap(value1, value2)
+            if gap > largest[index]:
+                largest[index] = gap
+                largest_at[index] = Metric_Gap(
+                    FLAT_KEYS[index], month, value1, value2, gap
+                )
+            if divergence is None and gap > tolerance:
+                divergence = Metric_Gap(
+                    FLAT_KEYS[index], month, value1, value2, gap
+                )
+
+    gaps = sorted((gap for gap in largest_at if gap is not None),
+                  key=lambda gap: gap.gap, reverse=True)
+    return Comparison(start, months, months_since(first, start),
+                      months_since(second, start), divergence, gaps[:top])
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import NamedTuple
+
+from ..state.state_data import State_Data
+
+# Periods (in months) of detected cycles - 1 is a steady state, 12 a cycle
+# of seasons (FOOD_RATIOS and WOOD_CONSUMPTION change over the year)
+PERIODS = (1, 12)
+# How many months in a row must repeat for a steady state to be detected;
+# a 12-month cycle has to repeat for a whole year
+MIN_REPEATS = 3
+
+
+class Skip(NamedTuple):
+    """
+    Months skipped after a cycle was detected.
+    """
+    months: int
+    period: int
+
+
+def state_vector(state: State_Data) -> tuple[float, ...]:
+    """
+    Returns all numbers describing the state (except for the date), in a
+    fixed order - the values of its digest. Booleans are converted to 0 or 1.
+    """
+    return tuple(map(float, state.digest_values(date=False)))
+
+
+class Cycle_Detector:
+    """
+    Detects that the state reached a steady state (every month ends the same)
+    or a 12-month cycle (every month ends the same as a year before), within
+    the given relative tolerance. Numbers smaller than 1 are compared with
+    absolute tolerance instead.
+    """
+    def __init__(self, tolerance: float) -> None:
+        if tolerance < 0:
+            raise ValueError("tolerance cannot be negative")
+        self.tolerance = tolerance
+        self.vectors: deque[tuple[float, ...]] = deque(
+            maxlen=2 * max(PERIODS)
+        )
+
+    def _close(self, first: tuple[float, ...], second: tuple[float, ...]
+               ) -> bool:
+        if len(first) != len(second):
+            return False
+        tolerance = self.tolerance
+        for a, b in zip(first, second):
+            if abs(a - b) > tolerance * max(abs(a), abs(b), 1):
+                return False
+        return True
+
+    def _repeats(self, period: int) -> bool:
+        """
+        Returns whether the last months repeat the ones period months before
+        them.
+        """
+        repeats = max(period, MIN_REPEATS)
+        if len(self.vectors) < period + repeats:
+            return False
+        return all(
+            self._close(self.vectors[-1 - index],
+                        self.vectors[-1 - index - period])
+            for index in range(repeats)
+        )
+
+    def add(self, state: State_Data) -> int | None:
+        """
+        Records the state at the end of a month. Returns the period of the
+        detected cycle, or None if the state doesn't repeat (yet).
+        """
+        self.vectors.append(state_vector(state))
+        for period in PERIODS:
+            if self._repeats(period):
+                return period
+        return None
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Executor, Future
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import Iterable, Sequence
+
+from ..auxiliaries import globals
+from ..auxiliaries.online_stats import Online_Stats
+from ..cli.cli import execute
+from ..cli.cli_commands import ShutDownCommand
+from ..state.month_data import FLAT_KEYS, Month_Data
+from .interface import Interface
+
+
+def flatten_month_data(data: Month_Data) -> dict[str, float]:
+    """
+    Converts Month_Data to a flat dict of metrics, with keys made of the
+    nested keys joined with dots, e.g. "resources_after.nobles.food".
+    Booleans (growth modifiers) are converted to 0 or 1.
+    """
+    return {
+        key: float(value) for key, value in zip(FLAT_KEYS, data.flat_values())
+    }
+
+
+def run_replicate(dirname: str, commands: Sequence[str], seed: int,
+                  confirmation: bool = False) -> list[dict[str, float]]:
+    """
+    Loads the given save and executes the given CLI commands, with the
+    game's random numbers drawn from the given seed. Output is discarded and
+    prompts are answered with confirmation. Returns flattened data of every
+    month until the end of the commands or the game. Can be run in a worker
+    process.
+    """
+    old_confirmation = globals.confirmation
+    globals.confirmation = confirmation
+    interface = Interface(seed=seed)
+    months: list[dict[str, float]] = []
+    interface.on_month = \
+        lambda month_data: months.append(flatten_month_data(month_data))
+    try:
+        interface.load_data(dirname)
+        with redirect_stdout(StringIO()):
+            for line in commands:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                try:
+                    execute(line, interface)
+                except ShutDownCommand:
+                    break
+    finally:
+        globals.confirmation = old_confirmation
+    return months
+
+
+class Ensemble:
+    """
+    Statistics of every metric of every month over many replicates of a
+    game, aggregated online - replicates' data is not kept. Replicates which
+    ended early (game over) only count towards the months they lived through.
+    """
+    def __init__(self, quantiles: Iterable[float] = (0.05, 0.5, 0.95)
+                 ) -> None:
+        self.quantiles = tuple(quantiles)
+        self.replicates: int = 0
+        self.months: list[dict[str, Online_Stats]] = []
+
+    def add(self, months: Sequence[dict[str, float]]) -> None:
+        """
+        Adds data of one replicate (as returned by run_replicate).
+        """
+        self.replicates += 1
+        for index, metrics in enumerate(months):
+            if index == len(self.months):
+                self.months.append({})
+            stats = self.months[index]
+            for metric, value in metrics.items():
+                if metric not in stats:
+                    stats[metric] = Online_Stats(self.quantiles)
+                stats[metric].add(value)
+
+    def summary(self) -> list[dict[str, dict[str, float]]]:
+        """
+        Returns, for every month, statistics of every metric as dicts (see
+        Online_Stats.to_dict).
+        """
+        return [
+            {metric: stats.to_dict() for metric, stats in month.items()}
+            for month in self.months
+        ]
+
+
+def run_ensemble(dirname: str, commands: Sequence[str], replicates: int,
+                 seed: int = 0, executor: Executor | None = None,
+                 window: int = 8,
+                 quantiles: Iterable[float] = (0.05, 0.5, 0.95),
+                 confirmation: bool = False) -> Ensemble:
+    """
+    Runs the given number of replicates of the commands on the given save,
+    replicate i with seed seed + i, and aggregates their data. If an executor
+    (e.g. a ProcessPoolExecutor) is given, replicates are run by it, with at
+    most window of them submitted at once. Replicates are aggregated in
+    order, so the result doesn't depend on the executor. Prompts are
+    answered with confirmation.
+    """
+    if replicates < 1:
+        raise ValueError("there must be at least one replicate")
+    ensemble = Ensemble(quantiles)
+    commands = list(commands)
+    if executor is None:
+        for number in range(replicates):
+            ensemble.add(run_replicate(
+                dirname, commands, seed + number, confirmation
+            ))
+        return ensemble
+
+    pending: deque[Future[list[dict[str, float]]]] = deque()
+    for number in range(replicates):
+        pending.append(
+            executor.submit(run_replicate, dirname, commands,
+                            seed + number, confirmation)
+        )
+        if len(pending) >= window:
+            ensemble.add(pending.popleft().result())
+    while pending:
+        ensemble.add(pending.popleft().result())
+    return ensemble
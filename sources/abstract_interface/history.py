@@ -1,6 +1,8 @@
-from typing import Any
+from collections import deque
+from typing import Any, Iterator
 
 from ..state.state_data import State_Data
+from .cycles import PERIODS
 from ..state.state_data_base_and_do_month import Month_Data
 
 
@@ -25,11 +27,13 @@ class History:
         self.starting_state_dict: dict[str, Any] = starting_state_dict.copy()
         self.history_lines: list[str] = history_lines.copy()
 
-    def obtain_whole_history(self) -> list[Month_Data]:
+    def iterate_months(self) -> Iterator[Month_Data]:
         """
-        Returns the whole history of the country.
+        Yields data of the months of the history one by one, remaking them
+        on the way - only the longest cycle of data is kept in memory.
         """
-        result: list[Month_Data] = []
+        # Skipped months repeat the last cycle
+        recent: deque[Month_Data] = deque(maxlen=max(PERIODS))
 
         state = State_Data.from_dict(self.starting_state_dict)
         for line in self.history_lines:
@@ -37,10 +41,25 @@ class History:
             if command[0] == "next":
                 amount = int(command[1])
                 for _ in range(amount):
-                    result.append(state.do_month())
+                    month_data = state.do_month()
+                    recent.append(month_data)
+                    yield month_data
+            elif command[0] == "skip":
+                amount, period = int(command[1]), int(command[2])
+                cycle = list(recent)[-period:]
+                for index in range(amount):
+                    month_data = cycle[index % period]
+                    recent.append(month_data)
+                    yield month_data
+                state.skip_months(amount)
             else:
                 state.execute_commands([line])
-        return result
+
+    def obtain_whole_history(self) -> list[Month_Data]:
+        """
+        Returns the whole history of the country.
+        """
+        return list(self.iterate_months())
 
     def population(self) -> list[dict[str, float]]:
         """
@@ -1,16 +1,31 @@
 import json
+import os
+from collections import deque
+from copy import deepcopy
+from functools import wraps
 from math import floor, log10
-from random import gauss
-from typing import Callable, overload
+from random import Random
+from typing import Any, Callable, NamedTuple, ParamSpec, TypeVar, overload
 
-from ..auxiliaries.constants import (CLASS_TO_SOLDIER, INBUILT_RESOURCES,
-                                     RECRUITMENT_COST, RECRUITABLE_PART)
+from ..auxiliaries.constants import (CLASS_TO_SOLDIER, RECRUITMENT_COST,
+                                     RECRUITABLE_PART)
 from ..auxiliaries.enums import (CLASS_NAME_STR, RESOURCE_STR, Class_Name,
                                  Resource)
 from ..auxiliaries import globals
 from ..auxiliaries.soldiers import Soldiers
-from ..state.state_data import State_Data
+from ..state.month_data import Month_Data
+from ..state.state_data import Fight_Estimate, State_Data
+from .checkpoints import (CHECKPOINTS_FILE_NAME, Checkpoints,
+                          Checkpoints_Mark, line_steps, replay)
+from .cycles import PERIODS, Cycle_Detector, Skip
 from .history import History
+from .save_catalog import Save_Catalog
+
+# Number of the newest commands which can be undone
+UNDO_LIMIT = 20
+# Most steps of the history (see line_steps) replayed to undo advancing the
+# month - if the nearest kept state is further back, the state is copied
+UNDO_REPLAY_STEPS = 12
 
 
 class NotEnoughGovtResources(Exception):
@@ -49,6 +64,14 @@ class AlreadyFoughtError(Exception):
     pass
 
 
+class NothingToUndoError(Exception):
+    pass
+
+
+class NothingToRedoError(Exception):
+    pass
+
+
 def check_arg(condition: bool, desc: str) -> None:
     """
     Raises InvalidArgumentError with given description if condition is false.
@@ -57,34 +80,116 @@ def check_arg(condition: bool, desc: str) -> None:
         raise InvalidArgumentError(desc)
 
 
+class _Undo_Entry(NamedTuple):
+    """
+    Everything needed to bring an Interface back to an earlier or later
+    point of the game: the state at that point and the parts of the history
+    and the checkpoints which differ from the current ones. History lines
+    from index line on are replaced with lines. steps is the number of steps
+    of the history at that point. If state is None, it is remade by
+    replaying the history (see Interface._replayed).
+    """
+    state: State_Data | None
+    fought: bool
+    line: int
+    lines: list[str]
+    checkpoints: Checkpoints_Mark
+    steps: int
+
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+def _undoable(method: Callable[P, T], replayed: bool) -> Callable[P, T]:
+    @wraps(method)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        interface = args[0]
+        assert isinstance(interface, Interface)
+        if interface._undo_depth > 0:
+            return method(*args, **kwargs)
+        steps = len(interface.checkpoints.digests)
+        if replayed and interface._can_replay(steps):
+            entry = interface._undo_entry(state=None)
+        else:
+            entry = interface._undo_entry(state=deepcopy(interface.state))
+        interface._undo_depth += 1
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            interface._undo_depth -= 1
+        if len(interface.checkpoints.digests) != steps:
+            interface.undo_stack.append(entry)
+            interface.redo_stack.clear()
+        return result
+    return wrapper
+
+
+def undoable(method: Callable[P, T]) -> Callable[P, T]:
+    """
+    Makes the decorated Interface method undoable - if it adds to the
+    history, the game from before the call is put on the undo stack.
+    Undoable methods called by other undoable methods are undone together
+    with them.
+    """
+    return _undoable(method, False)
+
+
+def undoable_by_replay(method: Callable[P, T]) -> Callable[P, T]:
+    """
+    Like undoable, for methods advancing the month - the state from before
+    the call isn't copied if it can be remade by replaying at most
+    UNDO_REPLAY_STEPS steps of the history from a kept state.
+    """
+    return _undoable(method, True)
+
+
 class Interface:
     """
     Handles State_Data and subclasses communicating with the outside world.
     Properties:
     state - the State_Data object the interface handles
     history - History of the State_Data object
+    checkpoints - Checkpoints of the history, saved with it
+    random - random number generator of the game
+    undo_stack, redo_stack - the game from before the newest commands (at
+                             most UNDO_LIMIT of them) and after the newest
+                             undone ones
+    on_month - if set, called with the data of every month the game
+               advances; skipped months repeat the data of the last cycle
     to_load can be a string - name of the save to be loaded, or
     a State_Data object directly (in this case the history is set to be
     empty). If None is given, a new State_Data object will be created for
     the Interface.
+    Seed is the seed of the game's random number generator - if None, the
+    generator is seeded from the system.
     """
     @overload
-    def __init__(self, to_load: str, /) -> None:
+    def __init__(self, to_load: str, /, *, seed: int | None = None) -> None:
         ...
 
     @overload
     def __init__(self, to_load: State_Data | None = None,
-                 history: History | None = None, /) -> None:
+                 history: History | None = None, /, *,
+                 seed: int | None = None) -> None:
         ...
 
     def __init__(self, to_load: str | State_Data | None = None,
-                 history: History | None = None, /) -> None:
+                 history: History | None = None, /, *,
+                 seed: int | None = None) -> None:
         """
         Creates an Interface for the given state.
         """
+        self.random: Random = Random(seed)
+        self.undo_stack: deque[_Undo_Entry] = deque(maxlen=UNDO_LIMIT)
+        self.redo_stack: list[_Undo_Entry] = []
+        self._undo_depth = 0
+        self.on_month: Callable[[Month_Data], None] | None = None
+        self._recent_months: deque[Month_Data] = deque(maxlen=max(PERIODS))
         if to_load is None:
             self.state = State_Data.generate_empty_state()
             self.history = History(self.state.to_dict(), [])
+            self.checkpoints = Checkpoints(self.state)
             self.save_name: str | None = None
             self.fought: bool = False
         elif isinstance(to_load, State_Data):
@@ -93,6 +198,7 @@ class Interface:
                 self.history = history
             else:
                 self.history: History = History(self.state.to_dict(), [])
+            self.checkpoints: Checkpoints = Checkpoints(self.state)
             self.save_name: str | None = None
             self.fought: bool = False
         else:
@@ -122,10 +228,15 @@ class Interface:
                 history_lines = load_file.read().splitlines()
 
             self.history = History(starting_state, history_lines)
-            self.state.execute_commands(history_lines)
+            self.checkpoints = Checkpoints(self.state)
+            for line, step in replay(self.state, history_lines):
+                self.checkpoints.record(self.state, line, step)
             if dirname != "starting":
                 self.save_name = dirname
             self.fought = False
+            self.undo_stack.clear()
+            self.redo_stack.clear()
+            self._recent_months.clear()
         except IOError as e:
             raise SaveAccessError from e
         except Exception as e:
@@ -153,17 +264,183 @@ class Interface:
                       encoding="utf-8") as save_file:
                 for line in self.history.history_lines:
                     save_file.write(line + '\n')
+
+            # Checkpoints of a history given from outside don't cover it
+            checkpoints_file_name = \
+                "saves/" + dirname + "/" + CHECKPOINTS_FILE_NAME
+            if self.checkpoints.matches(self.history.history_lines):
+                with open(checkpoints_file_name, 'w',
+                          encoding="utf-8") as save_file:
+                    json.dump(self.checkpoints.to_dict(), save_file)
+            elif os.path.exists(checkpoints_file_name):
+                os.remove(checkpoints_file_name)
+
+            Save_Catalog().record(
+                dirname, self.state, self.history.history_lines
+            )
         except IOError:
             raise SaveAccessError
 
+    def _add_history_line(self, line: str) -> None:
+        """
+        Adds the given line to the history and records the state after it in
+        the checkpoints.
+        """
+        self.history.add_history_line(line)
+        lines = self.history.history_lines
+        self.checkpoints.record(
+            self.state, len(lines) - 1, line_steps(lines[-1])
+        )
+
+    def _undo_entry(self, since: _Undo_Entry | None = None, *,
+                    state: State_Data | None) -> _Undo_Entry:
+        """
+        Returns an entry bringing the game back to its current point - from
+        the given entry's point if it is given, else from any later point.
+        The entry keeps the given state, which mustn't be changed later -
+        a copy of the current one, or the current one if it is about to be
+        replaced, or None if it will be replayed.
+        """
+        lines = self.history.history_lines
+        line = since.line if since is not None else max(len(lines) - 1, 0)
+        return _Undo_Entry(
+            state, self.fought, line, lines[line:],
+            self.checkpoints.mark(
+                since.checkpoints if since is not None else None
+            ),
+            len(self.checkpoints.digests)
+        )
+
+    def _replay_base(self, steps: int
+                     ) -> tuple[int, int, int, State_Data | dict[str, Any]]:
+        """
+        Returns the kept state nearest before the given step of the history
+        - the state of an entry of the undo stack, a snapshot of the
+        checkpoints or the starting state - as a tuple (steps before it,
+        its position as yielded by replay, the state or its dict).
+        """
+        base: tuple[int, int, int, State_Data | dict[str, Any]] = \
+            (0, 0, 0, self.history.starting_state_dict)
+        for snapshot in self.checkpoints.snapshots:
+            if base[0] < snapshot["steps"] <= steps:
+                base = (snapshot["steps"], snapshot["line"], snapshot["step"],
+                        snapshot["state"])
+        for entry in self.undo_stack:
+            if entry.state is not None and base[0] < entry.steps <= steps:
+                step = line_steps(entry.lines[0]) if entry.lines else 0
+                base = (entry.steps, entry.line, step, entry.state)
+        return base
+
+    def _can_replay(self, steps: int) -> bool:
+        """
+        Returns whether the state after the given step of the history (the
+        current one) can be remade by replaying at most UNDO_REPLAY_STEPS
+        steps - the checkpoints must cover the whole history.
+        """
+        return steps - self._replay_base(steps)[0] <= UNDO_REPLAY_STEPS \
+            and self.checkpoints.matches(self.history.history_lines)
+
+    def _replayed(self, steps: int) -> State_Data:
+        """
+        Remakes the state after the given step of the history by replaying
+        it from the nearest kept state.
+        """
+        done, line, step, base = self._replay_base(steps)
+        state = deepcopy(base) if isinstance(base, State_Data) \
+            else State_Data.from_dict(base)
+        if done < steps:
+            for _ in replay(state, self.history.history_lines, line, step):
+                done += 1
+                if done == steps:
+                    break
+        return state
+
+    def _restore(self, entry: _Undo_Entry) -> None:
+        """
+        Brings the game to the point of the given entry.
+        """
+        self.fought = entry.fought
+        self.history.history_lines[entry.line:] = entry.lines
+        self.checkpoints.restore(entry.checkpoints)
+        self.state = entry.state if entry.state is not None \
+            else self._replayed(entry.steps)
+
+    def undo(self) -> None:
+        """
+        Reverts the newest command (which wasn't undone yet), without
+        replaying the history.
+        """
+        if not self.undo_stack:
+            raise NothingToUndoError
+        entry = self.undo_stack.pop()
+        self.redo_stack.append(self._undo_entry(entry, state=self.state))
+        self._restore(entry)
+
+    def redo(self) -> None:
+        """
+        Executes again the newest undone command, without calculating it.
+        """
+        if not self.redo_stack:
+            raise NothingToRedoError
+        entry = self.redo_stack.pop()
+        self.undo_stack.append(self._undo_entry(state=self.state))
+        self._restore(entry)
+
+    @undoable_by_replay
     def next_month(self) -> None:
         """
         Advances the month by one and saves it in history.
         """
-        self.state.do_month()
+        month_data = self.state.do_month()
         self.fought = False
-        self.history.add_history_line("next")
+        self._add_history_line("next")
+        if self.on_month is not None:
+            self._recent_months.append(month_data)
+            self.on_month(month_data)
 
+    @undoable_by_replay
+    def skip_months(self, amount: int, period: int) -> None:
+        """
+        Advances the month by the given amount without calculating the
+        months - the state must be in a cycle of the given period, and amount
+        must be a multiple of it. Saves it in history.
+        """
+        self.state.skip_months(amount)
+        self.fought = False
+        self._add_history_line(f"skip {amount} {period}")
+        if self.on_month is not None:
+            cycle = list(self._recent_months)[-period:]
+            for index in range(amount):
+                self._recent_months.append(cycle[index % period])
+                self.on_month(cycle[index % period])
+
+    @undoable_by_replay
+    def next_months(self, amount: int) -> Skip | None:
+        """
+        Advances the month by the given amount and saves it in history.
+        If globals.cycle_tolerance is set and the state reaches a steady state
+        or a 12-month cycle (see cycles.py), the remaining whole cycles are
+        skipped instead of calculated. Returns the skipped months, if any.
+        """
+        detector = Cycle_Detector(globals.cycle_tolerance) \
+            if globals.cycle_tolerance is not None else None
+        skip = None
+        done = 0
+        while done < amount:
+            self.next_month()
+            done += 1
+            if detector is None or skip is not None:
+                continue
+            period = detector.add(self.state)
+            if period is not None:
+                skipped = (amount - done) // period * period
+                if skipped > 0:
+                    self.skip_months(skipped, period)
+                    done += skipped
+                    skip = Skip(skipped, period)
+        return skip
+
+    @undoable
     def transfer_resources(self, class_name: Class_Name, resource: Resource,
                            amount: float, demote: bool = True) -> None:
         """
@@ -184,10 +461,11 @@ class Interface:
 
         self.state.do_transfer(class_name, resource, amount, demote)
 
-        self.history.add_history_line(
+        self._add_history_line(
             f"transfer {class_name.name} {resource.name} {amount}"
         )
 
+    @undoable
     def secure_resources(self, resource: Resource, amount: float | None
                          ) -> None:
         """
@@ -207,10 +485,11 @@ class Interface:
 
         self.state.do_secure(resource, amount)
 
-        self.history.add_history_line(
+        self._add_history_line(
             f"secure {resource.name} {amount}"
         )
 
+    @undoable
     def set_govt_optimal(self, resource: Resource, amount: float) -> None:
         """
         Sets government's optimal resource to the given value.
@@ -221,7 +500,7 @@ class Interface:
         check_arg(amount >= 0, "negative optimal resources")
         self.state.do_optimal(resource, amount)
 
-        self.history.add_history_line(
+        self._add_history_line(
             f"optimal {resource.name} {amount}"
         )
 
@@ -243,6 +522,7 @@ class Interface:
                        lambda arg: arg in RESOURCE_STR),
     }
 
+    @undoable
     def set_law(self, law: str, argument: str | None, value: float) -> None:
         """
         Sets the given law to the given value.
@@ -254,10 +534,11 @@ class Interface:
 
         self.state.do_set_law(law, argument, value)
 
-        self.history.add_history_line(
+        self._add_history_line(
             f"laws set {law} {argument} {value}"
         )
 
+    @undoable
     def force_promotion(self, class_name: Class_Name, number: float) -> None:
         """
         Promotes the given number of people to the given class using
@@ -268,17 +549,19 @@ class Interface:
 
         if lower_class.population < number:
             raise NotEnoughClassPopulation
-        if self.state.government.real_resources < (
-             INBUILT_RESOURCES[class_name] -
-             INBUILT_RESOURCES[lower_class.class_name]) * number:
+        if self.state.government.real_resources < \
+                self.state.sm.rules.inbuilt_deltas[
+                    class_name, lower_class.class_name
+                ] * number:
             raise NotEnoughGovtResources
 
         self.state.do_force_promotion(class_name, number)
 
-        self.history.add_history_line(
+        self._add_history_line(
             f"promote {class_name.name} {number}"
         )
 
+    @undoable
     def recruit(self, class_name: Class_Name, number: float) -> None:
         """
         Recruits the given number of people from the given social class to the
@@ -297,7 +580,7 @@ class Interface:
 
         self.state.do_recruit(class_name, number)
 
-        self.history.add_history_line(
+        self._add_history_line(
             f"recruit {class_name.name} {number}"
         )
 
@@ -326,6 +609,44 @@ class Interface:
             est_strength = (strength, strength + 0.5)
             return est_brigands, est_strength
 
+    @staticmethod
+    def _draw_enemies(draw_gauss: Callable[[float, float], float]) -> int:
+        """
+        Draws the number of enemies in an attack on a foreign country, using
+        the given Gaussian distribution function.
+        """
+        return max(floor(draw_gauss(100, 20)), 10)
+
+    def estimate_fight(self, target: str, samples: int = 2000,
+                       seed: int = 0) -> Fight_Estimate:
+        """
+        Estimates outcomes of an attack against the given target from the
+        given number of sampled enemies. Brigands are sampled from the ranges
+        given by get_brigands. Samples are drawn from a separate random
+        generator with the given seed, so the estimate doesn't change the
+        game's random numbers and is the same until the state changes.
+        """
+        check_arg(samples > 0, "number of samples must be positive")
+        generator = Random(seed)
+        if target != "crime":
+            enemies = [
+                Interface._draw_enemies(generator.gauss)
+                for _ in range(samples)
+            ]
+            return self.state.estimate_fight(target, enemies)
+
+        brigands, strength = self.get_brigands(globals.debug)
+        if isinstance(brigands, tuple) and isinstance(strength, tuple):
+            return self.state.estimate_fight(
+                target,
+                [generator.uniform(*brigands) for _ in range(samples)],
+                [generator.uniform(*strength) for _ in range(samples)]
+            )
+        return self.state.estimate_fight(
+            target, [brigands], [strength]  # type: ignore
+        )
+
+    @undoable
     def fight(self, target: str) -> tuple[bool, Soldiers, float]:
         """
         Executes an attack against the given target.
@@ -335,11 +656,12 @@ class Interface:
         if self.fought:
             raise AlreadyFoughtError
 
-        enemies = max(floor(gauss(100, 20)), 10) if target != "crime" else None
+        enemies = Interface._draw_enemies(self.random.gauss) \
+            if target != "crime" else None
         results = self.state.do_fight(target, enemies)
         self.fought = True
 
-        self.history.add_history_line(
+        self._add_history_line(
             f"fight {target} {enemies}"
         )
         return results
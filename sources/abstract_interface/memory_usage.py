@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import pickle
+from collections import deque
+from copy import deepcopy
+from typing import NamedTuple
+
+from ..auxiliaries.memory import (Object_Size, Phase_Memory, peak_size,
+                                  profiling, retained_size)
+from ..state.state_data import State_Data
+from ..state.state_data_base_and_do_month import (EveryoneDeadError,
+                                                  RebellionError)
+from .history import History
+
+# Months profiled by profile_months by default
+MEMORY_MONTHS = 12
+
+
+class History_Memory(NamedTuple):
+    """
+    Memory used by a history of the given number of months - kept by the
+    History object itself and at the peak of remaking all its months at
+    once (obtain_whole_history, used e.g. by plots) or one by one
+    (iterate_months), in bytes.
+    """
+    months: int
+    retained: Object_Size
+    whole_peak: int
+    iterate_peak: int
+
+
+class Memory_Report(NamedTuple):
+    """
+    Result of profile_months - memory allocated by the phases of the months
+    simulated (fewer than asked for if the game ended) and kept by a state.
+    """
+    months: int
+    phases: list[Phase_Memory]
+    state: Object_Size
+
+
+def state_size(state: State_Data) -> Object_Size:
+    """
+    Returns the memory kept by the state, measured on its copy.
+    """
+    data = pickle.dumps(state)
+    return retained_size(lambda: pickle.loads(data))
+
+
+def history_memory(history: History) -> History_Memory:
+    """
+    Measures the memory used by the history (see History_Memory).
+    """
+    months = 0
+    for _ in history.iterate_months():
+        months += 1
+    return History_Memory(
+        months,
+        retained_size(lambda: History(deepcopy(history.starting_state_dict),
+                                      history.history_lines)),
+        peak_size(history.obtain_whole_history),
+        peak_size(lambda: deque(history.iterate_months(), maxlen=0))
+    )
+
+
+def profile_months(state: State_Data, months: int = MEMORY_MONTHS
+                   ) -> Memory_Report:
+    """
+    Simulates the given number of months on a copy of the state, measuring
+    memory allocated by every phase of do_month.
+    """
+    if months < 1:
+        raise ValueError("months must be positive")
+    copy: State_Data = pickle.loads(pickle.dumps(state))
+    with profiling() as profile:
+        try:
+            for _ in range(months):
+                copy.do_month()
+        except (EveryoneDeadError, RebellionError):
+            # The month which ended the game has only some phases measured
+            pass
+    return Memory_Report(profile.months, profile.report(), state_size(state))
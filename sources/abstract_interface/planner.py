@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import pickle
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from time import perf_counter
+from typing import Callable, NamedTuple
+
+from ..auxiliaries.constants import (CLASS_TO_SOLDIER, RECRUITMENT_COST,
+                                     RECRUITABLE_PART)
+from ..auxiliaries.enums import Class_Name, Resource
+from ..auxiliaries.resources import Resources
+from ..state.state_data import State_Data
+from ..state.state_data_base_and_do_month import (EveryoneDeadError,
+                                                  RebellionError)
+from .interface import (AlreadyFoughtError, EmptyClassError, Interface,
+                        InvalidArgumentError, NoSoldiersError,
+                        NotEnoughClassPopulation, NotEnoughClassResources,
+                        NotEnoughGovtResources)
+
+# Months simulated after every candidate action
+PLANNER_HORIZON = 3
+# Seconds a single decision may take
+PLANNER_BUDGET = 1.0
+# Part of the government's (or a class') resources moved by a candidate
+# transfer or secure, and part of a class promoted or recruited
+PLANNER_PART = 0.25
+# Change of a law (tax rate or minimum wage) considered by a candidate
+PLANNER_LAW_STEP = 0.05
+# Number of enemies assumed when a rollout plunders (their mean number)
+PLANNER_ENEMIES = 100
+# Score lost for every month of the horizon the game doesn't survive
+LOST_MONTH_PENALTY = 1e6
+# Weight of the worth of the government's resources in the score
+WEALTH_WEIGHT = 0.01
+
+# Errors raised by Interface when an action can't be taken
+ACTION_ERRORS = (
+    NotEnoughGovtResources, NotEnoughClassResources,
+    NotEnoughClassPopulation, EmptyClassError, InvalidArgumentError,
+    NoSoldiersError, AlreadyFoughtError
+)
+
+
+class Decision(NamedTuple):
+    """
+    Result of plan - the chosen action (a command in the history format or
+    None for doing nothing) with its score and the score of doing nothing.
+    evaluated is the number of candidates rolled out within the budget.
+    """
+    action: str | None
+    score: float
+    baseline: float
+    evaluated: int
+    candidates: int
+
+
+def score(state: State_Data, survived: int, horizon: int) -> float:
+    """
+    Scores the state at the end of a rollout. Surviving the horizon matters
+    the most, then the population (minus the population weighed by its
+    unhappiness) and a little the worth of the government's resources.
+    """
+    population = 0.0
+    unrest = 0.0
+    for social_class in state:
+        population += social_class.population
+        unrest += social_class.population * min(social_class.happiness, 0)
+    wealth = state.government.real_resources.worth(state.prices)
+    return population + unrest / 100 + WEALTH_WEIGHT * wealth \
+        - LOST_MONTH_PENALTY * (horizon - survived)
+
+
+def rollout(snapshot: bytes, action: str | None,
+            horizon: int = PLANNER_HORIZON) -> float:
+    """
+    Forks the pickled state, executes the action on the fork, simulates
+    horizon months without gathering their data and returns the score.
+    """
+    state: State_Data = pickle.loads(snapshot)
+    if action is not None:
+        state.execute_commands([action])
+    survived = 0
+    try:
+        for _ in range(horizon):
+            state.do_month(report=False)
+            survived += 1
+    except (EveryoneDeadError, RebellionError):
+        pass
+    return score(state, survived, horizon)
+
+
+def _affordable(resources: Resources, cost: Resources) -> int:
+    """
+    Returns how many times the cost can be paid from the resources.
+    """
+    times = [resources[resource] / value
+             for resource, value in cost.items() if value > 0]
+    return int(min(times)) if times else 0
+
+
+def candidate_actions(state: State_Data, fought: bool = False
+                      ) -> list[str | None]:
+    """
+    Returns the actions considered in the state, in the history format, in
+    order of priority - doing nothing (None) first. Only actions Interface
+    allows are given.
+    """
+    government = state.government
+    actions: list[str | None] = [None]
+
+    for resource in (Resource.food, Resource.wood):
+        amount = round(government.resources[resource] * PLANNER_PART, 2)
+        if amount > 0:
+            actions.extend(
+                f"transfer {social_class.class_name.name} {resource.name} "
+                f"{amount}"
+                for social_class in state if social_class.population > 0
+            )
+    to_secure = int(government.resources.food * PLANNER_PART)
+    if to_secure > 0:
+        actions.append(f"secure food {to_secure}")
+    to_release = int(government.secure_resources.food * PLANNER_PART)
+    if to_release > 0:
+        actions.append(f"secure food {-to_release}")
+
+    for social_class in state:
+        lower_class = social_class.lower_class
+        if lower_class is social_class:
+            continue
+        number = min(
+            int(lower_class.population * PLANNER_PART),
+            _affordable(government.real_resources,
+                        state.sm.rules.inbuilt_deltas[
+                            social_class.class_name, lower_class.class_name
+                        ])
+        )
+        if number > 0:
+            actions.append(f"promote {social_class.class_name.name} {number}")
+    for social_class in state:
+        cost = RECRUITMENT_COST[CLASS_TO_SOLDIER[social_class.class_name]]
+        number = min(
+            int(social_class.population * RECRUITABLE_PART * PLANNER_PART),
+            _affordable(government.real_resources, cost)
+        )
+        if number > 0:
+            actions.append(f"recruit {social_class.class_name.name} {number}")
+
+    for tax in ("personal", "income"):
+        for class_name, rate in state.sm.tax_rates[tax].items():
+            for value in (rate - PLANNER_LAW_STEP, rate + PLANNER_LAW_STEP):
+                if 0 <= value <= 1:
+                    actions.append(f"laws set tax_{tax} {class_name.name} "
+                                   f"{round(value, 6)}")
+    wage = state.sm.others_minimum_wage
+    for value in (wage - PLANNER_LAW_STEP, wage + PLANNER_LAW_STEP):
+        if 0 <= value <= 1:
+            actions.append(f"laws set wage_minimum None {round(value, 6)}")
+
+    if government.soldiers.number >= 1 and not fought:
+        actions.append("fight crime None")
+        actions.append(f"fight plunder {PLANNER_ENEMIES}")
+    return actions
+
+
+def plan(state: State_Data, fought: bool = False,
+         horizon: int = PLANNER_HORIZON, budget: float = PLANNER_BUDGET,
+         executor: Executor | None = None,
+         clock: Callable[[], float] = perf_counter) -> Decision:
+    """
+    Chooses the action with the best score after horizon months. The state
+    is pickled once and every rollout forks it by unpickling, which is
+    cheaper than a deepcopy. Candidates are rolled out in order of priority
+    until the budget (in seconds) runs out, in parallel if an executor is
+    given - unfinished rollouts are then cancelled. Doing nothing is always
+    rolled out, so it is chosen if nothing else is evaluated in time.
+    """
+    if horizon < 1:
+        raise ValueError("horizon must be positive")
+    deadline = clock() + budget
+    snapshot = pickle.dumps(state)
+    actions = candidate_actions(state, fought)
+    scores: dict[str | None, float] = {None: rollout(snapshot, None, horizon)}
+
+    if executor is None:
+        for action in actions[1:]:
+            if clock() >= deadline:
+                break
+            scores[action] = rollout(snapshot, action, horizon)
+    else:
+        futures: dict[Future[float], str | None] = {
+            executor.submit(rollout, snapshot, action, horizon): action
+            for action in actions[1:]
+        }
+        pending = set(futures)
+        while pending:
+            remaining = deadline - clock()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, remaining,
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                scores[futures[future]] = future.result()
+        for future in pending:
+            future.cancel()
+
+    # Ties are won by the earlier candidate, so doing nothing is preferred
+    best = max(scores, key=lambda action: (scores[action],
+                                           -actions.index(action)))
+    return Decision(best, scores[best], scores[None], len(scores),
+                    len(actions))
+
+
+def apply_action(interface: Interface, action: str | None) -> bool:
+    """
+    Takes the action (in the history format) through the interface, so
+    that it is checked and recorded in the history. Returns whether it was
+    taken.
+    """
+    if action is None:
+        return False
+    command = action.split(' ')
+    try:
+        if command[0] == "transfer":
+            interface.transfer_resources(Class_Name[command[1]],
+                                         Resource[command[2]],
+                                         float(command[3]))
+        elif command[0] == "secure":
+            interface.secure_resources(Resource[command[1]], int(command[2]))
+        elif command[0] == "laws":
+            interface.set_law(command[2],
+                              command[3] if command[3] != "None" else None,
+                              float(command[4]))
+        elif command[0] == "promote":
+            interface.force_promotion(Class_Name[command[1]],
+                                      int(command[2]))
+        elif command[0] == "recruit":
+            interface.recruit(Class_Name[command[1]], int(command[2]))
+        elif command[0] == "fight":
+            interface.fight(command[1])
+        else:
+            raise ValueError(f"invalid action: {action}")
+    except ACTION_ERRORS:
+        return False
+    return True
+
+
+def govern(interface: Interface, months: int,
+           horizon: int = PLANNER_HORIZON, budget: float = PLANNER_BUDGET,
+           executor: Executor | None = None) -> list[Decision]:
+    """
+    Plays the given number of months: at the beginning of every month the
+    planned action is taken (see plan), then the month ends. Returns the
+    decisions, with None as the action of those which couldn't be taken.
+    """
+    decisions: list[Decision] = []
+    for _ in range(months):
+        decision = plan(interface.state, interface.fought, horizon, budget,
+                        executor)
+        if not apply_action(interface, decision.action):
+            decision = decision._replace(action=None)
+        decisions.append(decision)
+        interface.next_month()
+    return decisions
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from tempfile import NamedTemporaryFile
+from typing import Any, Callable, Generator, Sequence, TypedDict
+
+from ..state.state_data import State_Data
+from .checkpoints import line_months
+
+SAVE_FILE_NAMES = ("starting_state.json", "history.txt")
+CATALOG_FILE_NAME = "catalog.json"
+# Seconds after which a lock of the catalog is considered abandoned (its
+# process crashed) and seconds between attempts to take the lock
+CATALOG_LOCK_TIMEOUT = 10
+CATALOG_LOCK_POLL = 0.01
+
+
+class Save_Info(TypedDict):
+    month: str
+    year: int
+    population: float
+    size: int
+    history_length: int
+    last_checkpoint: int
+    modified: int
+    # State_Data.digest of the current state
+    digest: str
+
+
+def _last_checkpoint(history_lines: Sequence[str]) -> int:
+    """
+    Returns the number of history lines up to and including the last month
+    end - replaying the save from there on only executes commands of the
+    current month.
+    """
+    for index in range(len(history_lines) - 1, -1, -1):
+        if line_months(history_lines[index]) > 0:
+            return index + 1
+    return 0
+
+
+class Save_Catalog:
+    """
+    Index of the saves in the saves directory, kept in a catalog file there.
+    Each entry holds data about the current state of the save, so that saves
+    can be listed without being loaded. Entries are made by Interface's
+    save_data. Entries of saves changed in any other way are rebuilt lazily
+    (by replaying the save) when the saves are listed.
+    The catalog is changed under a lock file, so that processes sharing the
+    saves directory (e.g. the server and the CLI) don't lose each other's
+    entries.
+    """
+    def __init__(self, saves_dir: str = "saves") -> None:
+        self.saves_dir = saves_dir
+
+    @property
+    def catalog_path(self) -> str:
+        return os.path.join(self.saves_dir, CATALOG_FILE_NAME)
+
+    @property
+    def lock_path(self) -> str:
+        return self.catalog_path + ".lock"
+
+    @contextmanager
+    def _locked(self) -> Generator[None, None, None]:
+        """
+        Holds the lock of the catalog inside the with block, waiting for
+        other processes to release it. A lock older than CATALOG_LOCK_TIMEOUT
+        is taken over.
+        """
+        while True:
+            try:
+                os.close(os.open(self.lock_path,
+                                 os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                pass
+            try:
+                age = time.time() - os.stat(self.lock_path).st_mtime
+                if age > CATALOG_LOCK_TIMEOUT:
+                    os.remove(self.lock_path)
+                    continue
+            except FileNotFoundError:
+                continue
+            time.sleep(CATALOG_LOCK_POLL)
+        try:
+            yield
+        finally:
+            try:
+                os.remove(self.lock_path)
+            except FileNotFoundError:
+                pass
+
+    def _update(self, change: Callable[[dict[str, Any]], bool]) -> None:
+        """
+        Reads the catalog, changes it with the given function and writes it
+        back if the function returns True, all under the lock.
+        """
+        with self._locked():
+            catalog = self._read()
+            if change(catalog):
+                self._write(catalog)
+
+    def _stat_save(self, name: str) -> tuple[int, int] | None:
+        """
+        Returns tuple (modification time in ns, size in bytes) of the save's
+        files, or None if the save is incomplete.
+        """
+        modified = 0
+        size = 0
+        for file_name in SAVE_FILE_NAMES:
+            try:
+                stat = os.stat(os.path.join(self.saves_dir, name, file_name))
+            except OSError:
+                return None
+            modified = max(modified, stat.st_mtime_ns)
+            size += stat.st_size
+        return modified, size
+
+    def _read(self) -> dict[str, Any]:
+        """
+        Returns the contents of the catalog file, or an empty catalog if the
+        file is missing or unreadable.
+        """
+        try:
+            with open(self.catalog_path, 'r', encoding="utf-8") as file:
+                catalog = json.load(file)
+            if isinstance(catalog.get("saves"), dict) and \
+                    isinstance(catalog.get("broken"), dict):
+                return catalog
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {"saves": {}, "broken": {}}
+
+    def _write(self, catalog: dict[str, Any]) -> None:
+        """
+        Atomically replaces the catalog file with the given catalog.
+        """
+        with NamedTemporaryFile('w', encoding="utf-8", dir=self.saves_dir,
+                                prefix=CATALOG_FILE_NAME, suffix=".tmp",
+                                delete=False) as file:
+            json.dump(catalog, file)
+        os.replace(file.name, self.catalog_path)
+
+    @staticmethod
+    def _make_info(state: State_Data, history_lines: Sequence[str],
+                   modified: int, size: int) -> Save_Info:
+        """
+        Creates a catalog entry for a save with the given state and history.
+        """
+        return {
+            "month": state.month.name,
+            "year": state.year,
+            "population": state.total_population,
+            "size": size,
+            "history_length": len(history_lines),
+            "last_checkpoint": _last_checkpoint(history_lines),
+            "modified": modified,
+            "digest": state.digest()
+        }
+
+    def _rebuild_info(self, name: str, modified: int, size: int
+                      ) -> Save_Info:
+        """
+        Creates a catalog entry for the given save by replaying it. Raises an
+        exception if the save is malformed.
+        """
+        save_dir = os.path.join(self.saves_dir, name)
+        with open(os.path.join(save_dir, SAVE_FILE_NAMES[0]), 'r',
+                  encoding="utf-8") as file:
+            state = State_Data.from_dict(json.load(file))
+        with open(os.path.join(save_dir, SAVE_FILE_NAMES[1]), 'r',
+                  encoding="utf-8") as file:
+            history_lines = file.read().splitlines()
+        state.execute_commands(history_lines)
+        return Save_Catalog._make_info(state, history_lines, modified, size)
+
+    def record(self, name: str, state: State_Data,
+               history_lines: Sequence[str]) -> None:
+        """
+        Makes the catalog entry for the given save, which has just been saved
+        with the given current state and history.
+        """
+        stat = self._stat_save(name)
+        if stat is None:
+            return
+        info = Save_Catalog._make_info(state, history_lines, *stat)
+
+        def change(catalog: dict[str, Any]) -> bool:
+            catalog["saves"][name] = info
+            catalog["broken"].pop(name, None)
+            return True
+
+        self._update(change)
+
+    def remove(self, name: str) -> None:
+        """
+        Removes the catalog entry of the given save.
+        """
+        def change(catalog: dict[str, Any]) -> bool:
+            if name not in catalog["saves"] and name not in catalog["broken"]:
+                return False
+            catalog["saves"].pop(name, None)
+            catalog["broken"].pop(name, None)
+            return True
+
+        self._update(change)
+
+    def list_saves(self) -> dict[str, Save_Info]:
+        """
+        Returns catalog entries of all valid saves, sorted by name. Entries of
+        saves changed since they were made are rebuilt, entries of removed
+        saves are deleted. Saves are replayed without the lock - the entries
+        are merged with the catalog as it is when they are written.
+        """
+        catalog = self._read()
+        old_saves: dict[str, Save_Info] = catalog["saves"]
+        old_broken: dict[str, list[int]] = catalog["broken"]
+        saves: dict[str, Save_Info] = {}
+        broken: dict[str, list[int]] = {}
+        try:
+            names = sorted(
+                entry.name for entry in os.scandir(self.saves_dir)
+                if entry.is_dir()
+            )
+        except OSError:
+            names = []
+
+        for name in names:
+            stat = self._stat_save(name)
+            if stat is None:
+                continue
+            modified, size = stat
+            info = old_saves.get(name)
+            if info is not None and info.get("modified") == modified \
+                    and info.get("size") == size and "digest" in info:
+                saves[name] = info
+            elif old_broken.get(name) == [modified, size]:
+                broken[name] = [modified, size]
+            else:
+                try:
+                    saves[name] = self._rebuild_info(name, modified, size)
+                except Exception:
+                    # As in Interface.load_data - any error of replaying the
+                    # history (also a game over) means the save is malformed
+                    broken[name] = [modified, size]
+
+        if saves != old_saves or broken != old_broken:
+            try:
+                self._update(
+                    lambda current: self._merge(current, names, saves, broken)
+                )
+            except OSError:
+                pass
+        return saves
+
+    def _merge(self, catalog: dict[str, Any], names: Sequence[str],
+               saves: dict[str, Save_Info], broken: dict[str, list[int]]
+               ) -> bool:
+        """
+        Puts the entries found by list_saves into the catalog, unless another
+        process has recorded a newer version of a save meanwhile. Entries of
+        saves which weren't found are deleted, unless they were recorded
+        meanwhile. Returns whether the catalog was changed.
+        """
+        changed = False
+        for name in list(catalog["saves"]) + list(catalog["broken"]):
+            if name not in names and self._stat_save(name) is None:
+                catalog["saves"].pop(name, None)
+                catalog["broken"].pop(name, None)
+                changed = True
+        for name in names:
+            current = catalog["saves"].get(name)
+            found: Any = saves.get(name, broken.get(name))
+            if found is None:
+                continue
+            modified = found["modified"] if name in saves else found[0]
+            if current is not None and current.get("modified", 0) > modified:
+                continue
+            if name in saves:
+                if current == found:
+                    continue
+                catalog["saves"][name] = found
+                catalog["broken"].pop(name, None)
+            else:
+                if catalog["broken"].get(name) == found:
+                    continue
+                catalog["broken"][name] = found
+                catalog["saves"].pop(name, None)
+            changed = True
+        return changed
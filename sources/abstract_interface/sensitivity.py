@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor
+from typing import Any, Callable, Iterable, NamedTuple
+
+from ..state.state_data import State_Data
+from ..state.state_data_base_and_do_month import (EveryoneDeadError,
+                                                  RebellionError)
+from ..state.state_modifiers import State_Modifiers
+
+# Relative change of the modifiers
+SENSITIVITY_STEP = 0.1
+# Change of the modifiers equal to 0 (e.g. tax rates)
+SENSITIVITY_ZERO_STEP = 0.01
+# Months simulated after every perturbation
+SENSITIVITY_MONTHS = 24
+
+
+def _total_population(state: State_Data) -> float:
+    return sum(social_class.population for social_class in state)
+
+
+def _government_wealth(state: State_Data) -> float:
+    return state.government.real_resources.worth(state.prices)
+
+
+def _average_happiness(state: State_Data) -> float:
+    population = _total_population(state)
+    if population == 0:
+        return 0
+    return sum(social_class.happiness * social_class.population
+               for social_class in state) / population
+
+
+# Outcomes of a simulation, calculated from the state at its end; "months"
+# (the number of months before the game ended, if it did) is added to them
+OUTCOMES: dict[str, Callable[[State_Data], float]] = {
+    "population": _total_population,
+    "government_wealth": _government_wealth,
+    "happiness": _average_happiness
+}
+
+
+class Sensitivity(NamedTuple):
+    """
+    Sensitivity of the outcomes to a modifier, which was changed from value
+    to low and high. elasticities are relative changes of the outcomes
+    divided by the relative change of the modifier (see analyse).
+    """
+    modifier: str
+    value: float
+    low: float
+    high: float
+    elasticities: dict[str, float]
+
+
+class Sensitivity_Analysis(NamedTuple):
+    """
+    Result of analyse - outcomes of the unchanged simulation and the
+    sensitivities to every modifier.
+    """
+    months: int
+    baseline: dict[str, float]
+    sensitivities: list[Sensitivity]
+
+    def ranked(self, outcome: str = "population") -> list[Sensitivity]:
+        """
+        Returns the sensitivities ordered by the absolute elasticity of the
+        given outcome, the largest first.
+        """
+        return sorted(
+            self.sensitivities,
+            key=lambda sensitivity: abs(sensitivity.elasticities[outcome]),
+            reverse=True
+        )
+
+
+def modifier_names(modifiers: State_Modifiers) -> list[str]:
+    """
+    Returns names of the numeric modifiers - fields of State_Modifiers
+    and tax rates, named "tax_rates.<tax>.<class>".
+    """
+    names = [
+        name for name in State_Modifiers.__slots__
+        if type(getattr(modifiers, name, None)) in {int, float}
+    ]
+    for tax in sorted(modifiers.tax_rates):
+        names.extend(f"tax_rates.{tax}.{class_name.name}"
+                     for class_name in modifiers.tax_rates[tax])
+    return names
+
+
+def get_modifier(modifiers: State_Modifiers, name: str) -> float:
+    if name.startswith("tax_rates."):
+        _, tax, class_name = name.split('.')
+        for key, value in modifiers.tax_rates[tax].items():
+            if key.name == class_name:
+                return value
+        raise KeyError(name)
+    return getattr(modifiers, name)
+
+
+def set_modifier(modifiers: State_Modifiers, name: str, value: float
+                 ) -> None:
+    if name.startswith("tax_rates."):
+        _, tax, class_name = name.split('.')
+        rates = modifiers.tax_rates[tax]
+        for key in rates:
+            if key.name == class_name:
+                rates[key] = value
+                return
+        raise KeyError(name)
+    if not hasattr(modifiers, name):
+        raise KeyError(name)
+    setattr(modifiers, name, value)
+
+
+def simulate(state_dict: dict[str, Any], months: int,
+             modifier: str | None = None, value: float = 0
+             ) -> dict[str, float]:
+    """
+    Simulates the given number of months of the state, with the modifier
+    set to the value (if given), and returns the outcomes.
+    """
+    state = State_Data.from_dict(state_dict)
+    if modifier is not None:
+        set_modifier(state.sm, modifier, value)
+    survived = 0
+    try:
+        for _ in range(months):
+            state.do_month()
+            survived += 1
+    except (EveryoneDeadError, RebellionError):
+        pass
+    outcomes = {name: outcome(state) for name, outcome in OUTCOMES.items()}
+    outcomes["months"] = survived
+    return outcomes
+
+
+def _simulate_job(job: tuple[dict[str, Any], int, str | None, float]
+                  ) -> dict[str, float]:
+    return simulate(*job)
+
+
+def analyse(state: State_Data, months: int = SENSITIVITY_MONTHS,
+            modifiers: Iterable[str] | None = None,
+            step: float = SENSITIVITY_STEP,
+            zero_step: float = SENSITIVITY_ZERO_STEP,
+            executor: Executor | None = None) -> Sensitivity_Analysis:
+    """
+    Analyses how the outcomes of simulating the given number of months of
+    the state depend on the modifiers (all numeric ones if None). Every
+    modifier is changed by step of its value both ways (by zero_step, if it
+    is 0; never below 0) and the elasticity of every outcome is (y_high -
+    y_low) / y * value / (high - low), where y is the outcome of the
+    unchanged simulation - the value or y is replaced with 1 if it is 0.
+    All the simulations are independent, so an executor (e.g. a
+    ProcessPoolExecutor) can run them in parallel.
+    """
+    if months < 1 or step <= 0 or zero_step <= 0:
+        raise ValueError("months and steps must be positive")
+    state_dict = state.to_dict()
+    names = modifier_names(state.sm) if modifiers is None \
+        else list(modifiers)
+
+    ranges: list[tuple[str, float, float, float]] = []
+    jobs: list[tuple[dict[str, Any], int, str | None, float]] = [
+        (state_dict, months, None, 0)
+    ]
+    for name in names:
+        value = get_modifier(state.sm, name)
+        delta = step * abs(value) if value != 0 else zero_step
+        low, high = max(value - delta, 0), value + delta
+        ranges.append((name, value, low, high))
+        jobs.append((state_dict, months, name, low))
+        jobs.append((state_dict, months, name, high))
+
+    if executor is None:
+        results = [_simulate_job(job) for job in jobs]
+    else:
+        results = list(executor.map(_simulate_job, jobs))
+
+    baseline = results[0]
+    sensitivities: list[Sensitivity] = []
+    for index, (name, value, low, high) in enumerate(ranges):
+        outcomes_low = results[2 * index + 1]
+        outcomes_high = results[2 * index + 2]
+        scale = (abs(value) or 1) / (high - low)
+        sensitivities.append(Sensitivity(name, value, low, high, {
+            outcome: (outcomes_high[outcome] - outcomes_low[outcome])
+            / (abs(baseline[outcome]) or 1) * scale
+            for outcome in baseline
+        }))
+    return Sensitivity_Analysis(months, baseline, sensitivities)
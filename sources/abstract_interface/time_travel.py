@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from copy import deepcopy
+from typing import NamedTuple
+
+from ..state.state_data import State_Data
+from .checkpoints import line_months
+from .history import History
+
+# Months between in-memory snapshots of the state
+SNAPSHOT_INTERVAL = 12
+# Number of recently viewed states kept
+CACHE_SIZE = 16
+
+
+class _Position(NamedTuple):
+    """
+    Position in a history - lines before line were executed, and step
+    months of the line (if it is a "next" line). months is the number of
+    months advanced since the start.
+    """
+    line: int
+    step: int
+    months: int
+
+
+class Time_Machine:
+    """
+    Reconstructs the state at any month of a history. The state at month m
+    is the state after m months and the commands executed before the next
+    month - the state at the last month is the current one. States are
+    replayed from the nearest of the in-memory snapshots, which are taken
+    every interval months while replaying. The cache_size most recently
+    viewed states are kept. States returned are shared and must not be
+    changed. The history may grow (new commands are noticed); if its older
+    lines change (e.g. a command is undone), everything is recalculated.
+    """
+    def __init__(self, history: History, interval: int = SNAPSHOT_INTERVAL,
+                 cache_size: int = CACHE_SIZE) -> None:
+        if interval < 1 or cache_size < 1:
+            raise ValueError("interval and cache_size must be positive")
+        self.history = history
+        self.interval = interval
+        self.cache_size = cache_size
+        self._lines: list[str] = []
+        self._months = 0
+        self._snapshots: list[tuple[_Position, State_Data]] = [(
+            _Position(0, 0, 0),
+            State_Data.from_dict(history.starting_state_dict)
+        )]
+        self._cache: OrderedDict[int, State_Data] = OrderedDict()
+
+    def _synchronize(self) -> None:
+        """
+        Drops snapshots and cached states which the changes of the history
+        made outdated.
+        """
+        lines = self.history.history_lines
+        if lines == self._lines:
+            return
+        known = max(len(self._lines) - 1, 0)
+        if lines[:known] != self._lines[:known]:
+            # Older lines changed - only the start is still valid
+            del self._snapshots[1:]
+            self._cache.clear()
+        else:
+            # The last month could have gained commands
+            self._snapshots[1:] = [
+                (position, state) for position, state in self._snapshots[1:]
+                if position.months < self._months
+            ]
+            for month in [month for month in self._cache
+                          if month >= self._months]:
+                del self._cache[month]
+        self._lines = lines.copy()
+        self._months = sum(line_months(line) for line in lines)
+
+    @property
+    def months(self) -> int:
+        """
+        Number of months of the history.
+        """
+        self._synchronize()
+        return self._months
+
+    def _advance(self, state: State_Data, position: _Position, stop: int,
+                 target: int) -> _Position | None:
+        """
+        Advances the state from the position to month stop, including the
+        commands after it. Skipped months are skipped whole, even if they
+        pass stop, unless they pass target - then the state is advanced to
+        target and None is returned (the state can't be advanced further).
+        Otherwise returns the new position.
+        """
+        lines = self._lines
+        line, step, months = position
+        while line < len(lines):
+            command = lines[line].split(' ')
+            if command[0] == "next":
+                if step == int(command[1]):
+                    line, step = line + 1, 0
+                    continue
+                if months >= stop:
+                    break
+                state.do_month()
+                step += 1
+                months += 1
+            elif command[0] == "skip":
+                if months >= stop:
+                    break
+                amount, period = int(command[1]), int(command[2])
+                if months + amount <= target:
+                    state.skip_months(amount)
+                    line, months = line + 1, months + amount
+                    continue
+                # The state in the middle of the skipped months repeats
+                # the last cycle
+                remaining = target - months
+                state.skip_months(remaining - remaining % period)
+                for _ in range(remaining % period):
+                    state.do_month()
+                return None
+            else:
+                state.execute_commands([lines[line]])
+                line += 1
+        return _Position(line, step, months)
+
+    def state_at(self, month: int) -> State_Data:
+        """
+        Returns the state at the given month (see the class' description).
+        """
+        self._synchronize()
+        if not 0 <= month <= self._months:
+            raise ValueError("month out of the range of the history")
+        if month in self._cache:
+            self._cache.move_to_end(month)
+            return self._cache[month]
+
+        index = len(self._snapshots) - 1
+        while self._snapshots[index][0].months > month:
+            index -= 1
+        position, snapshot = self._snapshots[index]
+        state = deepcopy(snapshot)
+        while True:
+            stop = min(month, (position.months // self.interval + 1)
+                       * self.interval)
+            new_position = self._advance(state, position, stop, month)
+            if new_position is None:
+                break
+            position = new_position
+            if position.months % self.interval == 0 and \
+                    position.months > self._snapshots[-1][0].months:
+                self._snapshots.append((position, deepcopy(state)))
+            if position.months >= month:
+                break
+
+        self._cache[month] = state
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return state
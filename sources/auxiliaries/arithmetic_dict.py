@@ -17,9 +17,10 @@ class Arithmetic_Dict(Generic[T], dict[T, float]):
             result[key] = self.get(key, 0) + other.get(key, 0)
         return result
 
-    def __IADD__(self, other: Mapping[T, float]) -> None:
-        for key in self | other:
-            self[key] = self.get(key, 0) + other.get(key, 0)
+    def __iadd__(self, other: Mapping[T, float]) -> Self:
+        for key, value in other.items():
+            self[key] = self.get(key, 0) + value
+        return self
 
     def __neg__(self) -> Self:
         result = self.copy()
@@ -33,9 +34,10 @@ class Arithmetic_Dict(Generic[T], dict[T, float]):
             result[key] = self.get(key, 0) - other.get(key, 0)
         return result
 
-    def __ISUB__(self, other: Mapping[T, float]) -> None:
-        for key in self | other:
-            self[key] = self.get(key, 0) - other.get(key, 0)
+    def __isub__(self, other: Mapping[T, float]) -> Self:
+        for key, value in other.items():
+            self[key] = self.get(key, 0) - value
+        return self
 
     def __mul__(self, factor: Mapping[T, float] | float) -> Self:
         result = self.copy()
@@ -54,20 +56,23 @@ class Arithmetic_Dict(Generic[T], dict[T, float]):
                             " a real number")
         return result
 
-    def __IMUL__(self, factor: Mapping[T, float] | float) -> None:
+    def __imul__(self, factor: Mapping[T, float] | float) -> Self:
         if isinstance(factor, Mapping):
-            for key in self | factor:
-                self[key] = self.get(key, 0) * factor.get(key, 0)
-                if isnan(self.get(key, 0)):
-                    self[key] = 0
+            for key in self:
+                product = self[key] * factor.get(key, 0)
+                self[key] = product if not isnan(product) else 0
+            for key, value in factor.items():
+                if key not in self:
+                    product = 0 * value
+                    self[key] = product if not isnan(product) else 0
         elif isinstance(factor, Real):
             for key in self:
-                self[key] = self.get(key, 0) * factor
-                if isnan(self.get(key, 0)):
-                    self[key] = 0
+                product = self[key] * factor
+                self[key] = product if not isnan(product) else 0
         else:
             raise TypeError("multiplication factor must be a mapping object or"
                             " a real number")
+        return self
 
     def __truediv__(self, factor: Mapping[T, float] | float) -> Self:
         result = self.copy()
@@ -94,24 +99,22 @@ class Arithmetic_Dict(Generic[T], dict[T, float]):
                             " a real number")
         return result
 
-    def __IDIV__(self, factor: Mapping[T, float] | float) -> None:
+    def __itruediv__(self, factor: Mapping[T, float] | float) -> Self:
         if isinstance(factor, Mapping):
-            for key in self | factor:
-                try:
-                    self[key] = self.get(key, 0) / factor.get(key, 0)
-                except ZeroDivisionError:
-                    if self.get(key, 0) != 0:
-                        self[key] = inf * self.get(key, 0)
+            for key in self:
+                self[key] = Arithmetic_Dict._divide(
+                    self[key], factor.get(key, 0)
+                )
+            for key, value in factor.items():
+                if key not in self:
+                    self[key] = Arithmetic_Dict._divide(0, value)
         elif isinstance(factor, Real):
             for key in self:
-                try:
-                    self[key] = self.get(key, 0) / factor
-                except ZeroDivisionError:
-                    if self.get(key, 0) != 0:
-                        self[key] = inf * self.get(key, 0)
+                self[key] = Arithmetic_Dict._divide(self[key], factor)
         else:
             raise TypeError("division factor must be a mapping object or"
                             " a real number")
+        return self
 
     def __floordiv__(self, factor: Mapping[T, float] | float) -> Self:
         result = self.copy()
@@ -138,24 +141,22 @@ class Arithmetic_Dict(Generic[T], dict[T, float]):
                             " a real number")
         return result
 
-    def __IFLOORDIV__(self, factor: Mapping[T, float] | float) -> None:
+    def __ifloordiv__(self, factor: Mapping[T, float] | float) -> Self:
         if isinstance(factor, Mapping):
-            for key in self | factor:
-                try:
-                    self[key] = self.get(key, 0) // factor.get(key, 0)
-                except ZeroDivisionError:
-                    if self.get(key, 0) != 0:
-                        self[key] = inf * self.get(key, 0)
+            for key in self:
+                self[key] = Arithmetic_Dict._floor_divide(
+                    self[key], factor.get(key, 0)
+                )
+            for key, value in factor.items():
+                if key not in self:
+                    self[key] = Arithmetic_Dict._floor_divide(0, value)
         elif isinstance(factor, Real):
             for key in self:
-                try:
-                    self[key] = self.get(key, 0) // factor
-                except ZeroDivisionError:
-                    if self.get(key, 0) != 0:
-                        self[key] = inf * self.get(key, 0)
+                self[key] = Arithmetic_Dict._floor_divide(self[key], factor)
         else:
             raise TypeError("division factor must be a mapping object or"
                             " a real number")
+        return self
 
     def __lt__(self, other: Mapping[T, float] | float) -> bool:
         """
@@ -184,6 +185,20 @@ class Arithmetic_Dict(Generic[T], dict[T, float]):
                 return False
         return True
 
+    def add_multiplied(self, other: Mapping[T, float], factor: float
+                       ) -> Self:
+        """
+        Adds other multiplied by factor to the object in place, without
+        creating the temporary product. Equivalent to self += other * factor.
+        Returns the object itself.
+        """
+        for key, value in other.items():
+            product = value * factor
+            if isnan(product):
+                product = 0
+            self[key] = self.get(key, 0) + product
+        return self
+
     def copy(self) -> Self:
         """
         Returns a shallow copy of the object.
@@ -217,6 +232,29 @@ class Arithmetic_Dict(Generic[T], dict[T, float]):
             for element, value in self.items()
         })
 
+    @staticmethod
+    def _divide(dividend: float, divisor: float) -> float:
+        """
+        Divides the numbers the way division operators of the class do:
+        division by zero gives zero or an infinity of the dividend's sign.
+        """
+        try:
+            return dividend / divisor
+        except ZeroDivisionError:
+            return inf * dividend if dividend != 0 else 0
+
+    @staticmethod
+    def _floor_divide(dividend: float, divisor: float) -> float:
+        """
+        Floor divides the numbers the way floor division operators of the
+        class do: division by zero gives zero or an infinity of the dividend's
+        sign.
+        """
+        try:
+            return dividend // divisor
+        except ZeroDivisionError:
+            return inf * dividend if dividend != 0 else 0
+
     @staticmethod
     def _round(number: float, ndigits: int = 0) -> float | int:
         """
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import sys
+from array import array
+from hashlib import blake2b
+from typing import Iterable
+
+# Significant binary digits of the mantissa kept by the digest - about 9
+# decimal digits, so that floating-point noise doesn't change it
+DIGEST_BITS = 30
+# Binary digits of the mantissa of a double
+_MANTISSA_BITS = 52
+
+_NAN = float("nan")
+
+
+def quantize(values: Iterable[float], bits: int = DIGEST_BITS) -> array[int]:
+    """
+    Returns binary representations (as doubles) of the given values with
+    their mantissas truncated to the given number of binary digits.
+    Negative zero becomes zero and every NaN the same NaN, so that equal
+    quantized values have equal representations.
+    """
+    if not 0 <= bits <= _MANTISSA_BITS:
+        raise ValueError(f"bits must be between 0 and {_MANTISSA_BITS}")
+    doubles = array(
+        'd', [value + 0.0 if value == value else _NAN for value in values]
+    )
+    mask = ~((1 << (_MANTISSA_BITS - bits)) - 1) & 0xFFFF_FFFF_FFFF_FFFF
+    words = memoryview(doubles).cast('B').cast('Q')
+    return array('Q', [word & mask for word in words])
+
+
+def digest(values: Iterable[float], bits: int = DIGEST_BITS) -> str:
+    """
+    Returns a hex digest of the given values quantized to the given number
+    of significant binary digits. It doesn't depend on the platform or the
+    process.
+    """
+    quantized = quantize(values, bits)
+    if sys.byteorder == "big":
+        quantized.byteswap()
+    return blake2b(quantized.tobytes(), digest_size=16).hexdigest()
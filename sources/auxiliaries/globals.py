@@ -1,9 +1,13 @@
 import sys
-from typing import Protocol
+from typing import TYPE_CHECKING, Protocol
 
 from PySide6.QtWidgets import QMessageBox, QWidget
 from PySide6.QtCore import QTimer, QObject
 from ..gui.auxiliaries import crashing_slot
+from .trace import Trace
+
+if TYPE_CHECKING:
+    from .memory import Memory_Profile
 
 
 class WarningOutput(Protocol):
@@ -41,3 +45,13 @@ class GUIWarningOutput(QObject):
 
 warning_out: WarningOutput = CLIWarningOutput()
 debug = False
+# Answer to all confirmation prompts, None means the user is asked
+confirmation: bool | None = None
+# Debug trace - events are recorded only in debug mode
+trace = Trace()
+# Relative tolerance of detecting steady states and 12-month cycles, which
+# are then skipped instead of calculated - None turns the detection off
+cycle_tolerance: float | None = None
+# Memory profile of the phases of do_month (see memory.profiling) - None
+# turns the profiling off
+memory: "Memory_Profile | None" = None
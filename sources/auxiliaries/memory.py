@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import gc
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from enum import Enum, auto
+from typing import Any, Callable, Generator, NamedTuple
+
+from . import globals
+
+
+class Memory_Phase(Enum):
+    preparation = auto()
+    happiness = auto()
+    growth = auto()
+    production = auto()
+    consumption = auto()
+    demotions = auto()
+    starvation = auto()
+    taxes = auto()
+    promotions = auto()
+    trade = auto()
+    advance = auto()
+    report = auto()
+
+
+class Phase_Memory(NamedTuple):
+    """
+    Memory allocated by a phase of do_month over the profiled months - net
+    numbers of memory blocks and bytes (allocated minus freed) and the
+    largest number of bytes allocated at once above the phase's start.
+    """
+    phase: Memory_Phase
+    months: int
+    blocks: int
+    size: int
+    peak: int
+
+
+class Object_Size(NamedTuple):
+    """
+    Numbers of memory blocks and bytes.
+    """
+    blocks: int
+    size: int
+
+
+class Memory_Profile:
+    """
+    Memory allocated by every phase of do_month, measured with tracemalloc
+    while globals.memory is set to the profile (see profiling). Phases are
+    measured between calls to start and mark, so only cheap counters are
+    read - no tracemalloc snapshots are taken.
+    """
+    def __init__(self) -> None:
+        self.months: int = 0
+        self.blocks: dict[Memory_Phase, int] = dict.fromkeys(Memory_Phase, 0)
+        self.sizes: dict[Memory_Phase, int] = dict.fromkeys(Memory_Phase, 0)
+        self.peaks: dict[Memory_Phase, int] = dict.fromkeys(Memory_Phase, 0)
+        self._blocks: int = 0
+        self._size: int = 0
+
+    def _reset(self) -> None:
+        self._blocks = sys.getallocatedblocks()
+        self._size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def start(self) -> None:
+        """
+        Starts measuring a month.
+        """
+        self.months += 1
+        self._reset()
+
+    def mark(self, phase: Memory_Phase) -> None:
+        """
+        Ends measuring the given phase and starts measuring the next one.
+        """
+        blocks = sys.getallocatedblocks()
+        size, peak = tracemalloc.get_traced_memory()
+        self.blocks[phase] += blocks - self._blocks
+        self.sizes[phase] += size - self._size
+        self.peaks[phase] = max(self.peaks[phase], peak - self._size)
+        self._reset()
+
+    def report(self) -> list[Phase_Memory]:
+        """
+        Returns the memory allocated by the phases, in order of execution.
+        """
+        return [
+            Phase_Memory(phase, self.months, self.blocks[phase],
+                         self.sizes[phase], self.peaks[phase])
+            for phase in Memory_Phase
+        ]
+
+
+@contextmanager
+def tracing() -> Generator[None, None, None]:
+    """
+    Traces memory allocations with tracemalloc inside the with block, unless
+    they are already traced.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+@contextmanager
+def profiling() -> Generator[Memory_Profile, None, None]:
+    """
+    Profiles memory allocated by the phases of every do_month called inside
+    the with block.
+    """
+    old_memory = globals.memory
+    profile = Memory_Profile()
+    with tracing():
+        globals.memory = profile
+        try:
+            yield profile
+        finally:
+            globals.memory = old_memory
+
+
+def retained_size(factory: Callable[[], Any]) -> Object_Size:
+    """
+    Returns the memory kept alive by the object created by factory (e.g. a
+    copy of an existing object), not counting garbage made while creating
+    it.
+    """
+    with tracing():
+        gc.collect()
+        blocks = sys.getallocatedblocks()
+        size = tracemalloc.get_traced_memory()[0]
+        created = factory()
+        gc.collect()
+        result = Object_Size(sys.getallocatedblocks() - blocks,
+                             tracemalloc.get_traced_memory()[0] - size)
+        del created
+    return result
+
+
+def peak_size(function: Callable[[], Any]) -> int:
+    """
+    Returns the largest number of bytes allocated at once by the call of the
+    function (counting its result).
+    """
+    with tracing():
+        gc.collect()
+        tracemalloc.reset_peak()
+        size = tracemalloc.get_traced_memory()[0]
+        result = function()
+        peak = tracemalloc.get_traced_memory()[1] - size
+        del result
+    return peak
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from math import floor, sqrt
+from typing import Iterable
+
+
+class P2_Quantile:
+    """
+    Estimates a quantile of a stream of values without storing them, using
+    the P-square algorithm (Jain and Chlamtac, 1985). Five markers are kept:
+    the minimum, the maximum, the estimated quantile and two markers halfway
+    between them, moved with piecewise-parabolic interpolation.
+    Until five values are seen the quantile is exact.
+    """
+    def __init__(self, part: float) -> None:
+        if not 0 <= part <= 1:
+            raise ValueError("quantile must be between 0 and 1")
+        self.part = part
+        self.heights: list[float] = []
+        self.positions: list[float] = [0, 1, 2, 3, 4]
+        self.desired: list[float] = [
+            0, 2 * part, 4 * part, 2 + 2 * part, 4
+        ]
+        self.increments: list[float] = [0, part / 2, part, (1 + part) / 2, 1]
+
+    def add(self, value: float) -> None:
+        heights = self.heights
+        if len(heights) < 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+
+        positions = self.positions
+        for index in range(cell + 1, 5):
+            positions[index] += 1
+        for index in range(5):
+            self.desired[index] += self.increments[index]
+
+        for index in range(1, 4):
+            difference = self.desired[index] - positions[index]
+            if (difference >= 1 and
+                    positions[index + 1] - positions[index] > 1) or \
+                    (difference <= -1 and
+                     positions[index - 1] - positions[index] < -1):
+                step = 1 if difference > 0 else -1
+                height = self._parabolic(index, step)
+                if not heights[index - 1] < height < heights[index + 1]:
+                    height = heights[index] + step * (
+                        heights[index + step] - heights[index]
+                    ) / (positions[index + step] - positions[index])
+                heights[index] = height
+                positions[index] += step
+
+    def _parabolic(self, index: int, step: int) -> float:
+        heights = self.heights
+        positions = self.positions
+        return heights[index] + step / (
+            positions[index + 1] - positions[index - 1]
+        ) * (
+            (positions[index] - positions[index - 1] + step)
+            * (heights[index + 1] - heights[index])
+            / (positions[index + 1] - positions[index])
+            + (positions[index + 1] - positions[index] - step)
+            * (heights[index] - heights[index - 1])
+            / (positions[index] - positions[index - 1])
+        )
+
+    @property
+    def value(self) -> float:
+        """
+        Returns the current estimate of the quantile (nan if no values were
+        added).
+        """
+        if not self.heights:
+            return float("nan")
+        if len(self.heights) < 5 or self.positions[4] < 5:
+            # Exact quantile of the stored values (linear interpolation)
+            place = self.part * (len(self.heights) - 1)
+            lower = floor(place)
+            upper = min(lower + 1, len(self.heights) - 1)
+            return self.heights[lower] + (place - lower) * \
+                (self.heights[upper] - self.heights[lower])
+        return self.heights[2]
+
+
+class Online_Stats:
+    """
+    Count, mean, variance (Welford's algorithm), minimum, maximum and the
+    given quantiles of a stream of values, kept without storing the values.
+    """
+    def __init__(self, quantiles: Iterable[float] = (0.05, 0.5, 0.95)
+                 ) -> None:
+        self.count: int = 0
+        self.mean: float = 0
+        self._squares: float = 0
+        self.min: float = float("inf")
+        self.max: float = float("-inf")
+        self.quantiles: dict[float, P2_Quantile] = {
+            part: P2_Quantile(part) for part in quantiles
+        }
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._squares += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        for quantile in self.quantiles.values():
+            quantile.add(value)
+
+    @property
+    def variance(self) -> float:
+        """
+        Returns the sample variance (0 for fewer than two values).
+        """
+        if self.count < 2:
+            return 0
+        return self._squares / (self.count - 1)
+
+    @property
+    def std(self) -> float:
+        return sqrt(self.variance)
+
+    def quantile(self, part: float) -> float:
+        return self.quantiles[part].value
+
+    def to_dict(self) -> dict[str, float]:
+        """
+        Returns all the statistics as a dict.
+        """
+        data: dict[str, float] = {
+            "count": self.count,
+            "mean": self.mean,
+            "variance": self.variance,
+            "min": self.min,
+            "max": self.max
+        }
+        for part, quantile in self.quantiles.items():
+            data[f"q{part:g}"] = quantile.value
+        return data
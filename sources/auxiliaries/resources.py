@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from math import isnan
 from numbers import Real
 from typing import Any, Mapping
 
@@ -112,7 +113,13 @@ class Resources(Arithmetic_Dict[Resource]):
         """
         Returns the value of these Resources under the given prices.
         """
-        return sum((self * prices).values())
+        products = (
+            amount * prices.get(resource, 0)
+            for resource, amount in self.items()
+        )
+        return sum(
+            product if not isnan(product) else 0 for product in products
+        )
 
     def to_raw_dict(self) -> dict[str, float]:
         """
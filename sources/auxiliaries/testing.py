@@ -16,6 +16,20 @@ def dict_eq(dict1: dict[Any, float], dict2: dict[Any, float]) -> bool:
     return True
 
 
+def attributes(obj: Any) -> dict[str, Any]:
+    """
+    Returns the set attributes of the given object, including ones stored in
+    __slots__ (which vars doesn't see).
+    """
+    result = dict(getattr(obj, "__dict__", {}))
+    for class_ in type(obj).__mro__:
+        slots = class_.__dict__.get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if hasattr(obj, name):
+                result[name] = getattr(obj, name)
+    return result
+
+
 class replace:
     def __init__(self, class_or_object: Any, attr_name: str, new_attr: Any
                  ) -> None:
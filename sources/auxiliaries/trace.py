@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from collections import deque
+from enum import Enum, auto
+from typing import TYPE_CHECKING, NamedTuple
+
+from .enums import Class_Name, Month
+
+if TYPE_CHECKING:
+    from .globals import WarningOutput
+
+
+class Trace_Phase(Enum):
+    month = auto()
+    growth = auto()
+    starvation = auto()
+    demotion = auto()
+    promotion = auto()
+    double_promotion = auto()
+
+
+class Trace_Event(NamedTuple):
+    """
+    One event of the debug trace - quantity of people of class_name affected
+    by phase. Targets are the classes people were moved to (if any), date is
+    only given for month events.
+    """
+    phase: Trace_Phase
+    class_name: Class_Name | None = None
+    quantity: float = 0
+    targets: tuple[Class_Name, ...] = ()
+    date: tuple[Month, int] | None = None
+
+    def format(self) -> str:
+        """
+        Returns a description of the event.
+        """
+        name = self.class_name.name if self.class_name is not None else ""
+        targets = " and ".join(target.name for target in self.targets)
+        match self.phase:
+            case Trace_Phase.month:
+                month, year = self.date  # type: ignore
+                line = f"Ending month {month.name} {year}"
+                if self.quantity > 0:
+                    line += f" in {self.quantity} provinces"
+                return line
+            case Trace_Phase.growth:
+                return f"Grown {self.quantity} {name}"
+            case Trace_Phase.starvation:
+                return f"Starved {self.quantity} {name}"
+            case Trace_Phase.demotion:
+                return f"Demoted {self.quantity} {name}"
+            case Trace_Phase.promotion:
+                return f"Promoted {self.quantity} {name} to {targets}"
+            case Trace_Phase.double_promotion:
+                return f"Double promoted {self.quantity} {name} to {targets}"
+
+
+class Trace:
+    """
+    Bounded buffer of debug trace events. When full, the oldest events are
+    dropped. Events are only formatted when they are viewed, so recording
+    them is cheap. Callers should only record events in debug mode.
+    """
+    def __init__(self, capacity: int = 10000) -> None:
+        if capacity < 1:
+            raise ValueError("trace capacity must be positive")
+        self.events: deque[Trace_Event] = deque(maxlen=capacity)
+        self.recorded: int = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.events.maxlen  # type: ignore
+
+    @property
+    def dropped(self) -> int:
+        """
+        Returns the number of events dropped to make space for newer ones.
+        """
+        return self.recorded - len(self.events)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def record(self, event: Trace_Event) -> None:
+        self.events.append(event)
+        self.recorded += 1
+
+    def clear(self) -> None:
+        self.events.clear()
+        self.recorded = 0
+
+    def format(self, last: int | None = None) -> list[str]:
+        """
+        Returns descriptions of the given number of the newest events (all of
+        them if last is None), from the oldest.
+        """
+        if last is None or last >= len(self.events):
+            events = list(self.events)
+        elif last <= 0:
+            events = []
+        else:
+            events = list(self.events)[-last:]
+        return [event.format() for event in events]
+
+    def dump(self, out: WarningOutput, last: int | None = None) -> None:
+        """
+        Writes descriptions of the newest events to out, one per write.
+        """
+        for line in self.format(last):
+            out.write(line)
@@ -1,4 +1,9 @@
+import sys
 import traceback
+from contextlib import redirect_stdout
+from io import StringIO
+from time import perf_counter
+from typing import Iterable, TextIO
 
 from ..abstract_interface.interface import (AlreadyFoughtError,
                                             EmptyClassError, Interface,
@@ -12,7 +17,18 @@ from ..abstract_interface.interface import (AlreadyFoughtError,
 from ..auxiliaries import globals
 from ..state.state_data_base_and_do_month import (EveryoneDeadError,
                                                   RebellionError)
-from .cli_commands import COMMANDS, ShutDownCommand, fill_command
+from .cli_commands import COMMANDS, ShutDownCommand, find_commands
+
+# Exit statuses of run_script
+SCRIPT_SUCCESS = 0
+SCRIPT_COMMAND_ERROR = 1
+SCRIPT_LOAD_ERROR = 2
+SCRIPT_GAME_OVER = 3
+SCRIPT_UNEXPECTED_ERROR = 4
+SCRIPT_INTERRUPTED = 5
+
+# Size (in characters) of script output buffered before it is written out
+SCRIPT_BUFFER_SIZE = 1 << 16
 
 
 def command_line_interface(dirname_to_load: str) -> None:
@@ -46,9 +62,13 @@ def command_line_interface(dirname_to_load: str) -> None:
         print("Shutting down.")
 
 
-def execute(command: str, interface: Interface):
+def execute(command: str, interface: Interface) -> bool:
+    """
+    Executes the given command line. Returns whether the command was
+    executed without errors.
+    """
     answer = command.split(' ')
-    given_cmd_options = fill_command(answer[0], COMMANDS.keys())
+    given_cmd_options = find_commands(answer[0])
     if len(given_cmd_options) == 0:
         print("Invalid command. Enter help for a list of"
               " commands.")
@@ -63,6 +83,7 @@ def execute(command: str, interface: Interface):
         if command in COMMANDS:
             try:
                 COMMANDS[command](answer, interface)
+                return True
             except NotEnoughGovtResources:
                 print("The government does not have enough resources for this"
                       " operation.")
@@ -82,14 +103,82 @@ def execute(command: str, interface: Interface):
             except InvalidArgumentError as e:
                 print(f"Invalid syntax: {e}. See help for proper usage of"
                       f" {command} command")
-            except EveryoneDeadError:
+            except EveryoneDeadError as e:
                 print("GAME OVER")
                 print("There is not a living person left in your country.")
-                raise ShutDownCommand
+                raise ShutDownCommand from e
             except RebellionError as e:
                 print("GAME OVER")
                 print(f"{e.class_name.title()} have rebelled.")
-                raise ShutDownCommand
+                raise ShutDownCommand from e
         else:
             print("Invalid command. Enter help for a list of"
                   " commands.")
+    return False
+
+
+def run_script(dirname_to_load: str, lines: Iterable[str],
+               output: TextIO | None = None, seed: int | None = None) -> int:
+    """
+    Executes the given command lines without prompting for them. Empty lines
+    and lines beginning with # are skipped. Output of the commands is written
+    to output, or buffered and written to standard output in big chunks if
+    output is None. Confirmation prompts are answered with
+    globals.confirmation (abort if it is not set). Prints timing to standard
+    error at the end. Seed is the seed of the game's random numbers.
+    Returns the exit status - one of SCRIPT_* constants.
+    """
+    out = output if output is not None else sys.stdout
+    buffer = StringIO()
+    status = SCRIPT_SUCCESS
+    executed = 0
+    old_confirmation = globals.confirmation
+    if globals.confirmation is None:
+        globals.confirmation = False
+    start = perf_counter()
+    try:
+        with redirect_stdout(buffer):
+            interface = Interface(seed=seed)
+            try:
+                interface.load_data(dirname_to_load)
+            except (SaveAccessError, MalformedSaveError):
+                print(f"Failed to load the save saves/{dirname_to_load}.")
+                status = SCRIPT_LOAD_ERROR
+                return status
+
+            for line in lines:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                executed += 1
+                try:
+                    if not execute(line, interface):
+                        status = SCRIPT_COMMAND_ERROR
+                except ShutDownCommand as e:
+                    if isinstance(e.__cause__,
+                                  (EveryoneDeadError, RebellionError)):
+                        status = SCRIPT_GAME_OVER
+                    break
+                if buffer.tell() > SCRIPT_BUFFER_SIZE:
+                    out.write(buffer.getvalue())
+                    buffer.seek(0)
+                    buffer.truncate()
+    except (KeyboardInterrupt, EOFError):
+        buffer.write("The script has been interrupted.\n")
+        status = SCRIPT_INTERRUPTED
+    except BaseException as e:
+        buffer.write(f"An unexpected exception of type {e.__class__.__name__}"
+                     " has occurred and the script will be terminated.\n")
+        if globals.debug:
+            buffer.write(traceback.format_exc())
+        status = SCRIPT_UNEXPECTED_ERROR
+    finally:
+        globals.confirmation = old_confirmation
+        out.write(buffer.getvalue())
+        out.flush()
+        elapsed = perf_counter() - start
+        per_command = 1000 * elapsed / executed if executed else 0
+        print(f"Executed {executed} commands in {elapsed:.3f} s "
+              f"({per_command:.3f} ms per command), exit status {status}",
+              file=sys.stderr)
+    return status
@@ -4,14 +4,29 @@
 
 
 import re
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum, auto
 import os
 import os.path
 import shutil
 from typing import Any, Callable, TypeVar
 
-from ..abstract_interface.interface import (Interface, InvalidArgumentError,
+from ..abstract_interface.checkpoints import Divergence, verify_save
+from ..abstract_interface.comparison import (Comparison, compare_histories,
+                                             load_history)
+from ..abstract_interface.interface import (UNDO_LIMIT, Interface,
+                                            InvalidArgumentError,
+                                            NothingToRedoError,
+                                            NothingToUndoError,
                                             SaveAccessError, check_arg)
+from ..abstract_interface.memory_usage import (MEMORY_MONTHS,
+                                               History_Memory, Memory_Report,
+                                               history_memory, profile_months)
+from ..abstract_interface.planner import (PLANNER_HORIZON, Decision,
+                                          govern as govern_months)
+from ..abstract_interface.save_catalog import Save_Catalog
+from ..abstract_interface.sensitivity import (SENSITIVITY_MONTHS,
+                                              Sensitivity_Analysis, analyse)
 from ..auxiliaries.enums import (CLASS_NAME_STR, RESOURCE_STR, Class_Name,
                                  Month, Resource)
 from ..auxiliaries import globals
@@ -28,6 +43,22 @@ class ShutDownCommand(Exception):
     pass
 
 
+def confirm(prompt: str, retry_prompt: str,
+            invalid_message: str = "Invalid choice") -> bool:
+    """
+    Asks the user to enter 1 (confirm) or 0 (abort), repeating the question
+    until the answer is valid. If globals.confirmation is set, the user is not
+    asked and it is the answer.
+    """
+    if globals.confirmation is not None:
+        return globals.confirmation
+    ans = input(prompt).strip()
+    while ans not in {'0', '1'}:
+        print(invalid_message)
+        ans = input(retry_prompt).strip()
+    return ans == '1'
+
+
 def help_default() -> None:
     """
     Prints general help about commands.
@@ -37,7 +68,15 @@ def help_default() -> None:
     print("exit - exit the program")
     print("save <DIR> - save the game state")
     print("delete <DIR> - delete the game save")
+    print("list - list the game saves")
+    print("verify <DIR> - check that the game save replays correctly")
+    print("compare <DIR> [<DIR2>] - compare histories of two game saves")
+    print("sensitivity [<MONTHS>] - find the modifiers which matter most")
+    print("govern [<MONTHS>] - let the computer govern the country")
+    print("memory [<MONTHS>] - measure memory used by the simulation")
     print("next [<AMOUNT>] - next month")
+    print("undo - revert the last command")
+    print("redo - execute the last reverted command again")
     print("history <STAT> [<CLASS>] [<MONTHS>] - view the country's history")
     print("state <STAT> - view the current state of the country")
     print("transfer <TARGET> <RESOURCE> <AMOUNT> - transfers resources between"
@@ -50,6 +89,7 @@ def help_default() -> None:
     print("promote <CLASS> <VALUE> - force promotion to a social class")
     print("recruit <CLASS> <VALUE> - recruit soldiers from a class")
     print("fight <TARGET> - send soldiers to battle")
+    print("debug [<AMOUNT>] - view the debug trace")
 
 
 def help_command(command: str) -> None:
@@ -73,10 +113,68 @@ def help_command(command: str) -> None:
         print("Deletes the game state from saves/<DIR> directory (deletes "
               "entire directory - anything manually saved there will be "
               "deleted as well).")
+    elif command == "list":
+        print("list")
+        print("Lists all saves with the date, population and number of "
+              "history lines of each. Arguments are ignored.")
+    elif command == "verify":
+        print("verify <DIR>")
+        print("Replays the history of the game save from saves/<DIR> and "
+              "compares it with the checkpoints kept in the save. Parts of "
+              "the history between consecutive snapshots of the state are "
+              "replayed in parallel. Reports the first history line which "
+              "doesn't match.")
+    elif command == "compare":
+        print("compare <DIR> [<DIR2>]")
+        print("Compares the history of the game save from saves/<DIR> with "
+              "the history of saves/<DIR2> (or of the current game, if "
+              "<DIR2> is omitted) month by month. Shows the first month in "
+              "which they differ and the largest differences between "
+              "them.")
+    elif command == "sensitivity":
+        print("sensitivity [<MONTHS>]")
+        print("Simulates the next <MONTHS> months (default "
+              f"{SENSITIVITY_MONTHS}) of the country with each of its "
+              "modifiers (e.g. worker_land_usage or tax rates) slightly "
+              "increased and decreased, in parallel. Shows elasticities of "
+              "the outcomes (population, government wealth, happiness and "
+              "months before the game ends) with respect to each modifier, "
+              "the largest first. The game is not changed.")
+    elif command == "govern":
+        print("govern [<MONTHS>]")
+        print("Lets the computer govern the country for <MONTHS> months "
+              "(only one if <MONTHS> is omitted). At the beginning of every "
+              "month it tries every simple action (transfers, securing food,"
+              " promotions, recruitment, tax and minimum wage changes and "
+              f"fights) on copies of the country for {PLANNER_HORIZON} "
+              "months, in parallel, and takes the one with the best outcome "
+              "(survival, population, happiness and government wealth), then"
+              " ends the month. The actions are shown and added to the "
+              "history.")
+    elif command == "memory":
+        print("memory [<MONTHS>]")
+        print("Simulates the next <MONTHS> months (default "
+              f"{MEMORY_MONTHS}) of a copy of the country, measuring memory "
+              "allocated by every phase of a month (net memory blocks and "
+              "bytes and the largest peak). Also shows memory kept by the "
+              "country and by its history, and the peak of remaking the "
+              "whole history. Measuring makes the program slower; the game "
+              "is not changed.")
     elif command == "next":
         print("next [<AMOUNT>]")
         print("Ends the month and advances to the next <AMOUNT> times - only"
               " once if <AMOUNT> is omitted.")
+    elif command == "undo":
+        print("undo")
+        print("Reverts the last command which changed the game (e.g. next, "
+              "transfer or promote), also in the history. Up to "
+              f"{UNDO_LIMIT} commands can be reverted one after another. "
+              "Arguments are ignored.")
+    elif command == "redo":
+        print("redo")
+        print("Executes again the last command reverted with undo. Commands "
+              "can be redone until a new command changes the game. Arguments"
+              " are ignored.")
     elif command == "history":
         print("history <STAT> [<CLASS>] [<MONTHS>]")
         print("Shows the history (past statistics) of the country.")
@@ -236,6 +334,12 @@ def help_command(command: str) -> None:
         print("    crime - attack brigands in the country")
         print("    plunder - attack neighboring lands for resources")
         print("    conquest - attack neighboring countries for land")
+    elif command == "debug":
+        print("debug [<AMOUNT>]")
+        print("Shows the newest <AMOUNT> events (growth, starvation, "
+              "promotions, demotions) of the debug trace - all of the kept "
+              "events if <AMOUNT> is omitted. Events are only recorded in "
+              "debug mode.")
     else:
         raise InternalCommandError
 
@@ -247,7 +351,7 @@ def help_(args: list[str], interface: Any) -> None:
     Args should be: ["help", command]
     """
     if len(args) >= 2:
-        help_cmds = fill_command(args[1], COMMANDS)
+        help_cmds = find_commands(args[1])
         if "laws" in help_cmds:
             if len(args) < 3:
                 args.append("")
@@ -295,6 +399,14 @@ def get_month_string(month_int: int) -> str:
     return f"{month: >9} {year: >3}"
 
 
+def month_name(month_int: int) -> str:
+    """
+    Returns the name of the given month with its year, e.g. "March 2".
+    month_int is the number of the month counting January 0 as month 0.
+    """
+    return f"{Month(month_int % 12).name} {month_int // 12}"
+
+
 def get_modifiers_from_dict(data: dict[str, bool]) -> str:
     """
     Extracts a 6-character long string representing growth modifiers from the
@@ -520,12 +632,8 @@ def save(args: list[str], interface: Interface) -> None:
     try:
         os.mkdir(f"saves/{args[1]}")
     except FileExistsError:
-        ans = input("This save already exists. Enter 1 to overwrite, "
-                    "0 to abort: ").strip()
-        while ans not in {'0', '1'}:
-            print("Invalid choice")
-            ans = input("Enter 1 to overwrite, 0 to abort: ").strip()
-        if ans == '0':
+        if not confirm("This save already exists. Enter 1 to overwrite, "
+                       "0 to abort: ", "Enter 1 to overwrite, 0 to abort: "):
             return
 
     try:
@@ -552,12 +660,44 @@ def next_command(args: list[str], interface: Interface) -> None:
     else:
         amount = 1
 
-    for _ in range(amount):
-        interface.next_month()
+    skip = interface.next_months(amount)
+    if skip is not None:
+        cycle = "steady state" if skip.period == 1 else \
+            f"{skip.period}-month cycle"
+        print(f"\nThe country reached a {cycle} - {skip.months} months "
+              "were skipped instead of calculated.")
     print(f"\nNew month: {interface.state.month.name} "
           f"{interface.state.year}\n")
 
 
+def undo(args: list[str], interface: Interface) -> None:
+    """
+    Reverts the last command.
+    Args should be: ["undo"]
+    """
+    try:
+        interface.undo()
+    except NothingToUndoError:
+        print("There is nothing to undo.")
+        return
+    print(f"\nReverted the last command. Current month: "
+          f"{interface.state.month.name} {interface.state.year}\n")
+
+
+def redo(args: list[str], interface: Interface) -> None:
+    """
+    Executes again the last reverted command.
+    Args should be: ["redo"]
+    """
+    try:
+        interface.redo()
+    except NothingToRedoError:
+        print("There is nothing to redo.")
+        return
+    print(f"\nExecuted the reverted command again. Current month: "
+          f"{interface.state.month.name} {interface.state.year}\n")
+
+
 def get_modifiers_from_class(social_class: Class) -> str:
     """
     Extracts a growth modifiers string from the given class.
@@ -685,7 +825,9 @@ def state(args: list[str], interface: Interface) -> None:
         for class_name in Class_Name:
             line += f"  {round_format(taxes[class_name], 2, 6): ^7}"
         print(line)
-        govt_wage = round(interface.state.government.old_wage, 2)
+        government = interface.state.government
+        govt_wage = round(government.wage if government.old_wage is None
+                          else government.old_wage, 2)
         autoreg = interface.state.government.wage_autoregulation
         line = f"Current wage for government employees: {govt_wage}"
         line += f" (autoregulation {'on' if autoreg else 'off'})"
@@ -705,8 +847,11 @@ def state(args: list[str], interface: Interface) -> None:
             for class_name, social_class
             in interface.state.classes.items()
         }
-        wages["government"] = \
-            round(interface.state.government.old_wage, 2)
+        government = interface.state.government
+        wages["government"] = round(
+            government.wage if government.old_wage is None
+            else government.old_wage, 2
+        )
         print("Current employment information:")
 
         line = " " * 10
@@ -764,31 +909,285 @@ def delete_save(args: list[str], interface: Any) -> None:
         print("This save does not exist.")
         return
 
-    ans = input("Are you sure you want to delete this save? Enter 1 to "
-                "delete, 0 to abort: ").strip()
-    while ans not in {'0', '1'}:
-        print("Invalid choice")
-        ans = input("Enter 1 to delete, 0 to abort: ").strip()
-    if ans == '0':
+    if not confirm("Are you sure you want to delete this save? Enter 1 to "
+                   "delete, 0 to abort: ", "Enter 1 to delete, 0 to abort: "):
         return
 
     shutil.rmtree(f"saves/{args[1]}")
+    Save_Catalog().remove(args[1])
     print(f"Removed the save saves/{args[1]}")
 
 
+def list_saves(args: list[str], interface: Any) -> None:
+    """
+    Lists all saves with data about their current states.
+    Args should be: ["list"]
+    """
+    saves = Save_Catalog().list_saves()
+    if not saves:
+        print("There are no saves.")
+        return
+    width = max(len(name) for name in saves)
+    print(f"{'Save': <{width}}  {'Date': <14}  Population  History")
+    for name, info in saves.items():
+        date = f"{info['month']} {info['year']}"
+        print(f"{name: <{width}}  {date: <14}  "
+              f"{round_format(info['population'], 0, 10): >10}  "
+              f"{info['history_length']: >7}")
+
+
+def describe_divergence(divergence: Divergence | None) -> str:
+    """
+    Returns a message about the result of verify_save.
+    """
+    if divergence is None:
+        return "The save is valid."
+    step = f", month {divergence.step}" \
+        if divergence.command.startswith("next ") else ""
+    return (f"The save diverges at history line {divergence.line + 1} "
+            f"({divergence.command}{step}), {divergence.month} "
+            f"{divergence.year}: {divergence.reason}.")
+
+
+def verify(args: list[str], interface: Any) -> None:
+    """
+    Verifies the given save by replaying its history in parallel segments.
+    Args should be: ["verify", save_name]
+    """
+    check_arg(len(args) == 2, "invalid number of arguments")
+    check_arg(
+        bool(re.search(r"^\w+$", args[1])),
+        "save name can only contain letters, digits and underscores"
+    )
+    if not os.path.isdir(f"saves/{args[1]}"):
+        print("This save does not exist.")
+        return
+    try:
+        with ProcessPoolExecutor() as executor:
+            divergence = verify_save(args[1], executor)
+    except (OSError, ValueError, KeyError):
+        print("Failed to read the save files.")
+        return
+    print(describe_divergence(divergence))
+
+
+def describe_comparison(comparison: Comparison) -> list[str]:
+    """
+    Returns lines of a message about the result of compare_histories.
+    """
+    if comparison.months == 0:
+        return ["The histories have no months in common."]
+    result = [f"Compared {comparison.months} months since "
+              f"{month_name(comparison.start)}."]
+    if comparison.first_months != comparison.second_months:
+        longer, shorter = "first", "second"
+        if comparison.first_months < comparison.second_months:
+            longer, shorter = shorter, longer
+        difference = abs(comparison.first_months - comparison.second_months)
+        result.append(f"The {longer} history has {difference} months more "
+                      f"than the {shorter} one.")
+    divergence = comparison.divergence
+    if divergence is None:
+        result.append("The histories don't differ.")
+        return result
+    result.append(f"The histories differ since "
+                  f"{month_name(divergence.month)}: "
+                  f"{divergence.metric} is "
+                  f"{round_format(divergence.first, 2, 9)} and "
+                  f"{round_format(divergence.second, 2, 9)}.")
+    result.append("Largest differences:")
+    for gap in comparison.gaps:
+        result.append(f"{gap.metric: <40} {get_month_string(gap.month)} "
+                      f"{round_format(gap.first, 2, 9): >9} "
+                      f"{round_format(gap.second, 2, 9): >9}")
+    return result
+
+
+def compare(args: list[str], interface: Interface) -> None:
+    """
+    Compares histories of two saves, or of a save and the current game.
+    Args should be: ["compare", save_name, second_save_name] (the second
+    name is optional)
+    """
+    check_arg(2 <= len(args) <= 3, "invalid number of arguments")
+    for name in args[1:]:
+        check_arg(
+            bool(re.search(r"^\w+$", name)),
+            "save name can only contain letters, digits and underscores"
+        )
+        if not os.path.isdir(f"saves/{name}"):
+            print(f"Save {name} does not exist.")
+            return
+    try:
+        first = load_history(args[1])
+        second = load_history(args[2]) if len(args) == 3 \
+            else interface.history
+        comparison = compare_histories(first, second)
+    except (OSError, ValueError, KeyError):
+        print("Failed to read the save files.")
+        return
+    for line in describe_comparison(comparison):
+        print(line)
+
+
+def describe_sensitivity(analysis: Sensitivity_Analysis,
+                         outcome: str = "population") -> list[str]:
+    """
+    Returns lines of a table of the elasticities found by analyse, ranked by
+    the given outcome.
+    """
+    outcomes = list(analysis.baseline)
+    widths = [max(len(name), 9) for name in outcomes]
+
+    def row(name: str, value: str, values: list[float]) -> str:
+        return f"{name: <28} {value: >9}" + "".join(
+            f" {round_format(number, 3, width): >{width}}"
+            for number, width in zip(values, widths)
+        )
+
+    result = [
+        f"Elasticities of the outcomes after {analysis.months} months, "
+        f"ranked by {outcome}:",
+        f"{'modifier': <28} {'value': >9}" + "".join(
+            f" {name: >{width}}" for name, width in zip(outcomes, widths)
+        ),
+        row("(outcomes)", "", [analysis.baseline[name] for name in outcomes])
+    ]
+    for sensitivity in analysis.ranked(outcome):
+        result.append(row(
+            sensitivity.modifier, round_format(sensitivity.value, 3, 9),
+            [sensitivity.elasticities[name] for name in outcomes]
+        ))
+    return result
+
+
+def sensitivity(args: list[str], interface: Interface) -> None:
+    """
+    Prints elasticities of the outcomes of the next months with respect to
+    the modifiers of the state.
+    Args should be: ["sensitivity", months] (months are optional)
+    """
+    check_arg(len(args) <= 2, "invalid number of arguments")
+    months = SENSITIVITY_MONTHS
+    if len(args) == 2:
+        check_arg(args[1].isdigit() and int(args[1]) > 0,
+                  "number of months must be a positive integer")
+        months = int(args[1])
+    with ProcessPoolExecutor() as executor:
+        analysis = analyse(interface.state, months, executor=executor)
+    for line in describe_sensitivity(analysis):
+        print(line)
+
+
+def describe_decision(decision: Decision) -> str:
+    """
+    Returns a line describing the action chosen by the planner.
+    """
+    action = "nothing" if decision.action is None else decision.action
+    return f"{action} (score {decision.score:.2f}, doing nothing " \
+        f"{decision.baseline:.2f}; " \
+        f"{decision.evaluated} of {decision.candidates} actions tried)"
+
+
+def govern(args: list[str], interface: Interface) -> None:
+    """
+    Lets the planner govern the country for the given number of months,
+    printing its actions.
+    Args should be: ["govern", months] (months are optional)
+    """
+    check_arg(len(args) <= 2, "invalid number of arguments")
+    months = 1
+    if len(args) == 2:
+        check_arg(args[1].isdigit() and int(args[1]) > 0,
+                  "number of months must be a positive integer")
+        months = int(args[1])
+    with ProcessPoolExecutor() as executor:
+        for _ in range(months):
+            date = f"{interface.state.month.name} {interface.state.year}"
+            (decision,) = govern_months(interface, 1, executor=executor)
+            print(f"{date}: {describe_decision(decision)}")
+    print(f"\nNew month: {interface.state.month.name} "
+          f"{interface.state.year}\n")
+
+
+def describe_memory(report: Memory_Report,
+                    history: History_Memory | None = None) -> list[str]:
+    """
+    Returns lines of a table of memory allocated by the phases of a month
+    (found by profile_months), followed by memory kept by the state and the
+    history (if given).
+    """
+    def kib(size: float) -> str:
+        return round_format(size / 1024, 1, 10)
+
+    months = max(report.months, 1)
+    result = [
+        f"Memory allocated by the phases of {report.months} months (net "
+        "blocks and KiB per month, largest peak KiB):",
+        f"{'phase': <12} {'blocks': >10} {'KiB': >10} {'peak KiB': >10}"
+    ]
+    for phase in report.phases:
+        result.append(
+            f"{phase.phase.name: <12} "
+            f"{round_format(phase.blocks / months, 1, 10): >10} "
+            f"{kib(phase.size / months): >10} {kib(phase.peak): >10}"
+        )
+    result.append(f"The state keeps {report.state.blocks} blocks, "
+                  f"{kib(report.state.size)} KiB.")
+    if history is not None:
+        result.append(
+            f"The history of {history.months} months keeps "
+            f"{history.retained.blocks} blocks, "
+            f"{kib(history.retained.size)} KiB; remaking it takes up to "
+            f"{kib(history.whole_peak)} KiB at once "
+            f"({kib(history.iterate_peak)} KiB month by month)."
+        )
+    return result
+
+
+def memory(args: list[str], interface: Interface) -> None:
+    """
+    Prints memory allocated by the phases of the next months and kept by
+    the state and its history.
+    Args should be: ["memory", months] (months are optional)
+    """
+    check_arg(len(args) <= 2, "invalid number of arguments")
+    months = MEMORY_MONTHS
+    if len(args) == 2:
+        check_arg(args[1].isdigit() and int(args[1]) > 0,
+                  "number of months must be a positive integer")
+        months = int(args[1])
+    report = profile_months(interface.state, months)
+    for line in describe_memory(report, history_memory(interface.history)):
+        print(line)
+
+
+def debug_trace(args: list[str], interface: Any) -> None:
+    """
+    Prints the newest events of the debug trace.
+    Args should be: ["debug", amount] (amount is optional)
+    """
+    check_arg(len(args) <= 2, "invalid number of arguments")
+    last: int | None = None
+    if len(args) == 2:
+        check_arg(args[1].isdigit(), "amount must be a nonnegative integer")
+        last = int(args[1])
+    if not globals.debug:
+        print("Debug mode is off - no events are recorded.")
+        return
+    if globals.trace.dropped > 0:
+        print(f"{globals.trace.dropped} older events were dropped.")
+    globals.trace.dump(globals.CLIWarningOutput(), last)
+
+
 def exit_game(args: Any, interface: Any) -> None:
     """
     Exits the game after asking the user for confirmation.
     """
     print("Are you sure you want to quit? Unsaved game state will be lost.")
-    while True:
-        ans = input("Enter 1 to confirm, 0 to abort: ").strip()
-        if ans == "1":
-            raise ShutDownCommand
-        elif ans == "0":
-            break
-        else:
-            print("Invalid choice.")
+    if confirm("Enter 1 to confirm, 0 to abort: ",
+               "Enter 1 to confirm, 0 to abort: ", "Invalid choice."):
+        raise ShutDownCommand
 
 
 COMMANDS: dict[str, Callable[[list[str], Interface], None]] = {
@@ -796,8 +1195,16 @@ COMMANDS: dict[str, Callable[[list[str], Interface], None]] = {
     "exit": exit_game,
     "history": history,
     "next": next_command,
+    "undo": undo,
+    "redo": redo,
     "state": state,
     "delete": delete_save,
+    "list": list_saves,
+    "verify": verify,
+    "compare": compare,
+    "sensitivity": sensitivity,
+    "govern": govern,
+    "memory": memory,
     "transfer": transfer,
     "secure": secure,
     "optimal": optimal,
@@ -805,5 +1212,25 @@ COMMANDS: dict[str, Callable[[list[str], Interface], None]] = {
     "promote": promote,
     "recruit": recruit,
     "fight": fight,
+    "debug": debug_trace,
     "help": help_
 }
+# Commands of the game itself - abbreviations are matched against them
+# first, so that commands added later don't make abbreviations which used
+# to be unique ambiguous
+CORE_COMMANDS = (
+    "save", "exit", "history", "next", "state", "delete", "transfer",
+    "secure", "optimal", "laws", "promote", "recruit", "fight", "help"
+)
+
+
+def find_commands(string: str) -> set[str]:
+    """
+    Finds the commands the given string stands for: the command with this
+    name, if there is one, else commands of the game beginning with the
+    string (see CORE_COMMANDS), else all commands beginning with it.
+    """
+    if string in COMMANDS:
+        return {string}
+    return fill_command(string, CORE_COMMANDS) or \
+        fill_command(string, COMMANDS)
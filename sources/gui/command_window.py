@@ -3,22 +3,26 @@ from __future__ import annotations
 from math import floor
 from typing import cast
 
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (QDialog, QHBoxLayout, QLabel, QMessageBox,
-                               QPushButton, QVBoxLayout, QWidget)
+                               QPushButton, QSlider, QVBoxLayout, QWidget)
 
 from ..abstract_interface.interface import (Interface, MalformedSaveError,
                                             NoSoldiersError, SaveAccessError)
+from ..abstract_interface.time_travel import Time_Machine
 from ..auxiliaries import globals
-from ..auxiliaries.constants import (CLASS_TO_SOLDIER, INBUILT_RESOURCES,
-                                     RECRUITABLE_PART, RECRUITMENT_COST)
+from ..auxiliaries.constants import (CLASS_TO_SOLDIER, RECRUITABLE_PART,
+                                     RECRUITMENT_COST)
 from ..auxiliaries.enums import Class_Name
 from ..cli.cli_commands import ShutDownCommand
 from ..gui.number_select_dialog import (Number_Select_Dialog,
                                         NumberSelectRejected)
 from ..gui.resources_display import Resources_Display
+from ..state.state_data import State_Data
 from ..state.state_data_base_and_do_month import (EveryoneDeadError,
                                                   RebellionError)
 from .auxiliaries import crashing_slot
+from .compare_dialog import Compare_Dialog
 from .execute_dialog import Execute_Dialog
 from .optimal_dialog import Optimal_Dialog
 from .recruit_dialog import RecruitDialog
@@ -29,6 +33,7 @@ from .scenes.govt_scene import Scene_Govt
 from .scenes.military_scene import Scene_Military
 from .scenes.history_scene import Scene_History
 from .secure_dialog import Secure_Dialog
+from .trace_dialog import Trace_Dialog
 from .scenes.laws_scene import Scene_Laws
 from .transfer_dialog import Transfer_Dialog
 
@@ -74,6 +79,16 @@ class Command_Window(QDialog):
             self.next_month)
         self.l0_layout.addWidget(self.l0_next_button)
 
+        self.l0_undo_button = QPushButton("Undo")
+        self.l0_undo_button.clicked[None].connect(  # type: ignore
+            self.undo)
+        self.l0_layout.addWidget(self.l0_undo_button)
+
+        self.l0_redo_button = QPushButton("Redo")
+        self.l0_redo_button.clicked[None].connect(  # type: ignore
+            self.redo)
+        self.l0_layout.addWidget(self.l0_redo_button)
+
         self.l0_save_button = QPushButton("Save game")
         self.l0_save_button.clicked[None].connect(  # type: ignore
             self.save_game)
@@ -84,6 +99,17 @@ class Command_Window(QDialog):
             self.delete_save)
         self.l0_layout.addWidget(self.l0_del_button)
 
+        self.l0_compare_button = QPushButton("Compare")
+        self.l0_compare_button.clicked[None].connect(  # type: ignore
+            self.compare_histories)
+        self.l0_layout.addWidget(self.l0_compare_button)
+
+        if globals.debug:
+            self.l0_trace_button = QPushButton("Debug trace")
+            self.l0_trace_button.clicked[None].connect(  # type: ignore
+                self.show_trace)
+            self.l0_layout.addWidget(self.l0_trace_button)
+
         self.l0_layout.addSpacing(10)
 
         # 1st layer: General state information
@@ -134,11 +160,29 @@ class Command_Window(QDialog):
         for button in self.l3_menus_buttons:
             self.l3_layout.addWidget(button)
 
+        # 4th layer: Timeline - past months can be viewed read-only
+        self.time_machine: Time_Machine | None = None
+        self.viewed_state: State_Data | None = None
+
+        self.l4_header = QLabel("Timeline:")
+        self.l4_slider = QSlider(Qt.Horizontal)
+        self.l4_slider.valueChanged[int].connect(  # type: ignore
+            self.view_month)
+        self.l4_present_button = QPushButton("Present")
+        self.l4_present_button.clicked[None].connect(  # type: ignore
+            self.view_present)
+
+        self.l4_layout = QHBoxLayout()
+        self.l4_layout.addWidget(self.l4_header)
+        self.l4_layout.addWidget(self.l4_slider)
+        self.l4_layout.addWidget(self.l4_present_button)
+
         self.layout_ = QVBoxLayout()
         self.layout_.addLayout(self.l0_layout)
         self.layout_.addLayout(self.l1_layout)
         self.layout_.addLayout(self.l2_layout)
         self.layout_.addLayout(self.l3_layout)
+        self.layout_.addLayout(self.l4_layout)
         self.layout_.addSpacing(15)
         self.layout_.addStretch()
         self.setLayout(self.layout_)
@@ -153,31 +197,79 @@ class Command_Window(QDialog):
             self.layout_.removeWidget(self.scene_set)
             self.scene_set.deleteLater()
         self.scene_set = new_scene
-        self.layout_.insertWidget(4, new_scene)
+        self.layout_.insertWidget(5, new_scene)
+        new_scene.set_read_only(self.viewed_state is not None)
+
+    @property
+    def state(self) -> State_Data:
+        """
+        The state shown - the current one, or a past one viewed on the
+        timeline.
+        """
+        if self.viewed_state is not None:
+            return self.viewed_state
+        return self.interface.state
 
     def update(self) -> None:
         # Main menu
         save_string = self.interface.save_name
-        month = f"{self.interface.state.month.name}" \
-                f" {self.interface.state.year}"
+        month = f"{self.state.month.name} {self.state.year}"
         if save_string is None:
             save_string = f"New game: {month}"
         else:
             save_string = f'Loaded game "{save_string}": {month}'
+        if self.viewed_state is not None:
+            save_string += " (viewing the past)"
         self.l0_header.setText(save_string)
-
-        prices = round(self.interface.state.prices, 4)
+        present = self.viewed_state is None
+        self.l0_exec_button.setEnabled(present)
+        self.l0_next_button.setEnabled(present)
+        self.l0_undo_button.setEnabled(
+            present and bool(self.interface.undo_stack))
+        self.l0_redo_button.setEnabled(
+            present and bool(self.interface.redo_stack))
+
+        prices = round(self.state.prices, 4)
         self.l1_prices.set_resources(prices)
 
-        ress = round(self.interface.state.government.resources, 2)
+        ress = round(self.state.government.resources, 2)
         self.l2_resources.set_resources(ress)
         self.l2_population.setText(
-            f"Population: {round(self.interface.state.total_population)}"
+            f"Population: {round(self.state.total_population)}"
         )
+
+        # Timeline
+        if self.time_machine is None or \
+                self.time_machine.history is not self.interface.history:
+            # A save was loaded
+            self.time_machine = Time_Machine(self.interface.history)
+            self.viewed_state = None
+        self.l4_slider.blockSignals(True)
+        self.l4_slider.setMaximum(self.time_machine.months)
+        if present:
+            self.l4_slider.setValue(self.time_machine.months)
+        self.l4_slider.blockSignals(False)
+        self.l4_present_button.setEnabled(not present)
+
         # Scene
         if self.scene_set:
+            self.scene_set.set_read_only(not present)
             self.scene_set.update()
 
+    @crashing_slot
+    def view_month(self, month: int) -> None:
+        assert self.time_machine is not None
+        if month >= self.time_machine.months:
+            self.viewed_state = None
+        else:
+            self.viewed_state = self.time_machine.state_at(month)
+        self.update()
+
+    @crashing_slot
+    def view_present(self) -> None:
+        self.viewed_state = None
+        self.update()
+
     @crashing_slot
     def execute_command(self) -> None:
         dialog = Execute_Dialog(self)
@@ -199,6 +291,16 @@ class Command_Window(QDialog):
             raise ShutDownCommand from e
         self.update()
 
+    @crashing_slot
+    def undo(self) -> None:
+        self.interface.undo()
+        self.update()
+
+    @crashing_slot
+    def redo(self) -> None:
+        self.interface.redo()
+        self.update()
+
     @crashing_slot
     def save_game(self) -> None:
         save_dialog = Save_Dialog(self, False)
@@ -209,6 +311,16 @@ class Command_Window(QDialog):
         save_dialog = Save_Dialog(self, True)
         save_dialog.exec()
 
+    @crashing_slot
+    def compare_histories(self) -> None:
+        compare_dialog = Compare_Dialog(self)
+        compare_dialog.exec()
+
+    @crashing_slot
+    def show_trace(self) -> None:
+        trace_dialog = Trace_Dialog(self)
+        trace_dialog.exec()
+
     @crashing_slot
     def transfer(self, class_name: Class_Name) -> None:
         transfer_dialog = Transfer_Dialog(class_name, self)
@@ -218,8 +330,9 @@ class Command_Window(QDialog):
     def promote(self, class_name: Class_Name) -> None:
         lower_class = self.interface.state.classes[class_name].lower_class
 
-        cost = (INBUILT_RESOURCES[class_name] -
-                INBUILT_RESOURCES[lower_class.class_name])
+        cost = self.interface.state.sm.rules.inbuilt_deltas[
+            class_name, lower_class.class_name
+        ]
         res_maxes = self.interface.state.government.real_resources / cost
         res_max = floor(min(res_maxes.values()))
 
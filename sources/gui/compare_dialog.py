@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QFontDatabase
+from PySide6.QtWidgets import (QDialog, QListWidget, QListWidgetItem,
+                               QMessageBox, QPlainTextEdit, QVBoxLayout)
+
+from ..abstract_interface.comparison import compare_histories, load_history
+from ..abstract_interface.save_catalog import Save_Catalog
+from ..cli.cli_commands import describe_comparison
+from .auxiliaries import crashing_slot
+
+if TYPE_CHECKING:
+    from .command_window import Command_Window
+
+
+class Compare_Dialog(QDialog):
+    """
+    Compares the history of the current game with the history of the save
+    clicked on the list.
+    """
+    def __init__(self, parent: Command_Window) -> None:
+        super().__init__(parent)
+        self._parent = parent
+
+        self.saves_list = QListWidget()
+        for name, info in Save_Catalog().list_saves().items():
+            item = QListWidgetItem(
+                f"{name} - {info['month']} {info['year']}, population "
+                f"{round(info['population'])}"
+            )
+            item.setData(Qt.ItemDataRole.UserRole, name)
+            self.saves_list.addItem(item)
+        self.saves_list.itemClicked[QListWidgetItem].connect(  # type: ignore
+            self.save_clicked
+        )
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setFont(
+            QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont)
+        )
+        self.text.setPlainText("Choose a save to compare the current game "
+                               "with.")
+
+        self.layout_ = QVBoxLayout()
+        self.layout_.addWidget(self.saves_list)
+        self.layout_.addWidget(self.text)
+
+        self.setLayout(self.layout_)
+        self.setWindowTitle("Compare histories")
+        self.setMinimumSize(700, 400)
+
+    @crashing_slot
+    def save_clicked(self, item: QListWidgetItem) -> None:
+        name = item.data(Qt.ItemDataRole.UserRole)
+        try:
+            comparison = compare_histories(
+                load_history(name), self._parent.interface.history
+            )
+        except (OSError, ValueError, KeyError):
+            QMessageBox.warning(self, "Warning",
+                                "Failed to read the save files.")
+            return
+        self.text.setPlainText("\n".join(
+            [f"Save {name} (first) and the current game (second):"]
+            + describe_comparison(comparison)
+        ))
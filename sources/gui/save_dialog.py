@@ -6,11 +6,14 @@ from os.path import isdir
 from shutil import rmtree
 from typing import TYPE_CHECKING
 
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QRegularExpressionValidator
-from PySide6.QtWidgets import (QDialog, QLineEdit, QMessageBox, QPushButton,
+from PySide6.QtWidgets import (QDialog, QLineEdit, QListWidget,
+                               QListWidgetItem, QMessageBox, QPushButton,
                                QVBoxLayout)
 
 from ..abstract_interface.interface import SaveAccessError
+from ..abstract_interface.save_catalog import Save_Catalog
 from .auxiliaries import crashing_slot
 from .confirm_dialog import Confirm_Dialog
 
@@ -31,12 +34,25 @@ class Save_Dialog(QDialog):
             self.dirname_input.setText(self._parent.interface.save_name)
         self.dirname_input.setValidator(QRegularExpressionValidator(r"^\w+$"))
 
+        self.saves_list = QListWidget()
+        for name, info in Save_Catalog().list_saves().items():
+            item = QListWidgetItem(
+                f"{name} - {info['month']} {info['year']}, population "
+                f"{round(info['population'])}"
+            )
+            item.setData(Qt.ItemDataRole.UserRole, name)
+            self.saves_list.addItem(item)
+        self.saves_list.itemClicked[QListWidgetItem].connect(  # type: ignore
+            self.save_clicked
+        )
+
         self.confirm_button = QPushButton("Confirm")
         self.confirm_button.clicked[None].connect(  # type: ignore
             self.confirmed
         )
 
         self.layout_ = QVBoxLayout()
+        self.layout_.addWidget(self.saves_list)
         self.layout_.addWidget(self.dirname_input)
         self.layout_.addWidget(self.confirm_button)
 
@@ -46,6 +62,10 @@ class Save_Dialog(QDialog):
         else:
             self.setWindowTitle("Save")
 
+    @crashing_slot
+    def save_clicked(self, item: QListWidgetItem) -> None:
+        self.dirname_input.setText(item.data(Qt.ItemDataRole.UserRole))
+
     @crashing_slot
     def confirmed(self) -> None:
         if not re.search(r"^\w+$", self.dirname_input.text()):
@@ -94,6 +114,7 @@ class Save_Dialog(QDialog):
                 return
 
             rmtree(f"saves/{self.dirname_input.text()}")
+            Save_Catalog().remove(self.dirname_input.text())
             QMessageBox.information(self, "Success", "Removed the save"
                                     f" saves/{self.dirname_input.text()}")
         self.close()
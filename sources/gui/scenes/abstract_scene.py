@@ -17,3 +17,10 @@ class Abstract_Scene(QWidget):
     @abstractmethod
     def update(self) -> None:
         ...
+
+    def set_read_only(self, read_only: bool) -> None:
+        """
+        Disables (or enables again) changing the state from the scene - a
+        past state is viewed read-only.
+        """
+        self.setEnabled(not read_only)
@@ -91,19 +91,19 @@ class Scene_Classes(Abstract_Scene):
     def update(self) -> None:
         ress = {
             class_name.name: round(
-                self._parent.interface.state.classes[class_name].resources, 2)
+                self._parent.state.classes[class_name].resources, 2)
             for class_name in Class_Name
         }
 
         pops = {
             class_name.name: round(
-                self._parent.interface.state.classes[class_name].population)
+                self._parent.state.classes[class_name].population)
             for class_name in Class_Name
         }
 
         haps = {
             class_name.name: round(
-                self._parent.interface.state.classes[class_name].happiness, 2)
+                self._parent.state.classes[class_name].happiness, 2)
             for class_name in Class_Name
         }
 
@@ -115,6 +115,6 @@ class Scene_Classes(Abstract_Scene):
 
         for i, button in enumerate(self.transfer_buttons):
             button.setEnabled(
-                self._parent.interface.state.classes[
+                self._parent.state.classes[
                     Class_Name(i)].population > 0
             )
@@ -58,11 +58,11 @@ class Scene_Govt(Abstract_Scene):
         self.update()
 
     def update(self):
-        ress = round(self._parent.interface.state.government.resources, 2)
+        ress = round(self._parent.state.government.resources, 2)
         self.data_labels[0].set_resources(ress)
         ress = round(
-            self._parent.interface.state.government.secure_resources, 2)
+            self._parent.state.government.secure_resources, 2)
         self.data_labels[1].set_resources(ress)
         ress = round(
-            self._parent.interface.state.government.optimal_resources, 2)
+            self._parent.state.government.optimal_resources, 2)
         self.data_labels[2].set_resources(ress)
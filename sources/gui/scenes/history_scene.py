@@ -16,6 +16,7 @@ from ..auxiliaries import crashing_slot
 from .abstract_scene import Abstract_Scene
 
 if TYPE_CHECKING:
+    from ...state.state_data import State_Data
     from ..command_window import Command_Window
 
 
@@ -227,7 +228,6 @@ class Scene_History(Abstract_Scene):
     def __init__(self, parent: Command_Window) -> None:
         super().__init__(parent)
         self._parent = parent
-        self.state = parent.interface.state
         self.main_layout = QGridLayout(self)
         self.last_clicked: History_Button | None = None
 
@@ -298,6 +298,18 @@ class Scene_History(Abstract_Scene):
         if self.last_clicked is not None:
             self.last_clicked.clicked_slot()
 
+    @property
+    def state(self) -> State_Data:
+        """
+        The state shown - the current one or a past one viewed on the
+        timeline.
+        """
+        return self._parent.state
+
+    def set_read_only(self, read_only: bool) -> None:
+        # The history can be browsed at any time
+        pass
+
     def update(self) -> None:
         old_begin = self.begin_box.currentIndex()
         self.begin_box.clear()
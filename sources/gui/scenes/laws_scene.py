@@ -12,6 +12,7 @@ from ...state.state_data import InvalidCommandError
 from .abstract_scene import Abstract_Scene
 
 if TYPE_CHECKING:
+    from ...state.state_data import State_Data
     from ..command_window import Command_Window
 
 
@@ -19,7 +20,6 @@ class Scene_Laws(Abstract_Scene):
     def __init__(self, parent: Command_Window) -> None:
         super().__init__(parent)
         self._parent = parent
-        self.state = parent.interface.state
         self.main_layout = QGridLayout(self)
 
         self.left_labels: list[QLabel] = []
@@ -152,6 +152,14 @@ class Scene_Laws(Abstract_Scene):
         label_widget.setAlignment(alignment)
         return label_widget
 
+    @property
+    def state(self) -> State_Data:
+        """
+        The state shown - the current one or a past one viewed on the
+        timeline.
+        """
+        return self._parent.state
+
     def update(self) -> None:
         i = 0
         for law in ["tax_personal", "tax_property", "tax_income"]:
@@ -108,11 +108,19 @@ class Scene_Military(Abstract_Scene):
         for i, button in enumerate(self.fight_buttons):
             self.main_layout.addWidget(button, 7, 2 * i + 1, 1, 2)
 
+        self.estimate_labels: list[QLabel] = []
+        for i in range(len(self.fight_buttons)):
+            self.estimate_labels.append(QLabel())
+            self.estimate_labels[i].setAlignment(Qt.AlignCenter)
+            self.main_layout.addWidget(
+                self.estimate_labels[i], 8, 2 * i + 1, 1, 2
+            )
+
         self.fight_desc_label = QLabel(
             "You can fight only once a round, and you need at least one"
             " soldier."
         )
-        self.main_layout.addWidget(self.fight_desc_label, 8, 1, 1, 4)
+        self.main_layout.addWidget(self.fight_desc_label, 9, 1, 1, 4)
 
         self.setLayout(self.main_layout)
         self.update()
@@ -120,13 +128,13 @@ class Scene_Military(Abstract_Scene):
     def update(self) -> None:
         pops = {
             class_name.name: round(
-                self._parent.interface.state.classes[class_name].population)
+                self._parent.state.classes[class_name].population)
             for class_name in Class_Name
         }
 
         haps = {
             class_name.name: round(
-                self._parent.interface.state.classes[class_name].happiness, 2)
+                self._parent.state.classes[class_name].happiness, 2)
             for class_name in Class_Name
         }
 
@@ -137,15 +145,15 @@ class Scene_Military(Abstract_Scene):
 
         for i, button in enumerate(self.recruit_buttons):
             button.setEnabled(
-                self._parent.interface.state.classes[
+                self._parent.state.classes[
                     Class_Name(i)].population > 0
             )
 
         for label, soldier in zip(self.soldier_labels, Soldier):
             label.value = \
-                self._parent.interface.state.government.soldiers[soldier]
+                self._parent.state.government.soldiers[soldier]
 
-        if self._parent.interface.state.government.soldier_revolt:
+        if self._parent.state.government.soldier_revolt:
             self.revolt_label.setText("The soldiers are revolting!")
         else:
             self.revolt_label.setText("The soldiers are not revolting.")
@@ -166,8 +174,36 @@ class Scene_Military(Abstract_Scene):
             )
 
         for button in self.fight_buttons:
-            if self._parent.interface.state.government.soldiers.number < 1 or \
+            if self._parent.state.government.soldiers.number < 1 or \
                  self._parent.interface.fought:
                 button.setEnabled(False)
             else:
                 button.setEnabled(True)
+
+        self._update_estimates()
+
+    def _update_estimates(self) -> None:
+        """
+        Shows estimated outcomes of each possible attack.
+        """
+        profit_names = ["Brigands killed", "Resources gained", "Land gained"]
+        for label, target, profit_name in zip(
+            self.estimate_labels, ["crime", "plunder", "conquest"],
+            profit_names
+        ):
+            if self._parent.state.government.soldiers.number < 1:
+                label.setText("")
+                continue
+            estimate = self._parent.interface.estimate_fight(target)
+            low_loss, mean_loss, high_loss = \
+                estimate.summary(estimate.ally_losses)
+            low_profit, mean_profit, high_profit = \
+                estimate.summary(estimate.profits)
+            label.setText(
+                f"Victory chance: {round(100 * estimate.victory_chance)}%\n"
+                f"Soldiers lost: {round(100 * low_loss)}-"
+                f"{round(100 * high_loss)}% "
+                f"(avg {round(100 * mean_loss)}%)\n"
+                f"{profit_name}: {round(low_profit, 1)}-"
+                f"{round(high_profit, 1)} (avg {round(mean_profit, 1)})"
+            )
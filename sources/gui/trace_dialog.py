@@ -0,0 +1,23 @@
+from PySide6.QtWidgets import QDialog, QPlainTextEdit, QVBoxLayout, QWidget
+
+from ..auxiliaries import globals
+
+
+class Trace_Dialog(QDialog):
+    def __init__(self, parent: QWidget | None = None, last: int = 1000
+                 ) -> None:
+        super().__init__(parent)
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        lines = globals.trace.format(last)
+        dropped = len(globals.trace) - len(lines) + globals.trace.dropped
+        if dropped > 0:
+            lines.insert(0, f"{dropped} older events not shown.")
+        self.text.setPlainText("\n".join(lines))
+
+        self.main_layout = QVBoxLayout()
+        self.main_layout.addWidget(self.text)
+
+        self.setLayout(self.main_layout)
+        self.setWindowTitle("Debug trace")
+        self.setMinimumSize(600, 400)
@@ -0,0 +1,494 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import pickle
+import sys
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import StringIO
+from tempfile import NamedTemporaryFile
+from itertools import count
+from time import monotonic
+from typing import Any, Callable, Generator, TextIO, TypeVar
+
+from ..abstract_interface.interface import (Interface, MalformedSaveError,
+                                            SaveAccessError)
+from ..auxiliaries import globals
+from ..cli import cli
+from ..cli.cli_commands import ShutDownCommand, find_commands
+from ..state.state_data import State_Data
+from ..state.state_data_base_and_do_month import (EveryoneDeadError,
+                                                  RebellionError)
+
+# Directory (inside saves) evicted sessions are saved to
+SESSIONS_DIR = "server_sessions"
+# History statistics which can be queried, see History
+HISTORY_STATS = {
+    "population", "resources", "population_change", "resources_change",
+    "prices", "total_resources", "growth_modifiers", "employment",
+    "happiness"
+}
+# Maximum number of months advanced by one request
+MAX_MONTHS = 10000
+# CLI commands which can be executed by "command" requests - those which
+# only touch the session's own game. Others change the whole process (debug,
+# memory), the saves directory shared by all sessions (save, delete, list,
+# verify, compare) or start process pools (sensitivity, govern).
+SESSION_COMMANDS = {
+    "history", "next", "undo", "redo", "state", "transfer", "secure",
+    "optimal", "laws", "promote", "recruit", "fight", "help"
+}
+# Default number of worker threads - they share the GIL, so more of them
+# don't simulate faster, they only let more long requests run at once
+SERVER_WORKERS = 4
+
+T = TypeVar("T")
+
+
+class RequestError(Exception):
+    """
+    Raised when a request sent to the server is invalid.
+    """
+
+
+class _Thread_Output:
+    """
+    Standard output replacement which sends what a thread writes inside
+    capture() to that thread's buffer, and everything else to the original
+    output. Lets worker threads capture the output of CLI commands at the
+    same time.
+    """
+    def __init__(self, default: TextIO) -> None:
+        self.default = default
+        self.local = threading.local()
+
+    def write(self, __s: str, /) -> int:
+        buffer = getattr(self.local, "buffer", None)
+        if buffer is None:
+            return self.default.write(__s)
+        return buffer.write(__s)
+
+    def flush(self) -> None:
+        if getattr(self.local, "buffer", None) is None:
+            self.default.flush()
+
+    @contextmanager
+    def capture(self) -> Generator[StringIO, None, None]:
+        self.local.buffer = StringIO()
+        try:
+            yield self.local.buffer
+        finally:
+            self.local.buffer = None
+
+
+class Session:
+    """
+    One game hosted by the server. Interface is None while the session is
+    evicted to disk.
+    """
+    def __init__(self, session_id: str, interface: Interface) -> None:
+        self.id = session_id
+        self.interface: Interface | None = interface
+        self.lock = asyncio.Lock()
+        self.last_used: float = monotonic()
+        # Size of the pickled interface, an estimate of its memory, and the
+        # version of the interface it was measured for (see measure) - only
+        # measured if the server limits the size of sessions
+        self.size: int = 0
+        self._measured: tuple[int, ...] = ()
+
+    def measure(self) -> None:
+        """
+        Measures the size of the session again, if its game changed since
+        the last measurement.
+        """
+        interface = self.interface
+        assert interface is not None
+        version = (
+            id(interface.state), len(interface.history.history_lines),
+            len(interface.checkpoints.digests), len(interface.undo_stack),
+            len(interface.redo_stack)
+        )
+        if version != self._measured:
+            self.size = len(pickle.dumps(interface, pickle.HIGHEST_PROTOCOL))
+            self._measured = version
+
+    @property
+    def eviction_path(self) -> str:
+        """
+        Path of the file the session is evicted to.
+        """
+        return f"saves/{SESSIONS_DIR}/{self.id}.pickle"
+
+
+class Simulation_Server:
+    """
+    Hosts many game sessions in one process. Requests are JSON objects with
+    an "op" key, see handle. Simulation is done by a pool of worker threads,
+    so the server keeps answering while a long request is being executed.
+    The threads share the GIL - adding them doesn't add simulation
+    throughput. Requests of one session are executed one at a time. If more
+    than max_resident sessions are in memory, or their sizes (see
+    Session.size) add up to more than max_size bytes, the least recently
+    used ones are evicted to disk (pickled, so they are loaded back as they
+    were) and loaded back when needed.
+    """
+    def __init__(self, workers: int = SERVER_WORKERS,
+                 max_resident: int = 64, max_size: int | None = None
+                 ) -> None:
+        if workers < 1 or max_resident < 1:
+            raise ValueError("workers and max_resident must be positive")
+        if max_size is not None and max_size < 1:
+            raise ValueError("max_size must be positive")
+        self.executor = ThreadPoolExecutor(workers)
+        self.max_resident = max_resident
+        self.max_size = max_size
+        self.sessions: dict[str, Session] = {}
+        self.evictions: int = 0
+        self._ids = count()
+        self._output: _Thread_Output | None = None
+        self._old_stdout: TextIO | None = None
+        self._old_confirmation: bool | None = None
+
+    def __enter__(self) -> Simulation_Server:
+        """
+        Installs the output capturing and makes all confirmation prompts be
+        aborted, as the server has no user to ask.
+        """
+        self._old_stdout = sys.stdout
+        self._output = _Thread_Output(sys.stdout)
+        sys.stdout = self._output  # type: ignore
+        self._old_confirmation = globals.confirmation
+        globals.confirmation = False
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        sys.stdout = self._old_stdout  # type: ignore
+        globals.confirmation = self._old_confirmation
+        self.executor.shutdown()
+        for session in self.sessions.values():
+            self._delete_eviction_save(session)
+        try:
+            os.rmdir(f"saves/{SESSIONS_DIR}")
+        except OSError:
+            pass
+
+    @property
+    def resident(self) -> int:
+        return sum(
+            1 for session in self.sessions.values()
+            if session.interface is not None
+        )
+
+    @property
+    def resident_size(self) -> int:
+        return sum(
+            session.size for session in self.sessions.values()
+            if session.interface is not None
+        )
+
+    def _over_limit(self) -> bool:
+        """
+        Returns whether sessions have to be evicted - a single session is
+        kept in memory even if it is larger than max_size.
+        """
+        resident = self.resident
+        return resident > self.max_resident or (
+            self.max_size is not None and resident > 1
+            and self.resident_size > self.max_size
+        )
+
+    async def _in_worker(self, function: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, function, *args
+        )
+
+    def _get_session(self, request: dict[str, Any]) -> Session:
+        session = self.sessions.get(str(request.get("session")))
+        if session is None:
+            raise RequestError("no such session")
+        return session
+
+    @staticmethod
+    def _summary(interface: Interface) -> dict[str, Any]:
+        """
+        Returns basic data about the session's current state.
+        """
+        return {
+            "month": interface.state.month.name,
+            "year": interface.state.year,
+            "population": interface.state.total_population
+        }
+
+    @staticmethod
+    def _evict_session(session: Session) -> None:
+        """
+        Writes the whole interface of the session to disk - with its undo
+        stack and random number generator, and without replaying the history
+        when it is loaded back - and frees it.
+        """
+        assert session.interface is not None
+        directory = os.path.dirname(session.eviction_path)
+        os.makedirs(directory, exist_ok=True)
+        with NamedTemporaryFile('wb', dir=directory, suffix=".tmp",
+                                delete=False) as file:
+            pickle.dump(session.interface, file, pickle.HIGHEST_PROTOCOL)
+        os.replace(file.name, session.eviction_path)
+        session.interface = None
+
+    @staticmethod
+    def _restore_session(session: Session) -> None:
+        """
+        Loads an evicted session back from disk.
+        """
+        with open(session.eviction_path, 'rb') as file:
+            session.interface = pickle.load(file)
+        Simulation_Server._delete_eviction_save(session)
+
+    @staticmethod
+    def _delete_eviction_save(session: Session) -> None:
+        try:
+            os.remove(session.eviction_path)
+        except FileNotFoundError:
+            pass
+
+    async def _evict(self) -> None:
+        """
+        Evicts the least recently used idle sessions until the sessions in
+        memory are within the limits.
+        """
+        while self._over_limit():
+            candidates = [
+                session for session in self.sessions.values()
+                if session.interface is not None and not session.lock.locked()
+            ]
+            if not candidates:
+                return
+            session = min(candidates, key=lambda session: session.last_used)
+            async with session.lock:
+                if session.interface is not None:
+                    await self._in_worker(
+                        Simulation_Server._evict_session, session
+                    )
+                    self.evictions += 1
+
+    async def _run(self, session: Session,
+                   function: Callable[[Interface], T]) -> T:
+        """
+        Runs the given function on the session's interface in a worker,
+        after loading the session back if it was evicted, and measures the
+        session afterwards if sessions are limited by their size.
+        """
+        async with session.lock:
+            # The session could have been closed while waiting for the lock
+            if session.id not in self.sessions:
+                raise RequestError("no such session")
+            if session.interface is None:
+                await self._in_worker(
+                    Simulation_Server._restore_session, session
+                )
+            session.last_used = monotonic()
+            interface = session.interface
+            assert interface is not None
+
+            def run() -> T:
+                try:
+                    return function(interface)
+                finally:
+                    if measured:
+                        session.measure()
+
+            measured = self.max_size is not None
+
+            try:
+                return await self._in_worker(run)
+            finally:
+                session.last_used = monotonic()
+
+    async def _create(self, request: dict[str, Any]) -> dict[str, Any]:
+        def create() -> Interface:
+            if "state" in request:
+                return Interface(State_Data.from_dict(request["state"]))
+            interface = Interface()
+            interface.load_data(str(request.get("save", "starting")))
+            return interface
+
+        try:
+            interface = await self._in_worker(create)
+        except (SaveAccessError, MalformedSaveError) as e:
+            raise RequestError("failed to load the save") from e
+        except Exception as e:
+            raise RequestError("invalid state") from e
+        session = Session(str(next(self._ids)), interface)
+        if self.max_size is not None:
+            await self._in_worker(session.measure)
+        self.sessions[session.id] = session
+        await self._evict()
+        return {"session": session.id, **Simulation_Server._summary(interface)}
+
+    async def _next(self, request: dict[str, Any]) -> dict[str, Any]:
+        months = request.get("months", 1)
+        if not isinstance(months, int) or not 0 < months <= MAX_MONTHS:
+            raise RequestError(f"months must be an integer from 1 to "
+                               f"{MAX_MONTHS}")
+
+        def next_months(interface: Interface) -> dict[str, Any]:
+            try:
+                skip = interface.next_months(months)
+            except EveryoneDeadError as e:
+                raise RequestError("game over - everyone is dead") from e
+            except RebellionError as e:
+                raise RequestError(
+                    f"game over - {e.class_name} have rebelled"
+                ) from e
+            response = Simulation_Server._summary(interface)
+            if skip is not None:
+                response["skipped"] = skip.months
+            return response
+
+        return await self._run(self._get_session(request), next_months)
+
+    async def _command(self, request: dict[str, Any]) -> dict[str, Any]:
+        command = request.get("command")
+        if not isinstance(command, str):
+            raise RequestError("command must be a string")
+        names = find_commands(command.strip().split(' ')[0])
+        if len(names) == 1 and not names <= SESSION_COMMANDS:
+            raise RequestError(f"command {names.pop()} is not available on "
+                               f"the server")
+        output = self._output
+
+        def execute(interface: Interface) -> dict[str, Any]:
+            assert output is not None
+            with output.capture() as buffer:
+                try:
+                    succeeded = cli.execute(command.strip(), interface)
+                except ShutDownCommand:
+                    succeeded = False
+            return {"succeeded": succeeded, "output": buffer.getvalue()}
+
+        return await self._run(self._get_session(request), execute)
+
+    async def _history(self, request: dict[str, Any]) -> dict[str, Any]:
+        stat = request.get("stat")
+        if stat not in HISTORY_STATS:
+            raise RequestError(f"stat must be one of: "
+                               f"{', '.join(sorted(HISTORY_STATS))}")
+        months = request.get("months")
+
+        def history(interface: Interface) -> dict[str, Any]:
+            data = getattr(interface.history, str(stat))()
+            if isinstance(months, int) and months > 0:
+                data = data[-months:]
+            return {"data": data}
+
+        return await self._run(self._get_session(request), history)
+
+    async def _state(self, request: dict[str, Any]) -> dict[str, Any]:
+        return await self._run(
+            self._get_session(request), Simulation_Server._summary
+        )
+
+    async def _close(self, request: dict[str, Any]) -> dict[str, Any]:
+        session = self._get_session(request)
+        async with session.lock:
+            # The session could have been closed while waiting for the lock
+            if session.id not in self.sessions:
+                raise RequestError("no such session")
+            del self.sessions[session.id]
+            session.interface = None
+        await self._in_worker(Simulation_Server._delete_eviction_save,
+                              session)
+        return {}
+
+    async def handle(self, request: Any) -> dict[str, Any]:
+        """
+        Executes the given request and returns the response. Requests:
+        {"op": "create", "save": NAME} or {"op": "create", "state": DICT}
+        {"op": "next", "session": ID, "months": N}
+        {"op": "command", "session": ID, "command": CLI_COMMAND}
+            (only SESSION_COMMANDS)
+        {"op": "history", "session": ID, "stat": STAT, "months": N}
+        {"op": "state", "session": ID}
+        {"op": "close", "session": ID}
+        Responses have "ok" set to whether the request succeeded, and
+        "error" describing the problem if it did not. Responses to "next"
+        have "skipped" set to the number of months skipped after detecting a
+        cycle (see cycles.py), if any were.
+        """
+        operations = {
+            "create": self._create,
+            "next": self._next,
+            "command": self._command,
+            "history": self._history,
+            "state": self._state,
+            "close": self._close
+        }
+        try:
+            if not isinstance(request, dict) or \
+                    request.get("op") not in operations:
+                raise RequestError(f"op must be one of: "
+                                   f"{', '.join(operations)}")
+            response = await operations[request["op"]](request)
+        except RequestError as e:
+            return {"ok": False, "error": str(e)}
+        except Exception as e:
+            if globals.debug:
+                traceback.print_exc(file=sys.stderr)
+            return {"ok": False,
+                    "error": f"unexpected {e.__class__.__name__}"}
+        if request["op"] != "create":
+            await self._evict()
+        return {"ok": True, **response}
+
+    async def serve_connection(self, reader: asyncio.StreamReader,
+                               writer: asyncio.StreamWriter) -> None:
+        """
+        Answers requests sent over the connection, one JSON object per line.
+        """
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {"ok": False, "error": "invalid JSON"}
+                else:
+                    response = await self.handle(request)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0
+                    ) -> asyncio.Server:
+        """
+        Starts listening on the given address. Port 0 means any free port.
+        """
+        return await asyncio.start_server(self.serve_connection, host, port,
+                                          limit=1 << 24)
+
+
+def run_server(port: int, host: str = "127.0.0.1",
+               workers: int = SERVER_WORKERS, max_resident: int = 64,
+               max_size: int | None = None) -> None:
+    """
+    Runs the simulation server until it is interrupted.
+    """
+    async def serve() -> None:
+        with Simulation_Server(workers, max_resident, max_size) as server:
+            tcp_server = await server.start(host, port)
+            address = tcp_server.sockets[0].getsockname()
+            print(f"Serving on {address[0]}:{address[1]}", file=sys.stderr)
+            async with tcp_server:
+                await tcp_server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print("Shutting down.", file=sys.stderr)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from math import nan
 from typing import TYPE_CHECKING, Any
 
 from ..auxiliaries.resources import Resources
@@ -23,6 +24,14 @@ class Government:
     optimal_resources - how much resources the govt wants to own
     max_employees - how many employees can the govt employ
     """
+    # Every attribute is always set, see Class
+    __slots__ = (
+        "parent", "resources", "optimal_resources", "secure_resources",
+        "wage", "wage_autoregulation", "soldiers", "missing_food",
+        "employees", "increase_wage", "profit_share", "old_wage",
+        "market_res", "money", "_real_key", "_real_resources"
+    )
+
     # mutable default arguments - they are copied anyway
     def __init__(self, parent: State_Data, res: Resources = Resources(),
                  optimal_res: Resources = Resources(),
@@ -61,17 +70,31 @@ class Government:
 
         # Attributes used only during employment calculation and history
         self.employees: float = 0
-        self.increase_wage: bool
-        self.profit_share: float
-        self.old_wage: float = self.parent.sm.others_minimum_wage
+        self.increase_wage: bool = False
+        self.profit_share: float = 0
+        # None after the wage is set by a law, until the next employment
+        self.old_wage: float | None = self.parent.sm.others_minimum_wage
+
+        # Attributes used only when trading, market_res is None outside of it
+        self.market_res: Resources | None = None
+        self.money: float = 0
 
-        # Attributes used only when trading
-        self.market_res: Resources
-        self.money: float
+        # Cache of real_resources, keyed like Class._cached
+        self._real_key: tuple[float, ...] = ()
+        self._real_resources: Resources = Resources()
 
     @property
     def real_resources(self) -> Resources:
-        return self.resources + self.secure_resources
+        """
+        The result is cached and must not be modified.
+        """
+        key = (*self.resources.values(), *self.secure_resources.values())
+        if key != self._real_key:
+            real_resources = self.resources.copy()
+            real_resources += self.secure_resources
+            self._real_key = key
+            self._real_resources = real_resources
+        return self._real_resources
 
     @property
     def max_employees(self) -> float:
@@ -112,6 +135,23 @@ class Government:
             "old_wage": self.old_wage
         }
 
+    def digest_values(self) -> list[float]:
+        """
+        Returns the numbers describing the government, in a fixed order
+        (see State_Data.digest).
+        """
+        values: list[float] = [
+            self.wage, self.wage_autoregulation, self.missing_food,
+            self.employees, nan if self.old_wage is None else self.old_wage
+        ]
+        # Resources and Soldiers always hold every resource or soldier type,
+        # in the order of the enum
+        values.extend(self.resources.values())
+        values.extend(self.optimal_resources.values())
+        values.extend(self.secure_resources.values())
+        values.extend(self.soldiers.values())
+        return values
+
     @classmethod
     def from_dict(cls, parent: State_Data, data: dict[str, Any]) -> Government:
         """
@@ -128,7 +168,8 @@ class Government:
             new.wage_autoregulation = bool(data["wage_autoregulation"])
             new.missing_food = float(data["missing_food"])
             new.employees = float(data["employees"])
-            new.old_wage = float(data["old_wage"])
+            new.old_wage = None if data["old_wage"] is None \
+                else float(data["old_wage"])
         except (KeyError, ValueError) as e:
             raise InvalidInputError from e
         return new
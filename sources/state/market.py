@@ -12,7 +12,7 @@ if TYPE_CHECKING:
 
 class SupportsTrade(Protocol):
     resources: Resources
-    market_res: Resources
+    market_res: Resources | None
     money: float
 
     @property
@@ -31,21 +31,52 @@ class Market:
     classes - objects between which trade is done
     prices - prices of resources in the last done trade
     """
+    __slots__ = (
+        "trading_objs", "parent", "_optimal_rows", "needed_resources",
+        "available_resources", "old_avail_res", "_full_prices", "prices"
+    )
+
     def __init__(self, classes: Sequence[SupportsTrade], parent: State_Data):
         self.trading_objs: list[SupportsTrade] = list(classes)
         self.parent: State_Data = parent
 
+        # Attributes used only during trade calculations
+        self._optimal_rows: list[Resources] = []
+        self.needed_resources: Resources = Resources()
+        self.available_resources: Resources = Resources()
+        self._full_prices: Resources = Resources()
+
+        # None until the first trade
+        self.old_avail_res: Resources | None = None
+        self.prices: Resources = Resources()
+
+    @staticmethod
+    def _takes_part(trading_obj: SupportsTrade) -> bool:
+        """
+        Returns whether the object takes part in the final distribution of
+        resources - empty social classes do not. The object doesn't have to
+        have a population attribute.
+        """
+        return getattr(trading_obj, "population", None) != 0
+
     def _get_available_and_needed_resources(self):
         """
-        Calculates how much resources are available and needed.
+        Calculates how much resources are available and needed. Optimal
+        resources of every trading object are calculated here once and kept
+        for the rest of the trade.
         """
-        self.needed_resources: Resources = Resources()
-        self.available_resources: Resources = Resources()
-        for social_class in self.trading_objs:
-            self.needed_resources += social_class.optimal_resources
+        self._optimal_rows = [
+            trading_obj.optimal_resources
+            for trading_obj in self.trading_objs
+        ]
+        self.needed_resources = Resources()
+        self.available_resources = Resources()
+        for social_class, optimal in zip(self.trading_objs,
+                                         self._optimal_rows):
+            self.needed_resources += optimal
             self.available_resources += social_class.resources
-        if not hasattr(self, "old_avail_res"):
-            self.old_avail_res: Resources = self.available_resources.copy()
+        if self.old_avail_res is None:
+            self.old_avail_res = self.available_resources.copy()
 
     def _set_prices(self):
         """
@@ -62,6 +93,7 @@ class Market:
         self.prices = self._full_prices.copy()
         # Obtain the differential price:
         # diff_price = -d(ava_res), (-inf, inf)
+        assert self.old_avail_res is not None
         diff_prices = self.old_avail_res - self.available_resources
         # diff_price = e^(-d(ava_res)), (0, inf)
         # when price hasn't changed in last month, diff_price = 1
@@ -80,28 +112,21 @@ class Market:
         """
         Executes the classes purchasing resources they need.
         """
-        for trading_obj in self.trading_objs:
-            corrected_optimal_resources = Resources()
-            rel_prices = self._full_prices / DEFAULT_PRICES
-            price_adjusted = {
-                resource: amount / (rel_prices[resource]
-                                    if rel_prices[resource] > 0.1
-                                    else 0.1)
-                for resource, amount
-                in trading_obj.optimal_resources.items()
-            }
-            for key in trading_obj.optimal_resources:
-                corrected_optimal_resources[key] = min(
-                    trading_obj.optimal_resources[key],
-                    price_adjusted[key]
-                )
-
-            trading_obj.money = sum(
-                (trading_obj.resources * self.prices).values()
-            )
-            needed_money = sum(
-                (corrected_optimal_resources * self.prices).values()
-            )
+        rel_prices = self._full_prices / DEFAULT_PRICES
+        # Expensive resources are bought in smaller amounts
+        price_divisors = {
+            resource: rel_price if rel_price > 0.1 else 0.1
+            for resource, rel_price in rel_prices.items()
+        }
+        for trading_obj, optimal in zip(self.trading_objs,
+                                        self._optimal_rows):
+            corrected_optimal_resources = Resources({
+                resource: min(amount, amount / price_divisors[resource])
+                for resource, amount in optimal.items()
+            })
+
+            trading_obj.money = trading_obj.resources.worth(self.prices)
+            needed_money = corrected_optimal_resources.worth(self.prices)
             if needed_money > 0:
                 part_bought = min(trading_obj.money / needed_money, 1)
                 money_spent = min(trading_obj.money, needed_money)
@@ -117,59 +142,49 @@ class Market:
         """
         Executes the classes purchasing all remaining resources.
         """
-        total_price = sum((self.available_resources * self.prices).values())
+        buyers = [
+            trading_obj for trading_obj in self.trading_objs
+            if Market._takes_part(trading_obj)
+        ]
+        total_price = self.available_resources.worth(self.prices)
         if total_price > 0:
-            for social_class in self.trading_objs:
-                try:
-                    # social_class doesn't have to have population attribute
-                    if social_class.population == 0:  # type: ignore
-                        continue
-                except AttributeError:
-                    pass
-
+            for social_class in buyers:
                 part_bought = social_class.money / total_price
-                social_class.market_res += \
-                    self.available_resources * part_bought
+                social_class.market_res.add_multiplied(
+                    self.available_resources, part_bought
+                )
                 social_class.money = 0
-        else:
-            classes_count = 0
-            for social_class in self.trading_objs:
-                try:
-                    # social_class doesn't have to have population attribute
-                    if social_class.population == 0:  # type: ignore
-                        continue
-                except AttributeError:
-                    pass
-                classes_count += 1
-            for social_class in self.trading_objs:
-                try:
-                    # social_class doesn't have to have population attribute
-                    if social_class.population == 0:  # type: ignore
-                        continue
-                except AttributeError:
-                    pass
-                social_class.market_res += \
-                    self.available_resources / classes_count
+        elif buyers:
+            equal_part = self.available_resources / len(buyers)
+            for social_class in buyers:
+                social_class.market_res += equal_part
         self.available_resources = Resources()
 
     def _delete_trade_attributes(self):
         """
-        Finalizes trade and deletes attributes used during trade calculations.
+        Finalizes trade and resets attributes used during trade calculations
+        to their "not set" values.
         """
         for social_class in self.trading_objs:
-            try:
-                # social_class doesn't have to have population attribute
-                if social_class.population == 0:  # type: ignore
-                    continue
-            except AttributeError:
-                pass
-            del social_class.money
+            if not Market._takes_part(social_class):
+                continue
+            social_class.money = 0
             social_class.resources = social_class.market_res
-            del social_class.market_res
+            social_class.market_res = None
 
         self.old_avail_res = self.available_resources.copy()
-        del self.available_resources
-        del self.needed_resources
+        self.available_resources = Resources()
+        self.needed_resources = Resources()
+        self._optimal_rows = []
+
+    def digest_values(self) -> list[float]:
+        """
+        Returns the numbers describing the market's memory of the last trade
+        (see State_Data.digest).
+        """
+        if self.old_avail_res is None:
+            return [0]
+        return [1, *self.old_avail_res.values()]
 
     def do_trade(self):
         """
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from itertools import chain
+from typing import Any, Iterator, Sequence, TypedDict
+
+from ..auxiliaries.enums import CLASS_NAME_STR, RESOURCE_STR
+
+# Names of the owners of resources - social classes and the government
+OWNER_STR = CLASS_NAME_STR + ["government"]
+GROWTH_MODIFIERS = (
+    "starving", "freezing", "demoted_from", "demoted_to", "promoted_from",
+    "promoted_to"
+)
+MONTH_DATA_KEYS = (
+    "prices", "resources_after", "population_after", "change_resources",
+    "change_population", "growth_modifiers", "employees", "wages",
+    "happiness"
+)
+# Names of the metrics of Month_Data.flat_values - keys of the nested dicts
+# joined with dots, e.g. "resources_after.nobles.food"
+FLAT_KEYS: tuple[str, ...] = (
+    *(f"prices.{resource}" for resource in RESOURCE_STR),
+    *(f"resources_after.{owner}.{resource}"
+      for owner in OWNER_STR for resource in RESOURCE_STR),
+    *(f"population_after.{class_name}" for class_name in CLASS_NAME_STR),
+    *(f"change_resources.{owner}.{resource}"
+      for owner in OWNER_STR for resource in RESOURCE_STR),
+    *(f"change_population.{class_name}" for class_name in CLASS_NAME_STR),
+    *(f"growth_modifiers.{class_name}.{modifier}"
+      for class_name in CLASS_NAME_STR for modifier in GROWTH_MODIFIERS),
+    *(f"employees.{owner}" for owner in OWNER_STR),
+    *(f"wages.{owner}" for owner in OWNER_STR),
+    *(f"happiness.{class_name}" for class_name in CLASS_NAME_STR)
+)
+
+
+class Month_Data_Dict(TypedDict):
+    prices: dict[str, float]
+    resources_after: dict[str, dict[str, float]]
+    population_after: dict[str, float]
+    change_resources: dict[str, dict[str, float]]
+    change_population: dict[str, float]
+    growth_modifiers: dict[str, dict[str, bool]]
+    employees: dict[str, float]
+    wages: dict[str, float]
+    happiness: dict[str, float]
+
+
+class Month_Data(Mapping[str, Any]):
+    """
+    Data from a month, kept as tuples indexed by resource, class (in
+    Class_Name order) and owner (classes and then the government). It is a
+    read-only mapping with the keys of Month_Data_Dict - dicts of the legacy
+    shape are only made when a key is accessed (or by to_dict), and each
+    access makes new ones.
+    Attributes:
+    prices - prices after the month
+    resources, old_resources - real resources of owners after and before
+                               the month
+    population, old_population - populations of classes after and before
+                                 the month
+    modifiers - growth modifiers of classes, in GROWTH_MODIFIERS order
+    employees, wages - employees and wages of owners
+    happiness - happiness of classes
+    """
+    __slots__ = (
+        "prices", "resources", "old_resources", "population",
+        "old_population", "modifiers", "employees", "wages", "happiness"
+    )
+
+    def __init__(self, prices: Sequence[float],
+                 resources: Sequence[Sequence[float]],
+                 old_resources: Sequence[Sequence[float]],
+                 population: Sequence[float],
+                 old_population: Sequence[float],
+                 modifiers: Sequence[Sequence[bool]],
+                 employees: Sequence[float], wages: Sequence[float],
+                 happiness: Sequence[float]) -> None:
+        self.prices = prices
+        self.resources = resources
+        self.old_resources = old_resources
+        self.population = population
+        self.old_population = old_population
+        self.modifiers = modifiers
+        self.employees = employees
+        self.wages = wages
+        self.happiness = happiness
+
+    @staticmethod
+    def _by_resource(values: Sequence[float]) -> dict[str, float]:
+        return dict(zip(RESOURCE_STR, values))
+
+    def _prices(self) -> dict[str, float]:
+        return Month_Data._by_resource(self.prices)
+
+    def _resources_after(self) -> dict[str, dict[str, float]]:
+        return {
+            owner: Month_Data._by_resource(values)
+            for owner, values in zip(OWNER_STR, self.resources)
+        }
+
+    def _population_after(self) -> dict[str, float]:
+        return dict(zip(CLASS_NAME_STR, self.population))
+
+    def _change_resources(self) -> dict[str, dict[str, float]]:
+        return {
+            owner: {
+                resource: after - before
+                for resource, after, before in zip(RESOURCE_STR, new, old)
+            }
+            for owner, new, old
+            in zip(OWNER_STR, self.resources, self.old_resources)
+        }
+
+    def _change_population(self) -> dict[str, float]:
+        return {
+            class_name: after - before
+            for class_name, after, before
+            in zip(CLASS_NAME_STR, self.population, self.old_population)
+        }
+
+    def _growth_modifiers(self) -> dict[str, dict[str, bool]]:
+        return {
+            class_name: dict(zip(GROWTH_MODIFIERS, modifiers))
+            for class_name, modifiers in zip(CLASS_NAME_STR, self.modifiers)
+        }
+
+    def _employees(self) -> dict[str, float]:
+        return dict(zip(OWNER_STR, self.employees))
+
+    def _wages(self) -> dict[str, float]:
+        return dict(zip(OWNER_STR, self.wages))
+
+    def _happiness(self) -> dict[str, float]:
+        return dict(zip(CLASS_NAME_STR, self.happiness))
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in MONTH_DATA_KEYS:
+            raise KeyError(key)
+        return getattr(self, '_' + key)()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(MONTH_DATA_KEYS)
+
+    def __len__(self) -> int:
+        return len(MONTH_DATA_KEYS)
+
+    def __repr__(self) -> str:
+        return f"Month_Data({self.to_dict()!r})"
+
+    def flat_values(self) -> tuple[float, ...]:
+        """
+        Returns all numbers of the data in FLAT_KEYS order, with growth
+        modifiers as 0 or 1.
+        """
+        return (
+            *self.prices,
+            *chain.from_iterable(self.resources),
+            *self.population,
+            *(after - before
+              for new, old in zip(self.resources, self.old_resources)
+              for after, before in zip(new, old)),
+            *(after - before
+              for after, before in zip(self.population, self.old_population)),
+            *(float(modifier)
+              for modifier in chain.from_iterable(self.modifiers)),
+            *self.employees,
+            *self.wages,
+            *self.happiness
+        )
+
+    def to_dict(self) -> Month_Data_Dict:
+        """
+        Returns the data as nested dicts with string keys.
+        """
+        return {
+            "prices": self._prices(),
+            "resources_after": self._resources_after(),
+            "population_after": self._population_after(),
+            "change_resources": self._change_resources(),
+            "change_population": self._change_population(),
+            "growth_modifiers": self._growth_modifiers(),
+            "employees": self._employees(),
+            "wages": self._wages(),
+            "happiness": self._happiness()
+        }
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor
+from copy import deepcopy
+from math import ceil
+from typing import Generator, Sequence
+
+from typing_extensions import Self
+
+from ..auxiliaries import globals
+from ..auxiliaries.enums import Class_Name, Month, Resource
+from ..auxiliaries.memory import Memory_Phase
+from ..auxiliaries.resources import Resources
+from ..auxiliaries.soldiers import Soldiers
+from ..auxiliaries.trace import Trace_Event, Trace_Phase
+from .social_classes.class_file import Class
+from .state_data import State_Data
+from .month_data import GROWTH_MODIFIERS
+from .state_data_base_and_do_month import (Government, Month_Data,
+                                           State_Data_Base_And_Do_Month)
+
+
+def _do_local_month(province: State_Data) -> State_Data:
+    """
+    Does the phases of the month which concern only one province (see
+    _do_local_phases). Taxes are paid to the provincial government. Returns
+    the province, so that it can be sent back from a worker process.
+    """
+    province._do_local_phases(national=False)
+    province._secure_classes()
+    return province
+
+
+class Provinces_State_Data(State_Data_Base_And_Do_Month):
+    """
+    Represents a country split into provinces. Each province is a State_Data
+    with its own social classes, land and provincial government, which holds
+    the state estates (land and tools) of the province. The national
+    government holds the treasury and the soldiers.
+    Local phases of the month are done separately in each province, possibly
+    in worker processes. National phases - collecting taxes from provincial
+    governments, crime and trade - are done for the whole country afterwards.
+    Iterating over the object yields social classes of all provinces.
+    Properties:
+    provinces - states being the provinces of the country
+    executor - executor (e.g. a ProcessPoolExecutor) doing the local phases
+               in do_month, None to do them in this process
+    workers - number of workers of the executor, provinces are split into
+              that many shards
+    government - national government of the country
+    _market - object executing trade within the whole country
+    """
+    def __init__(self, starting_month: Month = Month.January,
+                 starting_year: int = 0, executor: Executor | None = None,
+                 workers: int = 1) -> None:
+        super().__init__(starting_month, starting_year)
+        self._provinces: list[State_Data] = []
+        self.executor = executor
+        self.workers = workers
+
+    def __getstate__(self) -> dict:
+        # Executors can't be pickled - copies of the country (in saves,
+        # undo and the planner) do their months in this process
+        state = self.__dict__.copy()
+        state["executor"] = None
+        return state
+
+    @classmethod
+    def from_states(cls, states: Sequence[State_Data],
+                    executor: Executor | None = None,
+                    workers: int = 1) -> Self:
+        """
+        Unites the given finalized states into provinces of one country. Laws,
+        prices and date are taken from the first state. Governments of the
+        states become provincial governments - their soldiers and all
+        resources other than land and tools are handed over to the national
+        government. So are their brigands. If an executor with the given
+        number of workers is given, the country's months are done with it.
+        """
+        if not states:
+            raise ValueError("a country needs at least one province")
+        first = states[0]
+        country = cls(first.month, first.year, executor, workers)
+        country.prices = first.prices.copy()
+        country.sm.tax_rates = deepcopy(first.sm.tax_rates)
+        country.sm.others_minimum_wage = first.sm.others_minimum_wage
+        country.sm.max_prices = first.sm.max_prices.copy()
+
+        government = Government(country)
+        for state in states:
+            government.soldiers += state.government.soldiers
+            state.government.soldiers = Soldiers()
+            country._add_brigands(state.brigands, state.brigands_strength)
+            state.brigands = 0
+        country.government = government
+        country.provinces = states
+        country._remit_provincial_resources()
+        return country
+
+    @property
+    def provinces(self) -> list[State_Data]:
+        return self._provinces.copy()
+
+    @provinces.setter
+    def provinces(self, new: Sequence[State_Data]):
+        self._provinces = list(new)
+        if self._market is not None:
+            # The market remembers resources available in the last trade
+            self._market.trading_objs = [*self, self.government]
+        elif self._government is not None:
+            self._create_market()
+
+    def __iter__(self) -> Generator[Class, None, None]:
+        for province in self._provinces:
+            yield from province
+
+    def _share_laws(self) -> None:
+        """
+        Makes all provinces follow the national laws.
+        """
+        for province in self._provinces:
+            province.sm.tax_rates = deepcopy(self.sm.tax_rates)
+            province.sm.others_minimum_wage = self.sm.others_minimum_wage
+            province.sm.max_prices = self.sm.max_prices.copy()
+
+    def _remit_provincial_resources(self) -> None:
+        """
+        Moves all resources of provincial governments except land and tools
+        to the national government.
+        """
+        for province in self._provinces:
+            remitted = province.government.resources.copy()
+            remitted[Resource.land] = 0
+            remitted[Resource.tools] = 0
+            province.government.resources -= remitted
+            self.government.resources += remitted
+
+    def _do_local_months(self, executor: Executor | None,
+                         workers: int) -> None:
+        """
+        Does the local phases of the month in all provinces. If an executor
+        is given, provinces are split into the given number of shards (one
+        per worker) and the shards are processed by it. Memory profiles
+        (globals.memory) only measure this process, so the provinces are
+        processed here while memory is profiled.
+        """
+        if executor is None or globals.memory is not None:
+            for province in self._provinces:
+                _do_local_month(province)
+        else:
+            shard_size = ceil(len(self._provinces) / max(workers, 1))
+            self.provinces = list(executor.map(
+                _do_local_month, self._provinces, chunksize=shard_size
+            ))
+
+    def _secure_classes(self) -> None:
+        """
+        Validates all classes and governments, and checks for empty classes.
+        """
+        for province in self._provinces:
+            province._secure_classes()
+        self.government.validate()
+
+    def digest_values(self, date: bool = True) -> list[float]:
+        """
+        Returns the numbers the digest is made of - national ones followed
+        by ones of every province.
+        """
+        values: list[float] = [self.year, self.month.value] if date else []
+        values += [self._brigands, self._brigands_strength,
+                   len(self._provinces)]
+        values.extend(self.prices.values())
+        values.extend(self.government.digest_values())
+        values.extend(self.sm.digest_values())
+        values.extend(self.market.digest_values())
+        for province in self._provinces:
+            values.extend(province.digest_values(date))
+        return values
+
+    def skip_months(self, amount: int) -> None:
+        super().skip_months(amount)
+        for province in self._provinces:
+            province.skip_months(amount)
+
+    def _get_old_data(self) -> tuple[list[tuple[float, ...]],
+                                     tuple[float, ...]]:
+        """
+        Returns real resources (of classes and the government) and
+        populations of the whole country - summed over the provinces, with
+        the national government's resources added to the government's.
+        """
+        owners = [Resources() for _ in Class_Name]
+        owners.append(self.government.real_resources.copy())
+        population = [0.0] * len(Class_Name)
+        for province in self._provinces:
+            for index, social_class in enumerate(
+                    province._ordered_classes()):
+                owners[index] += social_class.real_resources
+                population[index] += social_class.population
+            owners[-1] += province.government.real_resources
+        return [tuple(owner.values()) for owner in owners], tuple(population)
+
+    def _get_month_data(self, old_resources: Sequence[Sequence[float]],
+                        old_population: Sequence[float]) -> Month_Data:
+        """
+        Creates the record of data of the whole country from the month that
+        has just ended. Growth modifiers are set if they are set in any
+        province; wages are averages weighted by employees and happiness is
+        an average weighted by population.
+        """
+        # Data after the month is gathered the same way as before it
+        resources, population = self._get_old_data()
+        modifiers = [[False] * len(GROWTH_MODIFIERS) for _ in Class_Name]
+        employees = [0.0] * (len(Class_Name) + 1)
+        paid = [0.0] * (len(Class_Name) + 1)
+        happiness = [0.0] * len(Class_Name)
+        governments = [self.government, *(
+            province.government for province in self._provinces
+        )]
+        for province in self._provinces:
+            for index, social_class in enumerate(
+                    province._ordered_classes()):
+                modifiers[index] = [
+                    old or new for old, new in zip(modifiers[index], (
+                        social_class.starving, social_class.freezing,
+                        social_class.demoted_from, social_class.demoted_to,
+                        social_class.promoted_from, social_class.promoted_to
+                    ))
+                ]
+                employees[index] += social_class.employees
+                paid[index] += social_class.employees * social_class.old_wage
+                happiness[index] += \
+                    social_class.happiness * social_class.population
+        for government in governments:
+            employees[-1] += government.employees
+            paid[-1] += government.employees * government.old_wage
+        return Month_Data(
+            tuple(self.prices.values()),
+            resources,
+            old_resources,
+            population,
+            old_population,
+            [tuple(flags) for flags in modifiers],
+            tuple(employees),
+            tuple(
+                wage / number if number > 0 else 0
+                for wage, number in zip(paid, employees)
+            ),
+            tuple(
+                total / number if number > 0 else 0
+                for total, number in zip(happiness, population)
+            )
+        )
+
+    def do_month(self, report: bool = True) -> Month_Data | None:
+        """
+        Does the month in all provinces (see do_provinces_month) with the
+        country's executor and returns data of the whole country from it,
+        unless report is False - then None is returned.
+        """
+        if not report:
+            self.do_provinces_month(self.executor, self.workers)
+            return None
+        old_resources, old_population = self._get_old_data()
+        self.do_provinces_month(self.executor, self.workers)
+        return self._get_month_data(old_resources, old_population)
+
+    def do_provinces_month(self, executor: Executor | None = None,
+                           workers: int = 1) -> list[Month_Data]:
+        """
+        Does all the needed calculations and changes to end the month and move
+        on to the next. Returns data from the month, one for each province.
+        If an executor (e.g. a ProcessPoolExecutor) with the given number of
+        workers is given, local phases of the month are done by it, split
+        into one shard per worker. If globals.memory is set, memory allocated
+        by the phases of the month is measured.
+        """
+        memory = globals.memory
+        if memory is not None:
+            memory.start()
+        if globals.debug:
+            globals.trace.record(Trace_Event(
+                Trace_Phase.month, quantity=len(self._provinces),
+                date=(self.month, self.year)
+            ))
+
+        # Check whether there is any point in calculating the month
+        self._check_game_over()
+
+        # Save old data to calculate the changes
+        old_data = [
+            province._get_old_data() for province in self._provinces
+        ]
+
+        # local phases - growth, production, consumption, demotions,
+        # starvation, taxes and promotions
+        self._share_laws()
+        self._do_local_months(executor, workers)
+
+        # national consumption, collecting taxes and crime
+        self.government.consume()
+        self._remit_provincial_resources()
+        self._do_crime()
+        for province in self._provinces:
+            province._do_demotions()
+        self._secure_classes()
+        if memory is not None:
+            memory.mark(Memory_Phase.consumption)
+
+        # trade
+        self.market.do_trade()
+        self.prices = self.market.prices
+        for province in self._provinces:
+            province.prices = self.prices.copy()
+        if memory is not None:
+            memory.mark(Memory_Phase.trade)
+
+        # calculations done - advance to the next month
+        self._secure_classes()
+        self._advance_month()
+        for province in self._provinces:
+            province._advance_month()
+
+        # Check for game over
+        self._check_game_over()
+        if memory is not None:
+            memory.mark(Memory_Phase.advance)
+
+        month_data = [
+            province._get_month_data(old_resources, old_population)
+            for province, (old_resources, old_population)
+            in zip(self._provinces, old_data)
+        ]
+        if memory is not None:
+            memory.mark(Memory_Phase.report)
+        return month_data
+
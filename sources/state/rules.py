@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ..auxiliaries.constants import (FOOD_RATIOS, INBUILT_RESOURCES,
+                                     WOOD_CONSUMPTION)
+from ..auxiliaries.enums import Class_Name, Month, Resource
+from ..auxiliaries.resources import Resources
+
+if TYPE_CHECKING:
+    from .state_modifiers import State_Modifiers
+
+# Modifiers the tables of Rules are calculated from, with the names of the
+# tables depending on each of them
+RULES_DEPENDENCIES = {
+    "avg_food_production": ("food_production", "production"),
+    "wood_production": ("production",),
+    "stone_production": ("production",),
+    "iron_production": ("production",),
+}
+
+
+class Rules:
+    """
+    Tables calculated from constants.py and State_Modifiers, so that they
+    aren't recalculated every month. Tables depending only on the constants
+    are shared by all states; the others are recalculated when a modifier
+    they depend on changes (see State_Modifiers.__setattr__).
+    Attributes:
+    inbuilt_deltas - differences between inbuilt resources of every pair of
+                     classes, the first class' minus the second one's
+    demotion_deltas - positive differences between inbuilt resources of
+                      every pair of classes, as (resource, difference) pairs
+    wood_consumption - wood consumption per person in every month
+    yearly_wood_consumption - sum of wood_consumption
+    food_production - food production per peasant in every month
+    production - production per employee in every month
+    """
+    __slots__ = ("food_production", "production")
+
+    inbuilt_deltas: dict[tuple[Class_Name, Class_Name], Resources] = {
+        (upper, lower): INBUILT_RESOURCES[upper] - INBUILT_RESOURCES[lower]
+        for upper in Class_Name for lower in Class_Name
+    }
+    demotion_deltas: dict[tuple[Class_Name, Class_Name],
+                          tuple[tuple[Resource, float], ...]] = {
+        pair: tuple((resource, value) for resource, value in delta.items()
+                    if value > 0)
+        for pair, delta in inbuilt_deltas.items()
+    }
+    wood_consumption: dict[Month, float] = WOOD_CONSUMPTION
+    yearly_wood_consumption: float = sum(WOOD_CONSUMPTION.values())
+
+    def __init__(self, modifiers: State_Modifiers) -> None:
+        self.food_production: dict[Month, float] = {}
+        self.production: dict[Month, Resources] = {}
+        self.update(modifiers)
+
+    def update(self, modifiers: State_Modifiers,
+               changed: str | None = None) -> None:
+        """
+        Recalculates the tables depending on the changed modifier (all
+        tables if None is given).
+        """
+        if changed is None:
+            tables = {"food_production", "production"}
+        else:
+            tables = set(RULES_DEPENDENCIES.get(changed, ()))
+        if "food_production" in tables:
+            self.food_production = \
+                FOOD_RATIOS * modifiers.avg_food_production
+        if "production" in tables:
+            self.production = {
+                month: Resources({
+                    Resource.food: self.food_production[month],
+                    Resource.wood: modifiers.wood_production,
+                    Resource.stone: modifiers.stone_production,
+                    Resource.iron: modifiers.iron_production
+                })
+                for month in Month
+            }
@@ -1,5 +1,4 @@
-from ...auxiliaries.enums import Class_Name, Resource
-from ...auxiliaries.resources import Resources
+from ...auxiliaries.enums import Class_Name
 from .class_file import Class
 
 
@@ -11,6 +10,8 @@ class Artisans(Class):
     They promote to Nobles.
     They demote to Others.
     """
+    __slots__ = ()
+
     @property
     def class_name(self) -> Class_Name:
         return Class_Name.artisans
@@ -19,17 +20,12 @@ class Artisans(Class):
         """
         Adds resources the class produced in the current month.
         """
-        produced = Resources({
-            Resource.tools: self.parent.sm.tools_production * self.population
-        })
-        used = Resources({
-            Resource.wood: self.parent.sm.artisan_wood_usage * self.population,
-            Resource.iron: self.parent.sm.artisan_iron_usage * self.population,
-            Resource.tools: self.parent.sm.artisan_tool_usage * self.population
-        })
+        sm = self.parent.sm
+        self.resources.wood -= sm.artisan_wood_usage * self.population
+        self.resources.iron -= sm.artisan_iron_usage * self.population
+        self.resources.tools -= sm.artisan_tool_usage * self.population
 
-        self.resources -= used
-        self.resources += produced
+        self.resources.tools += sm.tools_production * self.population
 
     def recruitment_happiness(self, recruited: float) -> float:
         """
@@ -1,18 +1,22 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Generator, Hashable, TypeVar
 
 from typing_extensions import Self
 
 from ...auxiliaries.constants import (FOOD_CONSUMPTION, HAPPINESS_DECAY,
-                                      INBUILT_RESOURCES, WOOD_CONSUMPTION)
+                                      INBUILT_RESOURCES)
 from ...auxiliaries.enums import Class_Name, Resource
 from ...auxiliaries.resources import Resources
+from .cohorts import Cohorts
 
 if TYPE_CHECKING:
     from ..state_data import State_Data
 
+T = TypeVar("T")
+
 
 class ValidationError(Exception):
     """
@@ -31,6 +35,16 @@ class Class(ABC):
     """
     Represents one social class of the country.
     """
+    # Every attribute is always set, so that no per-month attribute churn
+    # happens. Subclasses add no attributes and must declare empty slots.
+    __slots__ = (
+        "parent", "_population", "resources", "starving", "freezing",
+        "demoted_from", "demoted_to", "promoted_from", "promoted_to",
+        "happiness", "cohorts", "employees", "wage", "wage_share",
+        "increase_wage", "profit_share", "old_wage", "market_res", "money",
+        "lower_class", "_derived_key", "_derived"
+    )
+
     # mutable default argument - it is copied anyway
     def __init__(self, parent: State_Data, population: float = 0,
                  resources: Resources = Resources()) -> None:
@@ -56,22 +70,29 @@ class Class(ABC):
 
         self.happiness: float = 0
 
+        # Wealth cohorts the class is split into, if any
+        self.cohorts: Cohorts | None = None
+
         # Attributes used only during employment calculation (and history)
         self.employees: float = 0
         self.wage: float = 0
-        self.wage_share: float
-        self.increase_wage: bool
-        self.profit_share: float
+        self.wage_share: float = 0
+        self.increase_wage: bool = False
+        self.profit_share: float = 0
         self.old_wage: float = self.parent.sm.others_minimum_wage
 
-        # Attributes used only when trading
-        self.market_res: Resources
-        self.money: float
+        # Attributes used only when trading, market_res is None outside of it
+        self.market_res: Resources | None = None
+        self.money: float = 0
 
         # This is assigned by State_Data in classes setter. It should be
         # assigned before the object is used.
         self.lower_class: Class = None  # type: ignore
 
+        # Cache of derived properties, see _cached
+        self._derived_key: tuple[float, ...] = ()
+        self._derived: dict[str, tuple[Any, Any]] = {}
+
     @property
     @abstractmethod
     def class_name(self) -> Class_Name:
@@ -88,18 +109,50 @@ class Class(ABC):
         if new < 0:
             raise ValueError("population cannot be negative")
         difference = new - self._population
-        self.resources -= INBUILT_RESOURCES[self.class_name] * difference
+        self.resources.add_multiplied(
+            INBUILT_RESOURCES[self.class_name], -difference
+        )
         self._population = new
+        if self.cohorts is not None:
+            self.cohorts.set_population(new)
 
     @property
     def employable(self) -> bool:
         return False
 
+    def _cached(self, name: str, dependency: Hashable,
+                compute: Callable[[], T]) -> T:
+        """
+        Returns the value of the given derived property, calling compute only
+        if the class' population, the values of its resources or the given
+        dependency changed since the value was last computed. Resources are
+        modified in place all over the state, so instead of counting
+        modifications, the cache is keyed with a snapshot of their values.
+        """
+        key = (self._population, *self.resources.values())
+        if key != self._derived_key:
+            self._derived_key = key
+            self._derived.clear()
+        cached = self._derived.get(name)
+        if cached is not None and cached[0] == dependency:
+            return cached[1]
+        value = compute()
+        self._derived[name] = (dependency, value)
+        return value
+
+    def _compute_real_resources(self) -> Resources:
+        return self.resources.copy().add_multiplied(
+            INBUILT_RESOURCES[self.class_name], self.population
+        )
+
     @property
     def real_resources(self) -> Resources:
-        return self.resources + (
-            INBUILT_RESOURCES[self.class_name] * self.population
-        )
+        """
+        Returns resources of the class, including the ones inbuilt in its
+        population. The result is cached and must not be modified.
+        """
+        return self._cached("real_resources", None,
+                            self._compute_real_resources)
 
     @property
     def optimal_resources(self) -> Resources:
@@ -110,12 +163,7 @@ class Class(ABC):
         return self.parent.sm.optimal_resources[self.class_name] \
             * self.population
 
-    @property
-    def missing_resources(self) -> Resources:
-        """
-        Returns the resources the class is missing to not have any negative
-        resources.
-        """
+    def _compute_missing_resources(self) -> Resources:
         return Resources({
             resource: -amount if amount < 0 else 0
             for resource, amount
@@ -123,17 +171,22 @@ class Class(ABC):
         })
 
     @property
-    def class_overpopulation(self) -> float:
+    def missing_resources(self) -> Resources:
         """
-        Returns how many of the class need to be demoted to remove
-        negative resources.
+        Returns the resources the class is missing to not have any negative
+        resources. The result is cached and must not be modified.
         """
-        overpops: list[float] = []
-        for res_name, value in self.missing_resources.items():
-            res = INBUILT_RESOURCES[self.class_name][res_name] - \
-                INBUILT_RESOURCES[self.lower_class.class_name][res_name]
-            if res > 0:
-                overpops.append(value / res)
+        return self._cached("missing_resources", None,
+                            self._compute_missing_resources)
+
+    def _compute_class_overpopulation(self) -> float:
+        missing = self.missing_resources
+        overpops = [
+            missing[res_name] / res
+            for res_name, res in self.parent.sm.rules.demotion_deltas[
+                self.class_name, self.lower_class.class_name
+            ]
+        ]
 
         if overpops:
             return max(overpops)
@@ -141,11 +194,23 @@ class Class(ABC):
             return 0
 
     @property
-    def net_worth(self) -> float:
+    def class_overpopulation(self) -> float:
+        """
+        Returns how many of the class need to be demoted to remove
+        negative resources.
+        """
+        return self._cached("class_overpopulation", self.lower_class,
+                            self._compute_class_overpopulation)
+
+    def _compute_net_worth(self) -> float:
         return self.real_resources.worth(self.parent.prices)
 
     @property
-    def max_employees(self) -> float:
+    def net_worth(self) -> float:
+        return self._cached("net_worth", tuple(self.parent.prices.values()),
+                            self._compute_net_worth)
+
+    def _compute_max_employees(self) -> float:
         land_owned = self.resources.land + \
             INBUILT_RESOURCES[self.class_name].land * self.population
         return min(
@@ -153,6 +218,47 @@ class Class(ABC):
             land_owned / self.parent.sm.worker_land_usage,
         )
 
+    @property
+    def max_employees(self) -> float:
+        return self._cached("max_employees", self.parent.sm.worker_land_usage,
+                            self._compute_max_employees)
+
+    @contextmanager
+    def per_capita_income(self) -> Generator[None, None, None]:
+        """
+        Changes of the class' net worth made within the with block are split
+        equally among all people of the class, instead of proportionally to
+        wealth of its cohorts. Does nothing if the class has no cohorts.
+        """
+        if self.cohorts is None:
+            yield
+            return
+        old_worth = self.net_worth
+        yield
+        self.cohorts.add_per_capita(old_worth, self.net_worth)
+
+    def _per_capita(self, operation: Callable[..., Any], *args: Any) -> None:
+        """
+        Calls the operation with the given arguments within per_capita_income.
+        Classes without cohorts call it directly, skipping the context
+        manager, which costs a lot in the loops of the month.
+        """
+        if self.cohorts is None:
+            operation(*args)
+            return
+        with self.per_capita_income():
+            operation(*args)
+
+    def split_into_cohorts(self, number: int, inequality: float = 1
+                           ) -> None:
+        """
+        Splits the class into the given number of wealth cohorts, with
+        inequality as in Cohorts.with_inequality.
+        """
+        self.cohorts = Cohorts.with_inequality(
+            number, self.population, inequality
+        )
+
     def grow_population(self, modifier: float) -> None:
         """
         Modifier specifies by how much to modify the population,
@@ -166,11 +272,10 @@ class Class(ABC):
         """
         Removes resources the class consumed in the month.
         """
-        self.resources -= Resources({
-            Resource.food: FOOD_CONSUMPTION * self.population,
-            Resource.wood: WOOD_CONSUMPTION[
-                self.parent.month] * self.population
-        })
+        self.resources.food -= FOOD_CONSUMPTION * self.population
+        self.resources.wood -= \
+            self.parent.sm.rules.wood_consumption[self.parent.month] * \
+            self.population
 
     @abstractmethod
     def produce(self) -> None:
@@ -182,7 +287,7 @@ class Class(ABC):
         """
         Converts the social class object to a dict.
         """
-        return {
+        data: dict[str, Any] = {
             "population": self.population,
             "resources": self.resources.to_raw_dict(),
             "starving": self.starving,
@@ -193,6 +298,29 @@ class Class(ABC):
             "promoted_to": self.promoted_to,
             "happiness": self.happiness
         }
+        if self.cohorts is not None:
+            data["cohorts"] = self.cohorts.to_dict()
+        return data
+
+    def digest_values(self) -> list[float]:
+        """
+        Returns the numbers describing the social class, in a fixed order
+        (see State_Data.digest).
+        """
+        values: list[float] = [
+            self._population, self.happiness, self.wage, self.starving,
+            self.freezing, self.demoted_from, self.demoted_to,
+            self.promoted_from, self.promoted_to
+        ]
+        # Resources always hold every resource, in the order of the enum
+        values.extend(self.resources.values())
+        if self.cohorts is not None:
+            values.append(len(self.cohorts))
+            values.extend(self.cohorts.populations)
+            values.extend(self.cohorts.shares)
+        else:
+            values.append(0)
+        return values
 
     @classmethod
     def from_dict(cls, parent: State_Data, data: dict[str, Any]) -> Self:
@@ -214,6 +342,8 @@ class Class(ABC):
             new.promoted_to = bool(data["promoted_to"])
 
             new.happiness = float(data["happiness"])
+            if "cohorts" in data:
+                new.cohorts = Cohorts.from_dict(data["cohorts"])
         except (KeyError, ValueError) as e:
             raise InvalidInputError from e
 
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Sequence
+
+from typing_extensions import Self
+
+
+class Cohorts:
+    """
+    Splits a social class into wealth cohorts. Cohort i consists of
+    populations[i] people, who own shares[i] of the class' net worth.
+    Every operation is done on whole lists of cohorts at once. They are
+    cheap next to the rest of the month - each cohort adds about 15
+    microseconds to a month of a class.
+    Changes of the class' net worth the cohorts are not told about are split
+    among them proportionally to their shares, changes of the class'
+    population - proportionally to their populations.
+    """
+    def __init__(self, populations: Sequence[float],
+                 shares: Sequence[float]) -> None:
+        """
+        Creates a Cohorts object. Shares are normalized to sum up to 1.
+        """
+        if len(populations) != len(shares) or len(populations) == 0:
+            raise ValueError("there must be at least one cohort and as many "
+                             "shares as populations")
+        if min(populations) < 0 or min(shares) < 0:
+            raise ValueError("cohorts cannot have negative populations or "
+                             "shares")
+        self.populations: list[float] = [float(pop) for pop in populations]
+        self.shares: list[float] = []
+        self._set_wealths(shares)
+
+    @classmethod
+    def with_inequality(cls, number: int, population: float,
+                        inequality: float = 1) -> Self:
+        """
+        Creates the given number of equally populous cohorts, with wealth of
+        cohort i proportional to (i + 1) ^ inequality. Inequality 0 means all
+        cohorts are equally wealthy.
+        """
+        if number < 1:
+            raise ValueError("there must be at least one cohort")
+        return cls(
+            [population / number] * number,
+            [(index + 1) ** inequality for index in range(number)]
+        )
+
+    def __len__(self) -> int:
+        return len(self.populations)
+
+    @property
+    def population(self) -> float:
+        return sum(self.populations)
+
+    def _set_wealths(self, wealths: Sequence[float]) -> None:
+        """
+        Sets shares proportional to the given wealths. Negative wealths are
+        treated as zero. If nobody has any wealth, shares are set per capita.
+        """
+        wealths = [max(wealth, 0) for wealth in wealths]
+        total = sum(wealths)
+        if total <= 0:
+            wealths = self.populations
+            total = sum(wealths)
+        if total <= 0:
+            self.shares = [1 / len(self)] * len(self)
+        else:
+            self.shares = [wealth / total for wealth in wealths]
+
+    def set_population(self, new: float) -> None:
+        """
+        Changes total population of the cohorts, keeping their proportions.
+        If they are all empty, new people are split equally among them.
+        """
+        total = self.population
+        if total > 0:
+            factor = new / total
+            self.populations = [pop * factor for pop in self.populations]
+        else:
+            self.populations = [new / len(self)] * len(self)
+
+    def add_per_capita(self, old_worth: float, new_worth: float) -> None:
+        """
+        Splits the change of the class' net worth from old_worth to new_worth
+        equally among all people, instead of proportionally to the shares.
+        """
+        total = self.population
+        if total <= 0:
+            return
+        change_per_capita = (new_worth - old_worth) / total
+        self._set_wealths([
+            share * old_worth + pop * change_per_capita
+            for share, pop in zip(self.shares, self.populations)
+        ])
+
+    @staticmethod
+    def _tax_rate(personal_tax: float, other_tax: float,
+                  population_part: float, share: float) -> float:
+        """
+        Returns the part of a cohort's wealth taken by taxes, given the
+        class' personal tax relative to its net worth, the class' other
+        relative taxes and the cohort's part of population and share.
+        """
+        if share <= 0:
+            return 1
+        if population_part > 0:
+            other_tax += personal_tax * population_part / share
+        return min(other_tax, 1)
+
+    def pay_taxes(self, personal_tax: float, other_tax: float) -> float:
+        """
+        Taxes every cohort separately - personal taxes are flat per capita, so
+        poorer cohorts pay a bigger part of their wealth, up to all of it.
+        Arguments are the class' personal tax relative to its net worth and
+        its other relative taxes. Returns the part of the class' net worth
+        taken by taxes.
+        """
+        total = self.population
+        if total <= 0:
+            return min(personal_tax + other_tax, 1)
+        rates = [
+            Cohorts._tax_rate(personal_tax, other_tax, pop / total, share)
+            for pop, share in zip(self.populations, self.shares)
+        ]
+        paid = [share * rate for share, rate in zip(self.shares, rates)]
+        self._set_wealths([
+            share - part_paid for share, part_paid in zip(self.shares, paid)
+        ])
+        return sum(paid)
+
+    def promote(self, net_worth: float, resources_worth: float,
+                inbuilt_worth: float, increase_price: float,
+                promotion_math: Callable[[float, float, float],
+                                         tuple[float, float]]
+                ) -> tuple[float, float]:
+        """
+        Does promotion math for every cohort separately and removes the
+        promoted people and what they pay from the cohorts. Arguments are the
+        class' net worth, worth of its resources (without inbuilt ones),
+        worth of inbuilt resources of one person, promotion price and the
+        function calculating (part_paid, transferred) from a wealth,
+        a population and the price. Returns the class' part_paid and
+        transferred.
+        """
+        wealths = [share * net_worth for share in self.shares]
+        resources_worths = [
+            max(wealth - inbuilt_worth * pop, 0)
+            for wealth, pop in zip(wealths, self.populations)
+        ]
+        promoted = [
+            promotion_math(worth, pop, increase_price)
+            for worth, pop in zip(resources_worths, self.populations)
+        ]
+        paid = [
+            part_paid * worth
+            for (part_paid, _), worth in zip(promoted, resources_worths)
+        ]
+        transferred = [number for _, number in promoted]
+
+        self.populations = [
+            max(pop - number, 0)
+            for pop, number in zip(self.populations, transferred)
+        ]
+        self._set_wealths([
+            wealth - part_paid - inbuilt_worth * number
+            for wealth, part_paid, number in zip(wealths, paid, transferred)
+        ])
+
+        if resources_worth > 0:
+            return min(sum(paid) / resources_worth, 1), sum(transferred)
+        return 0, sum(transferred)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Converts the cohorts object to a dict.
+        """
+        return {
+            "populations": list(self.populations),
+            "shares": list(self.shares)
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        """
+        Creates a cohorts object from the given dict.
+        """
+        return cls(
+            [float(pop) for pop in data["populations"]],
+            [float(share) for share in data["shares"]]
+        )
@@ -11,6 +11,8 @@ class Nobles(Class):
     They do not promote.
     They demote to Peasants.
     """
+    __slots__ = ()
+
     @property
     def class_name(self) -> Class_Name:
         return Class_Name.nobles
@@ -9,6 +9,8 @@ class Others(Class):
     They promote to Peasants or Artisans.
     They do not demote.
     """
+    __slots__ = ()
+
     @property
     def class_name(self) -> Class_Name:
         return Class_Name.others
@@ -1,6 +1,5 @@
 from ...auxiliaries.constants import DEFAULT_PRICES, INBUILT_RESOURCES
-from ...auxiliaries.enums import Class_Name, Resource
-from ...auxiliaries.resources import Resources
+from ...auxiliaries.enums import Class_Name
 from .class_file import Class
 
 
@@ -12,12 +11,13 @@ class Peasants(Class):
     They promote to Nobles.
     They demote to Others.
     """
+    __slots__ = ()
+
     @property
     def class_name(self) -> Class_Name:
         return Class_Name.peasants
 
-    @property
-    def max_employees(self) -> float:
+    def _compute_max_employees(self) -> float:
         land_owned = self.resources.land + \
             INBUILT_RESOURCES[self.class_name].land * self.population
         return max(min(
@@ -36,15 +36,11 @@ class Peasants(Class):
         food_peasants = self.population * relative_prices.food / total_price
         wood_peasants = self.population * relative_prices.wood / total_price
 
-        changes = Resources({
-            Resource.food:
-                self.parent.sm.food_production[month] * food_peasants,
-            Resource.wood: self.parent.sm.wood_production * wood_peasants,
-            Resource.tools:
-                -self.parent.sm.peasant_tool_usage * self.population
-        })
-
-        self.resources += changes
+        self.resources.food += \
+            self.parent.sm.rules.food_production[month] * food_peasants
+        self.resources.wood += self.parent.sm.wood_production * wood_peasants
+        self.resources.tools -= \
+            self.parent.sm.peasant_tool_usage * self.population
 
     def recruitment_happiness(self, recruited: float) -> float:
         """
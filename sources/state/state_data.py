@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from math import inf
+from statistics import fmean
+from typing import Sequence
 
 from typing_extensions import Self
 
@@ -22,6 +24,55 @@ class InvalidCommandError(ValueError):
     """
 
 
+class Fight_Estimate:
+    """
+    Distribution of outcomes of a fight, estimated from samples of the enemy.
+    Properties:
+    ally_losses - sorted sampled losses of the government's army, as
+    fractions of the beginning army
+    enemy_losses - sorted sampled losses of the enemy, as above
+    profits - sorted sampled profits, meaning the same as in do_fight
+    victory_chance - part of the samples in which the fight was won
+    """
+    def __init__(self, outcomes: Sequence[tuple[float, float, float]]
+                 ) -> None:
+        if not outcomes:
+            raise ValueError("a fight estimate needs at least one sample")
+        self.ally_losses: list[float] = \
+            sorted(outcome[0] for outcome in outcomes)
+        self.enemy_losses: list[float] = \
+            sorted(outcome[1] for outcome in outcomes)
+        self.profits: list[float] = \
+            sorted(outcome[2] for outcome in outcomes)
+        self.victory_chance: float = fmean(
+            ally_losses < enemy_losses
+            for ally_losses, enemy_losses, _ in outcomes
+        )
+
+    @staticmethod
+    def quantile(values: Sequence[float], part: float) -> float:
+        """
+        Returns the value below which the given part of the sorted values
+        lies.
+        """
+        # The small addition protects from rounding errors like 0.05 * 100
+        index = min(int(part * len(values) + 1e-9), len(values) - 1)
+        return values[max(index, 0)]
+
+    @staticmethod
+    def summary(values: Sequence[float], width: float = 0.9
+                ) -> tuple[float, float, float]:
+        """
+        Returns tuple (low, mean, high) for the sorted values, where low and
+        high bound the central interval containing the given part of them.
+        """
+        return (
+            Fight_Estimate.quantile(values, (1 - width) / 2),
+            fmean(values),
+            Fight_Estimate.quantile(values, (1 + width) / 2)
+        )
+
+
 class State_Data(State_Data_Base_And_Do_Month):
     """
     Represents the data of an entire state, including all its classes.
@@ -47,6 +98,17 @@ class State_Data(State_Data_Base_And_Do_Month):
         state.government = Government(state)
         return state
 
+    def split_into_cohorts(self, number: int, inequality: float = 1
+                           ) -> None:
+        """
+        Splits all social classes into the given number of wealth cohorts, with
+        inequality as in Cohorts.with_inequality. Production, consumption,
+        wages, taxes and promotions are then calculated for every cohort
+        separately.
+        """
+        for social_class in self:
+            social_class.split_into_cohorts(number, inequality)
+
     def demote_now(self):
         """
         Does demotions and security. Used if other parts of command are
@@ -110,13 +172,11 @@ class State_Data(State_Data_Base_And_Do_Month):
                 self.sm.others_minimum_wage = value
             elif law == "wage_government":
                 self.government.wage = value
-                try:
-                    del self.government.old_wage
-                except AttributeError:
-                    pass
+                self.government.old_wage = None
             elif law == "wage_autoregulation":
                 self.government.wage_autoregulation = bool(value)
-                self.government.wage = self.government.old_wage
+                if self.government.old_wage is not None:
+                    self.government.wage = self.government.old_wage
 
             elif law == "max_prices":
                 assert argument is not None
@@ -190,65 +250,91 @@ class State_Data(State_Data_Base_And_Do_Month):
         # Enemy losses function is the same, but the argument is reversed (1/x)
         return 1 / (a * x + 1), 1 / (div(a, x) + 1)
 
-    def do_fight(self, target: str, enemies: float | None = None
-                 ) -> tuple[bool, Soldiers, float]:
+    @staticmethod
+    def _get_fight_outcome(target: str, ally_strength: float,
+                           enemies: float | None, enemies_strength: float
+                           ) -> tuple[float, float, float]:
         """
-        Executes an attack against the given target.
-        Return is a 3-tuple: (victory?, dead_soldiers, profits)
-        Meaning of profits float depends on the target:
-            crime - profits is number of dead brigands
-            conquest - profits is amount of land conquered
-            plunder - profits is amount of resources (except land) gained
+        Calculates the outcome of an attack of an army of the given strength
+        against the given target, without changing anything.
+        Return is a 3-tuple: (ally_losses, enemy_losses, profits)
+        Losses are as in _get_battle_losses, profits as in do_fight.
+        For crime, enemies and enemies_strength are the number and strength
+        of brigands. Otherwise enemies_strength is ignored.
         """
-        ally_strength = self.government.soldiers.strength
         if target == "crime":
-            enemy_strength = self.brigands * self.brigands_strength
+            enemies = enemies if enemies is not None else 0
+            enemy_strength = enemies * enemies_strength
             ratio = ally_strength / enemy_strength \
                 if enemy_strength > 0 else inf
-            ally_losses, enemy_losses = self._get_battle_losses(ratio)
+            ally_losses, enemy_losses = \
+                State_Data._get_battle_losses(ratio)
+            return ally_losses, enemy_losses, enemies * enemy_losses
 
-            dead_soldiers = self.government.soldiers * ally_losses
-            self.government.soldiers *= (1 - ally_losses)
-            dead_brigands = self.brigands * enemy_losses
-            self.brigands *= (1 - enemy_losses)
-
-            return ally_losses < enemy_losses, dead_soldiers, dead_brigands
-
-        elif target == "conquest":
+        elif target in ("conquest", "plunder"):
             if enemies is None:
                 raise InvalidCommandError(
-                    "do_fight conquest enemies argument is None"
+                    f"do_fight {target} enemies argument is None"
                 )
             ratio = ally_strength / enemies
-            ally_losses, enemy_losses = self._get_battle_losses(ratio)
-
-            dead_soldiers = self.government.soldiers * ally_losses
-            self.government.soldiers *= (1 - ally_losses)
-            gains = Resources()
-            if enemy_losses > ally_losses:
-                gains.land = enemy_losses * PLUNDER_FACTOR
-            self.government.resources += gains
+            ally_losses, enemy_losses = State_Data._get_battle_losses(ratio)
+            if target == "plunder" or enemy_losses > ally_losses:
+                profits = enemy_losses * PLUNDER_FACTOR
+            else:
+                profits = 0
+            return ally_losses, enemy_losses, profits
 
-            return ally_losses < enemy_losses, dead_soldiers, gains.land
+        else:
+            raise InvalidCommandError("do_fight target argument invalid")
 
-        elif target == "plunder":
-            if enemies is None:
-                raise InvalidCommandError(
-                    "do_fight plunder enemies argument is None"
-                )
-            ratio = ally_strength / enemies
-            ally_losses, enemy_losses = self._get_battle_losses(ratio)
+    def estimate_fight(self, target: str, enemies: Sequence[float],
+                       enemies_strengths: Sequence[float] | None = None
+                       ) -> Fight_Estimate:
+        """
+        Estimates outcomes of an attack against the given target, for each of
+        the given enemy samples, without changing anything. For crime,
+        enemies_strengths are the sampled brigands' strengths (by default all
+        equal the state's brigands strength).
+        """
+        ally_strength = self.government.soldiers.strength
+        if enemies_strengths is None:
+            enemies_strengths = [self.brigands_strength] * len(enemies)
+        return Fight_Estimate([
+            State_Data._get_fight_outcome(
+                target, ally_strength, number, strength
+            )
+            for number, strength in zip(enemies, enemies_strengths)
+        ])
 
-            dead_soldiers = self.government.soldiers * ally_losses
-            self.government.soldiers *= (1 - ally_losses)
-            gains = Resources(enemy_losses * PLUNDER_FACTOR)
+    def do_fight(self, target: str, enemies: float | None = None
+                 ) -> tuple[bool, Soldiers, float]:
+        """
+        Executes an attack against the given target.
+        Return is a 3-tuple: (victory?, dead_soldiers, profits)
+        Meaning of profits float depends on the target:
+            crime - profits is number of dead brigands
+            conquest - profits is amount of land conquered
+            plunder - profits is amount of resources (except land) gained
+        """
+        if target == "crime":
+            enemies = self.brigands
+        ally_losses, enemy_losses, profits = State_Data._get_fight_outcome(
+            target, self.government.soldiers.strength, enemies,
+            self.brigands_strength
+        )
+
+        dead_soldiers = self.government.soldiers * ally_losses
+        self.government.soldiers *= (1 - ally_losses)
+        if target == "crime":
+            self.brigands *= (1 - enemy_losses)
+        elif target == "conquest":
+            self.government.resources.land += profits
+        else:
+            gains = Resources(profits)
             del gains[Resource.land]
             self.government.resources += gains
 
-            return ally_losses < enemy_losses, dead_soldiers, gains.food
-
-        else:
-            raise InvalidCommandError("do_fight target argument invalid")
+        return ally_losses < enemy_losses, dead_soldiers, profits
 
     def execute_commands(self, commands: list[str]):
         """
@@ -265,13 +351,15 @@ class State_Data(State_Data_Base_And_Do_Month):
                 amount = int(command[1])
                 for _ in range(amount):
                     self.do_month()
+            elif command[0] == "skip":
+                self.skip_months(int(command[1]))
             elif command[0] == "transfer":
                 self.do_transfer(Class_Name[command[1]], Resource[command[2]],
                                  float(command[3]))
             elif command[0] == "secure":
-                self.do_secure(Resource[command[1]], int(command[2]))
+                self.do_secure(Resource[command[1]], float(command[2]))
             elif command[0] == "optimal":
-                self.do_optimal(Resource[command[1]], int(command[2]))
+                self.do_optimal(Resource[command[1]], float(command[2]))
             elif command[0] == "laws" and command[1] == "set":
                 self.do_set_law(
                     command[2], command[3] if command[3] != "None" else None,
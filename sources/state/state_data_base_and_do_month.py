@@ -2,20 +2,23 @@ from __future__ import annotations
 
 from abc import abstractmethod
 from math import inf, isinf, log
-from typing import (TYPE_CHECKING, Any, Generator, Mapping, Protocol, Sequence,
-                    TypedDict)
+from typing import (TYPE_CHECKING, Any, Generator, Literal, Mapping,
+                    Protocol, Sequence, overload)
 
 from ..auxiliaries.arithmetic_dict import Arithmetic_Dict
+from ..auxiliaries.digest import DIGEST_BITS, digest
 from ..auxiliaries.constants import (BRIGAND_STRENGTH_CLASS,
                                      BRIGAND_STRENGTH_SOLDIER, DEFAULT_PRICES,
                                      FOOD_CONSUMPTION, INBUILT_RESOURCES,
-                                     REBELLION_THRESHOLD, WAGE_CHANGE,
-                                     WOOD_CONSUMPTION)
+                                     REBELLION_THRESHOLD, WAGE_CHANGE)
 from ..auxiliaries.enums import Class_Name, Month, Resource
 from ..auxiliaries import globals
+from ..auxiliaries.memory import Memory_Phase
 from ..auxiliaries.resources import Resources
+from ..auxiliaries.trace import Trace_Event, Trace_Phase
 from .government import Government
 from .market import Market, SupportsTrade
+from .month_data import Month_Data
 from .social_classes.artisans import Artisans
 from .social_classes.class_file import Class
 from .social_classes.nobles import Nobles
@@ -95,18 +98,6 @@ class Employer(Protocol):
         """
 
 
-class Month_Data(TypedDict):
-    prices: dict[str, float]
-    resources_after: dict[str, dict[str, float]]
-    population_after: dict[str, float]
-    change_resources: dict[str, dict[str, float]]
-    change_population: dict[str, float]
-    growth_modifiers: dict[str, dict[str, bool]]
-    employees: dict[str, float]
-    wages: dict[str, float]
-    happiness: dict[str, float]
-
-
 class State_Data_Base_And_Do_Month:
     def __init__(self, starting_month: Month = Month.January,
                  starting_year: int = 0) -> None:
@@ -290,19 +281,52 @@ class State_Data_Base_And_Do_Month:
         Calculates how much resources will be produced and used as a result of
         this month's employment. Returns tuple: (produced, used)
         """
-        per_capita = Resources({
-            Resource.food: self.sm.food_production[self.month],
-            Resource.wood: self.sm.wood_production,
-            Resource.stone: self.sm.stone_production,
-            Resource.iron: self.sm.iron_production
-        })
-
+        per_capita = self.sm.rules.production[self.month]
         produced = per_capita * ratioed_employees
         used = Resources()
         used.tools = self._get_tools_used(ratioed_employees)
 
         return produced, used
 
+    @staticmethod
+    def _split_employees(employers_classes: Sequence[Employer],
+                         employees: float) -> dict[Employer, float]:
+        """
+        Splits the employees among the employers proportionally to their
+        wages, with no employer given more than its max employees - the
+        surplus goes to the remaining employers, again proportionally to their
+        wages. Done in one pass over the employers sorted by the level at
+        which they become saturated (water-filling).
+        """
+        max_employees = {
+            employer: employer.max_employees
+            for employer in employers_classes
+        }
+
+        def saturation_level(employer: Employer) -> float:
+            if employer.wage > 0:
+                return max_employees[employer] / employer.wage
+            return inf
+
+        by_saturation = sorted(employers_classes, key=saturation_level)
+        remaining_wages = sum(employer.wage for employer in by_saturation)
+
+        split: dict[Employer, float] = {}
+        for index, employer in enumerate(by_saturation):
+            if abs(remaining_wages) <= 1e-10:
+                break
+            if employees * employer.wage / remaining_wages \
+                    <= max_employees[employer]:
+                # Nobody further in the order becomes saturated either
+                for unsaturated in by_saturation[index:]:
+                    split[unsaturated] = \
+                        unsaturated.wage / remaining_wages * employees
+                break
+            split[employer] = max_employees[employer]
+            employees -= max_employees[employer]
+            remaining_wages -= employer.wage
+        return split
+
     @staticmethod
     def _set_employers_employees(employers_classes: Sequence[Employer],
                                  employees: float, emp_ratio: float) -> None:
@@ -310,27 +334,11 @@ class State_Data_Base_And_Do_Month:
         Decides what part of produced and used resources will each employer
         class be given.
         """
-        wages = Arithmetic_Dict({social_class: social_class.wage
-                                 for social_class
-                                 in employers_classes})
-        ratios = wages.calculate_ratios()
-        State_Data_Base_And_Do_Month._add_employees(ratios * employees)
-
-        checked = 0
-        while checked < len(employers_classes):
-            checked = 0
-            for social_class in employers_classes:
-                if social_class.employees > social_class.max_employees:
-                    employees = \
-                        social_class.employees - social_class.max_employees
-                    social_class.employees = social_class.max_employees
-                    del wages[social_class]
-                    ratios = wages.calculate_ratios()
-                    State_Data_Base_And_Do_Month._add_employees(
-                        ratios * employees
-                    )
-                else:
-                    checked += 1
+        State_Data_Base_And_Do_Month._add_employees(
+            State_Data_Base_And_Do_Month._split_employees(
+                employers_classes, employees
+            )
+        )
 
         for employer in employers_classes:
             if employer.employees < emp_ratio * employer.max_employees:
@@ -377,11 +385,12 @@ class State_Data_Base_And_Do_Month:
             employer.resources += share
             total_employers_share += share
 
-            employer.resources -= used * employer.profit_share
+            employer.resources.add_multiplied(used, -employer.profit_share)
 
         produced -= total_employers_share
         for employee in employees_classes:
-            employee.resources += produced * employee.wage_share
+            employee._per_capita(employee.resources.add_multiplied,
+                                 produced, employee.wage_share)
 
     def _set_new_wages(self, employers_classes: Sequence[Employer]) -> None:
         """
@@ -441,6 +450,14 @@ class State_Data_Base_And_Do_Month:
         if self.month == Month.January:
             self.year += 1
 
+    def skip_months(self, amount: int) -> None:
+        """
+        Advances month (and year) by the given amount without calculating
+        anything - for states which do not change over the skipped months.
+        """
+        for _ in range(amount):
+            self._advance_month()
+
     def _create_market(self) -> None:
         """
         Creates a market for the object. Needs classes and government to be
@@ -511,6 +528,16 @@ class State_Data_Base_And_Do_Month:
                 data["laws"]["max_prices"]
             )
 
+        if "runtime" in data:
+            runtime = data["runtime"]
+            state.brigands = float(runtime["brigands"])
+            state.brigands_strength = float(runtime["brigands_strength"])
+            for name, wage in runtime["wages"].items():
+                state.classes[Class_Name[name]].wage = float(wage)
+            if runtime["market"] is not None:
+                state.market.old_avail_res = \
+                    Resources.from_raw_dict(runtime["market"])
+
         return state
 
     def to_dict(self) -> dict[str, Any]:
@@ -547,10 +574,46 @@ class State_Data_Base_And_Do_Month:
                 },
                 "wage_minimum": self.sm.others_minimum_wage,
                 "max_prices": self.sm.max_prices.to_raw_dict(),
+            },
+            # Data which is not set by the player, but affects next months
+            "runtime": {
+                "brigands": self.brigands,
+                "brigands_strength": self.brigands_strength,
+                "wages": {
+                    class_name.name: social_class.wage
+                    for class_name, social_class in self.classes.items()
+                },
+                "market": self.market.old_avail_res.to_raw_dict()
+                if self.market.old_avail_res is not None else None
             }
         }
         return data
 
+    def digest(self, bits: int = DIGEST_BITS) -> str:
+        """
+        Returns a canonical digest of the state - of its date, classes,
+        government, prices, brigands, modifiers and the market's memory of
+        the last trade, with numbers rounded to the given number of
+        significant binary digits. Equivalent states have equal digests, also
+        in different processes.
+        """
+        return digest(self.digest_values(), bits)
+
+    def digest_values(self, date: bool = True) -> list[float]:
+        """
+        Returns the numbers the digest is made of, in a fixed order - without
+        the year and the month if date is False.
+        """
+        values: list[float] = [self.year, self.month.value] if date else []
+        values += [self._brigands, self._brigands_strength]
+        values.extend(self.prices.values())
+        for social_class in self:
+            values.extend(social_class.digest_values())
+        values.extend(self.government.digest_values())
+        values.extend(self.sm.digest_values())
+        values.extend(self.market.digest_values())
+        return values
+
     def _do_growth(self) -> None:
         """
         Does the natural population growth for all classes.
@@ -560,10 +623,10 @@ class State_Data_Base_And_Do_Month:
             old_pop = social_class.population
             social_class.grow_population(factor)
             if globals.debug:
-                globals.warning_out.write(
-                    f"Grown {social_class.population - old_pop} "
-                    f"{social_class.class_name.name}"
-                )
+                globals.trace.record(Trace_Event(
+                    Trace_Phase.growth, social_class.class_name,
+                    social_class.population - old_pop
+                ))
 
     def _do_starvation(self) -> None:
         """
@@ -588,7 +651,7 @@ class State_Data_Base_And_Do_Month:
             freezing_number = 0
             if missing_wood > 0:
                 freezing_number = self.sm.freezing_mortality * missing_wood \
-                    / WOOD_CONSUMPTION[self.month]
+                    / self.sm.rules.wood_consumption[self.month]
 
                 social_class.resources.wood = 0
                 social_class.freezing = True
@@ -605,10 +668,10 @@ class State_Data_Base_And_Do_Month:
                 social_class.happiness = 0
 
             if globals.debug:
-                globals.warning_out.write(
-                    f"Starved {old_pop - social_class.population} "
-                    f"{social_class.class_name.name}"
-                )
+                globals.trace.record(Trace_Event(
+                    Trace_Phase.starvation, social_class.class_name,
+                    old_pop - social_class.population
+                ))
 
     def _reset_flags(self) -> None:
         """
@@ -646,9 +709,9 @@ class State_Data_Base_And_Do_Month:
                 lower_class.demoted_to = True
 
             if globals.debug:
-                globals.warning_out.write(
-                    f"Demoted {moved_pop} {social_class.class_name.name}"
-                )
+                globals.trace.record(Trace_Event(
+                    Trace_Phase.demotion, social_class.class_name, moved_pop
+                ))
 
     def _secure_classes(self) -> None:
         """
@@ -688,20 +751,35 @@ class State_Data_Base_And_Do_Month:
 
         return part_paid, transferred
 
+    def _get_promotion(self, class_from: Class, increase_price: float
+                       ) -> tuple[float, float]:
+        """
+        Returns tuple (part_paid, transferred) for a promotion from the given
+        class, as in _promotion_math. Classes split into cohorts are promoted
+        cohort by cohort, and promoted people are removed from the cohorts.
+        """
+        from_wealth = class_from.resources.worth(self.prices)
+        if class_from.cohorts is None:
+            return State_Data_Base_And_Do_Month._promotion_math(
+                from_wealth, class_from.population, increase_price
+            )
+        return class_from.cohorts.promote(
+            class_from.net_worth, from_wealth,
+            INBUILT_RESOURCES[class_from.class_name].worth(self.prices),
+            increase_price, State_Data_Base_And_Do_Month._promotion_math
+        )
+
     def _do_one_promotion(
         self, class_from: Class, class_to: Class, increase_price: float
     ) -> None:
         """
         Does one promotion on the given classes.
         """
-        from_wealth = class_from.resources.worth(self.prices)
         part_paid, transferred = \
-            State_Data_Base_And_Do_Month._promotion_math(
-                from_wealth, class_from.population, increase_price
-            )
+            self._get_promotion(class_from, increase_price)
 
-        class_to.resources += class_from.resources * part_paid
-        class_from.resources -= class_from.resources * part_paid
+        class_to.resources.add_multiplied(class_from.resources, part_paid)
+        class_from.resources.add_multiplied(class_from.resources, -part_paid)
 
         class_to.population += transferred
         class_from.population -= transferred
@@ -711,10 +789,10 @@ class State_Data_Base_And_Do_Month:
             class_to.promoted_to = True
 
         if globals.debug:
-            globals.warning_out.write(
-                f"Promoted {transferred} {class_from.class_name.name} to "
-                f"{class_to.class_name.name}"
-            )
+            globals.trace.record(Trace_Event(
+                Trace_Phase.promotion, class_from.class_name, transferred,
+                (class_to.class_name,)
+            ))
 
     def _do_double_promotion(
         self, class_from: Class, class_to_1: Class, increase_price_1: float,
@@ -724,22 +802,18 @@ class State_Data_Base_And_Do_Month:
         Does one promotion on the given classes. Same number of people is
         promoted into both of the destination classes.
         """
-        from_wealth = sum((class_from.resources * self.prices).values())
-
         summed_price = (increase_price_1 + increase_price_2)
         increase_price = summed_price / 2
 
         part_paid, transferred = \
-            State_Data_Base_And_Do_Month._promotion_math(
-                from_wealth, class_from.population, increase_price
-            )
+            self._get_promotion(class_from, increase_price)
 
         part_paid_1 = part_paid * increase_price_1 / summed_price
         part_paid_2 = part_paid * increase_price_2 / summed_price
 
-        class_to_1.resources += class_from.resources * part_paid_1
-        class_to_2.resources += class_from.resources * part_paid_2
-        class_from.resources -= class_from.resources * part_paid
+        class_to_1.resources.add_multiplied(class_from.resources, part_paid_1)
+        class_to_2.resources.add_multiplied(class_from.resources, part_paid_2)
+        class_from.resources.add_multiplied(class_from.resources, -part_paid)
 
         class_to_1.population += transferred / 2
         class_to_2.population += transferred / 2
@@ -751,26 +825,28 @@ class State_Data_Base_And_Do_Month:
             class_to_2.promoted_to = True
 
         if globals.debug:
-            globals.warning_out.write(
-                f"Double promoted {transferred} {class_from.class_name.name}"
-                f" to {class_to_1.class_name.name} and "
-                f"{class_to_2.class_name.name}"
-            )
+            globals.trace.record(Trace_Event(
+                Trace_Phase.double_promotion, class_from.class_name,
+                transferred, (class_to_1.class_name, class_to_2.class_name)
+            ))
 
     def _do_promotions(self) -> None:
         """
         Does all the promotions of one month end.
         """
 
+        deltas = self.sm.rules.inbuilt_deltas
         if self.others.population > 0:
             if not (self.others.starving or self.others.freezing):
                 # Peasants and artisans (from others):
                 increase_price_pes = self.sm.increase_price_factor * \
-                    (INBUILT_RESOURCES[Class_Name.peasants]
-                     - INBUILT_RESOURCES[Class_Name.others]).worth(self.prices)
+                    deltas[Class_Name.peasants, Class_Name.others].worth(
+                        self.prices
+                    )
                 increase_price_art = self.sm.increase_price_factor * \
-                    (INBUILT_RESOURCES[Class_Name.artisans]
-                     - INBUILT_RESOURCES[Class_Name.others]).worth(self.prices)
+                    deltas[Class_Name.artisans, Class_Name.others].worth(
+                        self.prices
+                    )
                 self._do_double_promotion(
                     self.others, self.peasants, increase_price_pes,
                     self.artisans, increase_price_art
@@ -781,11 +857,13 @@ class State_Data_Base_And_Do_Month:
                 self.get_available_employees():
             # Increase prices for nobles
             increase_price_pes_to_n = self.sm.increase_price_factor * \
-                (INBUILT_RESOURCES[Class_Name.nobles]
-                 - INBUILT_RESOURCES[Class_Name.peasants]).worth(self.prices)
+                deltas[Class_Name.nobles, Class_Name.peasants].worth(
+                    self.prices
+                )
             increase_price_art_to_n = self.sm.increase_price_factor * \
-                (INBUILT_RESOURCES[Class_Name.nobles]
-                 - INBUILT_RESOURCES[Class_Name.artisans]).worth(self.prices)
+                deltas[Class_Name.nobles, Class_Name.artisans].worth(
+                    self.prices
+                )
 
             if self.peasants.population > 0:
                 if not (self.peasants.starving or self.peasants.freezing):
@@ -848,9 +926,10 @@ class State_Data_Base_And_Do_Month:
         })
         net_worths_change = net_worths - old_net_worths
 
-        rel_taxes = self._get_personal_taxes(populations, net_worths)
-        rel_taxes += self._get_property_taxes()
-        rel_taxes += self._get_income_taxes(net_worths_change, net_worths)
+        personal_taxes = self._get_personal_taxes(populations, net_worths)
+        property_taxes = self._get_property_taxes()
+        income_taxes = self._get_income_taxes(net_worths_change, net_worths)
+        rel_taxes = personal_taxes + property_taxes + income_taxes
 
         rel_taxes = {
             class_name: min(tax, 1)
@@ -858,8 +937,13 @@ class State_Data_Base_And_Do_Month:
             in rel_taxes.items()
         }
         for social_class in self:
-            tax: Resources = social_class.real_resources * \
-                rel_taxes[social_class.class_name]
+            name = social_class.class_name
+            if social_class.cohorts is not None:
+                rel_taxes[name] = social_class.cohorts.pay_taxes(
+                    personal_taxes[name],
+                    property_taxes[name] + income_taxes[name]
+                )
+            tax: Resources = social_class.real_resources * rel_taxes[name]
             self.government.resources += tax
             social_class.resources -= tax
 
@@ -971,64 +1055,120 @@ class State_Data_Base_And_Do_Month:
             if social_class.happiness < REBELLION_THRESHOLD:
                 raise RebellionError(social_class.class_name)
 
-    def do_month(self) -> Month_Data:
+    @overload
+    def do_month(self, report: Literal[True] = True) -> Month_Data:
+        ...
+
+    @overload
+    def do_month(self, report: bool) -> Month_Data | None:
+        ...
+
+    def do_month(self, report: bool = True) -> Month_Data | None:
         """
         Does all the needed calculations and changes to end the month and move
-        on to the next. Returns a dict with data from the month.
-        """
+        on to the next. Returns data from the month (see Month_Data), unless
+        report is False - then the data isn't gathered and None is returned.
+        If globals.memory is set, memory allocated by the phases of the month
+        is measured.
+        """
+        memory = globals.memory
+        if memory is not None:
+            memory.start()
         if globals.debug:
-            globals.warning_out.write(
-                f"Ending month {self.month.name} {self.year}"
-            )
+            globals.trace.record(Trace_Event(
+                Trace_Phase.month, date=(self.month, self.year)
+            ))
 
         # Check whether there is any point in calculating the month
         self._check_game_over()
 
         # Save old data to calculate the changes
-        old_resources = {
-            class_name.name: self.classes[class_name].real_resources
-            for class_name in Class_Name
-        }
-        old_resources["government"] = self.government.real_resources
+        if report:
+            old_resources, old_population = self._get_old_data()
 
-        old_population = {
-            class_name.name: self.classes[class_name].population
-            for class_name in Class_Name
-        }
+        self._do_local_phases()
+
+        # trade
+        self.market.do_trade()
+        self.prices = self.market.prices
+        if memory is not None:
+            memory.mark(Memory_Phase.trade)
+
+        # calculations done - advance to the next month
+        self._secure_classes()
+        self._advance_month()
+
+        # Check for game over
+        self._check_game_over()
+        if memory is not None:
+            memory.mark(Memory_Phase.advance)
+
+        if not report:
+            return None
+        month_data = self._get_month_data(old_resources, old_population)
+        if memory is not None:
+            memory.mark(Memory_Phase.report)
+        return month_data
 
+    def _do_local_phases(self, national: bool = True) -> None:
+        """
+        Does the phases of the month concerning the social classes of the
+        state: happiness decay, growth, production, consumption, demotions,
+        starvation, taxes and promotions. If national is False (the state is
+        a province of a country), the government's consumption and crime are
+        left to the country.
+        """
+        memory = globals.memory
         old_net_worths = Arithmetic_Dict({
             class_name: self.classes[class_name].population
             for class_name in Class_Name
         })
+        if memory is not None:
+            memory.mark(Memory_Phase.preparation)
 
         # decay happiness
         for social_class in self:
             social_class.decay_happiness()
+        if memory is not None:
+            memory.mark(Memory_Phase.happiness)
 
         # growth - resources might become negative
         self._do_growth()
+        if memory is not None:
+            memory.mark(Memory_Phase.growth)
 
-        # production
+        # production - classes split into cohorts share it per capita
         for social_class in self:
-            social_class.produce()
+            social_class._per_capita(social_class.produce)
         self._employ()
+        if memory is not None:
+            memory.mark(Memory_Phase.production)
 
         # consumption (and crime)
         for social_class in self:
-            social_class.consume()
-        self.government.consume()
-        self._do_crime()
+            social_class._per_capita(social_class.consume)
+        if national:
+            self.government.consume()
+            self._do_crime()
+        if memory is not None:
+            memory.mark(Memory_Phase.consumption)
 
         # demotions - should fix all except food and some wood
         self._reset_flags()
         self._do_demotions()
+        if memory is not None:
+            memory.mark(Memory_Phase.demotions)
 
         # starvation - should fix all remaining resources
         self._do_starvation()
+        if memory is not None:
+            memory.mark(Memory_Phase.starvation)
 
         # taxes
         self._do_taxes(old_net_worths)
         self._do_demotions()
+        if memory is not None:
+            memory.mark(Memory_Phase.taxes)
 
         # security and flushing
         self._secure_classes()
@@ -1036,76 +1176,61 @@ class State_Data_Base_And_Do_Month:
         # promotions
         self._do_promotions()  # Might make resources negative
         self._do_demotions()  # Fix resources again
+        if memory is not None:
+            memory.mark(Memory_Phase.promotions)
 
-        # trade
-        self.market.do_trade()
-        self.prices = self.market.prices
-
-        # calculations done - advance to the next month
-        self._secure_classes()
-        self._advance_month()
-
-        # Check for game over
-        self._check_game_over()
-
-        # Create returned dict
-        res_after = {
-            class_name.name:
-            self.classes[class_name].real_resources.to_raw_dict()
-            for class_name in Class_Name
-        }
-        res_after["government"] = \
-            self.government.real_resources.to_raw_dict()
-
-        pop_after = {
-            class_name.name: self.classes[class_name].population
-            for class_name in Class_Name
-        }
-
-        month_data: Month_Data = {
-            "prices": self.prices.to_raw_dict(),
-            "resources_after": res_after,
-            "population_after": pop_after,
-            "change_resources": {
-                key: dict(Arithmetic_Dict(res_after[key])
-                          - old_resources[key].to_raw_dict())
-                for key
-                in [cls_name.name for cls_name in Class_Name] + ["government"]
-            },
-            "change_population": {
-                key: pop_after[key] - old_population[key]
-                for key
-                in [cls_name.name for cls_name in Class_Name]
-            },
-            "growth_modifiers": {
-                class_name.name: {
-                    "starving": self.classes[class_name].starving,
-                    "freezing": self.classes[class_name].freezing,
-                    "demoted_from": self.classes[class_name].demoted_from,
-                    "demoted_to": self.classes[class_name].demoted_to,
-                    "promoted_from": self.classes[class_name].promoted_from,
-                    "promoted_to": self.classes[class_name].promoted_to
-                }
-                for class_name in Class_Name
-            },
-            "employees": {
-                class_name.name:
-                self.classes[class_name].employees
-                for class_name in Class_Name
-            },
-            "wages": {
-                class_name.name:
-                self.classes[class_name].old_wage
-                for class_name in Class_Name
-            },
-            "happiness": {
-                class_name.name:
-                self.classes[class_name].happiness
-                for class_name in Class_Name
-            }
-        }
-
-        month_data["wages"]["government"] = self.government.old_wage
-        month_data["employees"]["government"] = self.government.employees
+    def _ordered_classes(self) -> list[Class]:
+        """
+        Returns the social classes in Class_Name order.
+        """
+        classes = self.classes
+        return [classes[class_name] for class_name in Class_Name]
 
-        return month_data
+    def _get_old_data(self) -> tuple[list[tuple[float, ...]],
+                                     tuple[float, ...]]:
+        """
+        Returns real resources (of classes and the government) and
+        populations from before the month, needed to calculate the month's
+        changes.
+        """
+        classes = self._ordered_classes()
+        old_resources = [
+            tuple(social_class.real_resources.values())
+            for social_class in classes
+        ]
+        old_resources.append(tuple(self.government.real_resources.values()))
+        old_population = tuple(
+            social_class.population for social_class in classes
+        )
+        return old_resources, old_population
+
+    def _get_month_data(self, old_resources: Sequence[Sequence[float]],
+                        old_population: Sequence[float]) -> Month_Data:
+        """
+        Creates the record of data from the month that has just ended.
+        """
+        classes = self._ordered_classes()
+        government = self.government
+        resources = [
+            tuple(social_class.real_resources.values())
+            for social_class in classes
+        ]
+        resources.append(tuple(government.real_resources.values()))
+        return Month_Data(
+            tuple(self.prices.values()),
+            resources,
+            old_resources,
+            tuple(social_class.population for social_class in classes),
+            old_population,
+            [
+                (social_class.starving, social_class.freezing,
+                 social_class.demoted_from, social_class.demoted_to,
+                 social_class.promoted_from, social_class.promoted_to)
+                for social_class in classes
+            ],
+            (*(social_class.employees for social_class in classes),
+             government.employees),
+            (*(social_class.old_wage for social_class in classes),
+             government.old_wage),
+            tuple(social_class.happiness for social_class in classes)
+        )
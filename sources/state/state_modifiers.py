@@ -1,22 +1,22 @@
 from __future__ import annotations
 
 from copy import deepcopy
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from ..auxiliaries.constants import (ARTISAN_IRON_USAGE, ARTISAN_TOOL_USAGE,
                                      ARTISAN_WOOD_USAGE, AVG_FOOD_PRODUCTION,
                                      DEFAULT_GROWTH_FACTOR, DEFAULT_PRICES,
-                                     FOOD_CONSUMPTION, FOOD_RATIOS,
-                                     FREEZING_MORTALITY, INBUILT_RESOURCES,
-                                     INCREASE_PRICE_FACTOR, IRON_PRODUCTION,
-                                     MAX_PRICES, MINER_TOOL_USAGE, NOBLES_CAP,
+                                     FOOD_CONSUMPTION, FREEZING_MORTALITY,
+                                     INBUILT_RESOURCES, INCREASE_PRICE_FACTOR,
+                                     IRON_PRODUCTION, MAX_PRICES,
+                                     MINER_TOOL_USAGE, NOBLES_CAP,
                                      OTHERS_MINIMUM_WAGE, PEASANT_TOOL_USAGE,
                                      STARVATION_MORTALITY, STONE_PRODUCTION,
                                      TAX_RATES, TOOLS_PRODUCTION,
-                                     WOOD_CONSUMPTION, WOOD_PRODUCTION,
-                                     WORKER_LAND_USAGE)
+                                     WOOD_PRODUCTION, WORKER_LAND_USAGE)
 from ..auxiliaries.enums import Class_Name, Month, Resource
 from ..auxiliaries.resources import Resources
+from .rules import RULES_DEPENDENCIES, Rules
 
 if TYPE_CHECKING:
     from .state_data import State_Data
@@ -27,7 +27,21 @@ class State_Modifiers:
     Stores the modifiers defining how the State works. Can be changed
     mid-game by the player's actions.
     They start out as constants from auxiliaries/constants.py.
+    rules holds tables calculated from the modifiers, updated whenever a
+    modifier they depend on is assigned.
     """
+    # rules must be the last slot - copying and unpickling set the slots in
+    # order, and rules can only be updated once all modifiers are set
+    __slots__ = (
+        "parent", "miner_tool_usage", "iron_production", "stone_production",
+        "others_minimum_wage", "artisan_wood_usage", "artisan_iron_usage",
+        "artisan_tool_usage", "tools_production", "peasant_tool_usage",
+        "avg_food_production", "wood_production", "increase_price_factor",
+        "nobles_cap", "default_growth_factor", "starvation_mortality",
+        "freezing_mortality", "max_prices", "worker_land_usage", "tax_rates",
+        "rules"
+    )
+
     def __init__(self, parent: State_Data) -> None:
         self.parent: State_Data = parent
 
@@ -60,16 +74,45 @@ class State_Modifiers:
 
         self.tax_rates = deepcopy(TAX_RATES)
 
+        self.rules = Rules(self)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in RULES_DEPENDENCIES:
+            rules: Rules | None = getattr(self, "rules", None)
+            if rules is not None:
+                rules.update(self, name)
+
+    def digest_values(self) -> list[float]:
+        """
+        Returns all the modifiers as numbers, in a fixed order (see
+        State_Data.digest).
+        """
+        values: list[float] = []
+        for name in State_Modifiers.__slots__:
+            if name in {"parent", "rules"}:
+                continue
+            value = getattr(self, name)
+            if name == "max_prices":
+                values.extend(value.values())
+            elif name == "tax_rates":
+                # Rates are given for every class, in the order of the enum
+                for tax in sorted(value):
+                    values.extend(value[tax].values())
+            else:
+                values.append(value)
+        return values
+
     @property
     def food_production(self) -> dict[Month, float]:
-        return FOOD_RATIOS * self.avg_food_production
+        return self.rules.food_production
 
     @property
     def optimal_resources(self) -> dict[Class_Name, Resources]:
         return {
             Class_Name.nobles: Resources({
                 Resource.food: 12 * FOOD_CONSUMPTION,
-                Resource.wood: sum(WOOD_CONSUMPTION.values()),
+                Resource.wood: self.rules.yearly_wood_consumption,
                 Resource.stone: 2 * INBUILT_RESOURCES[Class_Name.nobles].stone,
                 Resource.iron: 0,
                 Resource.tools:
@@ -86,7 +129,7 @@ class State_Modifiers:
             }),
             Class_Name.artisans: Resources({
                 Resource.food: 4 * FOOD_CONSUMPTION,
-                Resource.wood: (sum(WOOD_CONSUMPTION.values()) / 3 +
+                Resource.wood: (self.rules.yearly_wood_consumption / 3 +
                                 4 * self.artisan_wood_usage),
                 Resource.stone: 0,
                 Resource.iron: 20 * self.artisan_iron_usage,
@@ -95,7 +138,7 @@ class State_Modifiers:
             }),
             Class_Name.peasants: Resources({
                 Resource.food: 4 * FOOD_CONSUMPTION,
-                Resource.wood: sum(WOOD_CONSUMPTION.values()) / 3,
+                Resource.wood: self.rules.yearly_wood_consumption / 3,
                 Resource.stone: 0,
                 Resource.iron: 0,
                 Resource.tools: 4 * self.peasant_tool_usage,
@@ -103,7 +146,7 @@ class State_Modifiers:
             }),
             Class_Name.others: Resources({
                 Resource.food: 4 * FOOD_CONSUMPTION,
-                Resource.wood: sum(WOOD_CONSUMPTION.values()) / 3,
+                Resource.wood: self.rules.yearly_wood_consumption / 3,
                 Resource.stone: 0,
                 Resource.iron: 0,
                 Resource.tools: 0,
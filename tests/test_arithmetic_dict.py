@@ -194,6 +194,41 @@ def test_floor_division_float_assignment():
     assert third == {"a": -inf, "b": inf, "c": -inf}
 
 
+def test_assignment_operators_in_place():
+    _, first, second = get_numbers()
+    old_first = first
+    first += second
+    first -= second
+    first *= second
+    first *= 3.5
+    first /= second
+    first /= 3.5
+    first //= second
+    first //= 3.5
+    assert first is old_first
+
+    third = Arithmetic_Dict({"a": 1, "b": 2})
+    alias = third
+    third += {"b": 1, "c": 3}
+    assert alias is third
+    assert alias == {"a": 1, "b": 3, "c": 3}
+
+
+def test_add_multiplied():
+    numbers, first, second = get_numbers()
+    result = first.add_multiplied(second, -2.5)
+    assert result is first
+    assert first == get_result(numbers, lambda x, y: x + y * -2.5)
+
+    third = Arithmetic_Dict({"a": 1, "b": 2})
+    third.add_multiplied(Arithmetic_Dict({"a": inf, "b": 1}), 0)
+    assert third == {"a": 1, "b": 2}
+
+    fourth = Arithmetic_Dict({"a": 4, "b": 2})
+    fourth.add_multiplied(fourth, -0.25)
+    assert fourth == {"a": 3, "b": 1.5}
+
+
 def test_lesser_than_dict():
     _, first, _ = get_numbers()
     minimum = min(first.values())
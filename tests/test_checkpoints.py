@@ -0,0 +1,144 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from pytest import raises
+
+from ..sources.abstract_interface.checkpoints import (CHECKPOINTS_FILE_NAME,
+                                                      Checkpoints, line_steps,
+                                                      replay, verify_save)
+from ..sources.abstract_interface.interface import Interface
+from ..sources.auxiliaries.enums import Class_Name, Resource
+from ..sources.state.state_data import State_Data
+
+LINES = ["next 2", "laws set wage_minimum None 0.5", "next 1", "skip 12 1"]
+
+
+def load_starting() -> State_Data:
+    with open("saves/starting/starting_state.json", 'r',
+              encoding="utf-8") as file:
+        return State_Data.from_dict(json.load(file))
+
+
+def test_replay():
+    assert [line_steps(line) for line in LINES] == [2, 1, 1, 1]
+
+    state = load_starting()
+    positions = list(replay(state, LINES))
+    assert positions == [(0, 1), (0, 2), (1, 1), (2, 1), (3, 1)]
+    whole = load_starting()
+    whole.execute_commands(LINES)
+    assert state.digest() == whole.digest()
+
+    state = load_starting()
+    state.do_month()
+    assert list(replay(state, LINES, 0, 1)) == positions[1:]
+    assert state.digest() == whole.digest()
+
+
+def test_checkpoints():
+    with raises(ValueError):
+        Checkpoints(load_starting(), 0)
+
+    state = load_starting()
+    checkpoints = Checkpoints(state, 2)
+    for line, step in replay(state, LINES):
+        checkpoints.record(state, line, step)
+    assert len(checkpoints.digests) == 5
+    assert checkpoints.digests[-1] == state.digest()
+    assert [(snapshot["line"], snapshot["step"], snapshot["steps"])
+            for snapshot in checkpoints.snapshots] == [(0, 2, 2), (3, 1, 5)]
+    assert checkpoints.matches(LINES)
+    assert not checkpoints.matches(LINES[:-1])
+    snapshot = checkpoints.snapshots[0]
+    assert State_Data.from_dict(snapshot["state"]).digest() == \
+        snapshot["digest"] == checkpoints.digests[1]
+
+
+def test_interface_checkpoints():
+    interface = Interface("starting")
+    interface.next_month()
+    interface.next_month()
+    interface.transfer_resources(Class_Name.nobles, Resource.wood, 10)
+    assert interface.checkpoints.digests == [
+        interface.checkpoints.digests[0], interface.checkpoints.digests[1],
+        interface.state.digest()
+    ]
+    assert interface.checkpoints.matches(interface.history.history_lines)
+
+
+def test_verify_save(tmp_path: Any):
+    interface = Interface("starting")
+    interface.checkpoints = Checkpoints(interface.state, 6)
+    for _ in range(5):
+        interface.next_month()
+    interface.transfer_resources(Class_Name.nobles, Resource.wood, 10)
+    for _ in range(15):
+        interface.next_month()
+    assert len(interface.checkpoints.snapshots) == 3
+
+    old_cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        os.makedirs("saves/long")
+        interface.save_data("long")
+        assert verify_save("long") is None
+        with ProcessPoolExecutor(2) as executor:
+            assert verify_save("long", executor) is None
+
+        # Loading the save records the same digests
+        loaded = Interface("long")
+        assert loaded.checkpoints.digests == interface.checkpoints.digests
+
+        history_path = "saves/long/history.txt"
+        with open(history_path, 'r', encoding="utf-8") as file:
+            history = file.read()
+
+        # A changed command
+        with open(history_path, 'w', encoding="utf-8") as file:
+            file.write(history.replace("wood 10", "wood 20"))
+        with ProcessPoolExecutor(2) as executor:
+            divergence = verify_save("long", executor)
+        assert divergence is not None
+        assert divergence.line == 1
+        assert divergence.command == "transfer nobles wood 20"
+        assert divergence.reason == "the state doesn't match the checkpoint"
+
+        # An invalid command
+        with open(history_path, 'w', encoding="utf-8") as file:
+            file.write(history.replace("next 15", "bogus\nnext 15"))
+        divergence = verify_save("long")
+        assert divergence is not None
+        assert (divergence.line, divergence.command) == (2, "bogus")
+        assert divergence.reason.startswith("InvalidCommandError")
+
+        # A shortened history
+        with open(history_path, 'w', encoding="utf-8") as file:
+            file.write(history.replace("next 15", "next 14"))
+        divergence = verify_save("long")
+        assert divergence is not None
+        assert divergence.reason == \
+            "the history has 20 steps, the checkpoints 21"
+
+        # A corrupted snapshot
+        with open(history_path, 'w', encoding="utf-8") as file:
+            file.write(history)
+        checkpoints_path = "saves/long/" + CHECKPOINTS_FILE_NAME
+        with open(checkpoints_path, 'r', encoding="utf-8") as file:
+            checkpoints = json.load(file)
+        snapshot = checkpoints["snapshots"][1]
+        snapshot["state"]["government"]["resources"]["food"] += 1
+        with open(checkpoints_path, 'w', encoding="utf-8") as file:
+            json.dump(checkpoints, file)
+        divergence = verify_save("long")
+        assert divergence is not None
+        assert (divergence.line, divergence.step) == \
+            (snapshot["line"], snapshot["step"])
+        assert divergence.reason == "the snapshot doesn't match its digest"
+
+        # Without checkpoints the history is only replayed
+        os.remove(checkpoints_path)
+        assert verify_save("long") is None
+    finally:
+        os.chdir(old_cwd)
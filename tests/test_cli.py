@@ -2,6 +2,7 @@ import os
 import os.path
 import re
 import shutil
+from io import StringIO
 from math import inf, nan
 from random import randint
 from typing import Any, Callable, Type, TypeVar
@@ -10,20 +11,42 @@ from pytest import raises
 from sources.state.social_classes.class_file import Class
 from sources.state.state_data import State_Data
 
+from ..sources.abstract_interface.checkpoints import Divergence
+from ..sources.abstract_interface.comparison import Comparison, Metric_Gap
+from ..sources.abstract_interface.cycles import Skip
 from ..sources.abstract_interface.interface import Interface, SaveAccessError
+from ..sources.abstract_interface.memory_usage import (History_Memory,
+                                                       Memory_Report)
+from ..sources.abstract_interface.planner import Decision
+from ..sources.abstract_interface.save_catalog import Save_Catalog
+from ..sources.abstract_interface.sensitivity import (Sensitivity,
+                                                      Sensitivity_Analysis)
+from ..sources.auxiliaries import globals
 from ..sources.auxiliaries.enums import Class_Name, Month, Resource
+from ..sources.auxiliaries.memory import (Memory_Phase, Object_Size,
+                                          Phase_Memory)
 from ..sources.auxiliaries.soldiers import Soldiers
 from ..sources.auxiliaries.testing import (capture_standard_output, replace,
                                            set_standard_input)
-from ..sources.cli import cli_commands, cli_game_commands
+from ..sources.auxiliaries.trace import Trace, Trace_Event, Trace_Phase
+from ..sources.cli import cli, cli_commands, cli_game_commands
 from ..sources.cli.cli_commands import (COMMANDS, Print_Type, ShutDownCommand,
-                                        delete_save, exit_game,
+                                        compare, confirm, debug_trace,
+                                        delete_save, describe_comparison,
+                                        describe_decision,
+                                        describe_divergence, describe_memory,
+                                        describe_sensitivity, exit_game,
+                                        find_commands,
                                         get_modifiers_from_class,
                                         get_modifiers_from_dict,
-                                        get_month_string, help_, help_command,
-                                        history, next_command, print_resources,
-                                        save, set_months_of_history, state,
-                                        validate_target_name)
+                                        get_month_string, govern, help_,
+                                        help_command,
+                                        history, list_saves, memory,
+                                        next_command,
+                                        print_resources,
+                                        redo, save, sensitivity,
+                                        set_months_of_history, state, undo,
+                                        validate_target_name, verify)
 from ..sources.cli.cli_game_commands import (LAWS, InternalCommandError,
                                              InvalidArgumentError, fight,
                                              fill_command, format_iterable,
@@ -43,6 +66,21 @@ def test_fill_command():
     assert fill_command("bcd", cmds) == {"bcd"}
 
 
+def test_find_commands():
+    assert find_commands("save") == {"save"}
+    assert find_commands("s") == {"save", "state", "secure"}
+    assert find_commands("li") == {"list"}
+    assert find_commands("abc") == set()
+    # Abbreviations of the game's commands don't become ambiguous
+    assert find_commands("l") == {"laws"}
+    assert find_commands("d") == find_commands("de") == {"delete"}
+    assert find_commands("deb") == {"debug"}
+    assert find_commands("r") == find_commands("re") == {"recruit"}
+    assert find_commands("red") == {"redo"}
+    assert find_commands("se") == {"secure"}
+    assert find_commands("sen") == {"sensitivity"}
+
+
 def test_round_format_zero_extension():
     assert round_format(2, 1, 4) == "2.0"
     assert round_format(2.1, 3, 8) == "2.100"
@@ -854,6 +892,34 @@ def test_next_command():
             assert stdout.getvalue() != ""
             assert calls == 6
 
+    def fake_next_months(self: Interface, amount: int) -> Skip:
+        return Skip(24, 12)
+
+    with replace(Interface, "next_months", fake_next_months):
+        with capture_standard_output() as stdout:
+            next_command(["next", "40"], Interface())
+            assert "12-month cycle" in stdout.getvalue()
+            assert "24 months were skipped" in stdout.getvalue()
+
+
+def test_undo_redo():
+    interface = Interface("starting")
+    with capture_standard_output() as stdout:
+        undo(["undo"], interface)
+        redo(["redo"], interface)
+        assert stdout.getvalue() == \
+            "There is nothing to undo.\nThere is nothing to redo.\n"
+
+    interface.next_month()
+    with capture_standard_output() as stdout:
+        undo(["undo"], interface)
+        assert "Current month: January" in stdout.getvalue()
+    assert interface.history.history_lines == []
+    with capture_standard_output() as stdout:
+        redo(["redo"], interface)
+        assert "Current month: February" in stdout.getvalue()
+    assert interface.history.history_lines == ["next 1"]
+
 
 def test_get_modifiers_from_class():
     state = State_Data()
@@ -923,9 +989,15 @@ def test_delete_save():
         isdir_calls.append(path)
         return isdir_result
 
+    removed: list[str] = []
+
+    def fake_remove(self: Save_Catalog, name: str) -> None:
+        removed.append(name)
+
     # Guarding against this test removing files
     with replace(shutil, "rmtree", fake_rmtree), \
-         replace(os.path, "isdir", fake_isdir):
+         replace(os.path, "isdir", fake_isdir), \
+         replace(Save_Catalog, "remove", fake_remove):
         with raises(InvalidArgumentError):
             delete_save(["delete"], None)
 
@@ -971,6 +1043,270 @@ def test_delete_save():
             assert stdout.getvalue() != ""
             assert stdin.tell() == 3
             assert rmtree_calls == ["saves/test"]
+            assert removed == ["test"]
+
+
+def test_list_saves():
+    saves: dict[str, Any] = {}
+
+    def fake_list_saves(self: Save_Catalog) -> dict[str, Any]:
+        return saves
+
+    with replace(Save_Catalog, "list_saves", fake_list_saves):
+        with capture_standard_output() as stdout:
+            list_saves(["list"], None)
+            assert stdout.getvalue() == "There are no saves.\n"
+
+        saves = {
+            "starting": {"month": "January", "year": 0, "population": 180,
+                         "history_length": 0},
+            "long_save_name": {"month": "September", "year": 12,
+                               "population": 2500.4, "history_length": 1234}
+        }
+        with capture_standard_output() as stdout:
+            list_saves(["list"], None)
+            lines = stdout.getvalue().splitlines()
+        assert len(lines) == 3
+        assert lines[1].split() == ["starting", "January", "0", "180", "0"]
+        assert lines[2].split() == \
+            ["long_save_name", "September", "12", "2500", "1234"]
+
+
+def test_verify():
+    with raises(InvalidArgumentError):
+        verify(["verify"], None)
+    with raises(InvalidArgumentError):
+        verify(["verify", "../saves"], None)
+    with capture_standard_output() as stdout:
+        verify(["verify", "doesnt_exist"], None)
+        assert stdout.getvalue() == "This save does not exist.\n"
+    with capture_standard_output() as stdout:
+        verify(["verify", "starting"], None)
+        assert stdout.getvalue() == "The save is valid.\n"
+
+    assert describe_divergence(Divergence(
+        2, 5, "next 12", 3, "May", "the state doesn't match the checkpoint"
+    )) == ("The save diverges at history line 3 (next 12, month 5), May 3: "
+           "the state doesn't match the checkpoint.")
+    assert describe_divergence(Divergence(
+        0, 1, "bogus", 0, "January", "InvalidCommandError: invalid command"
+    )) == ("The save diverges at history line 1 (bogus), January 0: "
+           "InvalidCommandError: invalid command.")
+
+
+def test_compare():
+    with raises(InvalidArgumentError):
+        compare(["compare"], None)
+    with raises(InvalidArgumentError):
+        compare(["compare", "starting", "../saves"], None)
+    with capture_standard_output() as stdout:
+        compare(["compare", "doesnt_exist"], None)
+        assert stdout.getvalue() == "Save doesnt_exist does not exist.\n"
+
+    interface = Interface("starting")
+    interface.next_month()
+    with capture_standard_output() as stdout:
+        compare(["compare", "starting"], interface)
+        assert stdout.getvalue() == \
+            "The histories have no months in common.\n"
+
+    gap = Metric_Gap("prices.food", 14, 1, 1.5, 0.5)
+    assert describe_comparison(Comparison(12, 5, 5, 5, None, [])) == [
+        "Compared 5 months since January 1.", "The histories don't differ."
+    ]
+    lines = describe_comparison(Comparison(12, 5, 7, 5, gap, [gap]))
+    assert lines[:4] == [
+        "Compared 5 months since January 1.",
+        "The first history has 2 months more than the second one.",
+        "The histories differ since March 1: prices.food is 1.00 and 1.50.",
+        "Largest differences:"
+    ]
+    assert lines[4].split() == ["prices.food", "March", "1", "1.00", "1.50"]
+
+
+def test_sensitivity():
+    with raises(InvalidArgumentError):
+        sensitivity(["sensitivity", "1", "2"], None)
+    with raises(InvalidArgumentError):
+        sensitivity(["sensitivity", "0"], None)
+
+    interface = Interface("starting")
+    with capture_standard_output() as stdout:
+        sensitivity(["sensitivity", "2"], interface)
+        lines = stdout.getvalue().splitlines()
+    assert lines[0] == ("Elasticities of the outcomes after 2 months, ranked "
+                        "by population:")
+    assert lines[1].split() == ["modifier", "value", "population",
+                                "government_wealth", "happiness", "months"]
+    assert lines[2].split()[0] == "(outcomes)"
+    assert "worker_land_usage" in {line.split()[0] for line in lines[3:]}
+
+    analysis = Sensitivity_Analysis(12, {"a": 1, "b": 2}, [
+        Sensitivity("x", 1, 0.9, 1.1, {"a": 0.5, "b": 0}),
+        Sensitivity("y", 0, 0, 0.01, {"a": 0.1, "b": -3})
+    ])
+    lines = describe_sensitivity(analysis, "b")
+    assert lines[0] == \
+        "Elasticities of the outcomes after 12 months, ranked by b:"
+    assert lines[3].split() == ["y", "0.000", "0.100", "-3.000"]
+    assert lines[4].split() == ["x", "1.000", "0.500", "0.000"]
+
+
+def test_govern():
+    with raises(InvalidArgumentError):
+        govern(["govern", "1", "2"], None)
+    with raises(InvalidArgumentError):
+        govern(["govern", "0"], None)
+
+    interface = Interface("starting")
+    with capture_standard_output() as stdout:
+        govern(["govern", "2"], interface)
+        lines = stdout.getvalue().splitlines()
+    assert lines[0].startswith("January 0: ")
+    assert lines[1].startswith("February 0: ")
+    assert lines[-2] == "New month: March 0"
+
+    assert describe_decision(Decision(None, 1.5, 1.5, 3, 10)) == \
+        "nothing (score 1.50, doing nothing 1.50; 3 of 10 actions tried)"
+    assert describe_decision(
+        Decision("secure food 5", 2, 1.25, 10, 10)
+    ) == "secure food 5 (score 2.00, doing nothing 1.25; 10 of 10 actions " \
+        "tried)"
+
+
+def test_memory():
+    with raises(InvalidArgumentError):
+        memory(["memory", "1", "2"], None)
+    with raises(InvalidArgumentError):
+        memory(["memory", "0"], None)
+
+    interface = Interface("starting")
+    interface.next_months(2)
+    with capture_standard_output() as stdout:
+        memory(["memory", "2"], interface)
+        lines = stdout.getvalue().splitlines()
+    assert lines[0].startswith("Memory allocated by the phases of 2 months")
+    assert [line.split()[0] for line in lines[2:2 + len(Memory_Phase)]] == \
+        [phase.name for phase in Memory_Phase]
+    assert lines[-2].startswith("The state keeps ")
+    assert lines[-1].startswith("The history of 2 months keeps ")
+
+    report = Memory_Report(2, [
+        Phase_Memory(Memory_Phase.growth, 2, 10, 2048, 4096)
+    ], Object_Size(100, 10240))
+    assert describe_memory(report)[2:] == [
+        "growth              5.0        1.0        4.0",
+        "The state keeps 100 blocks, 10.0 KiB."
+    ]
+    history = History_Memory(5, Object_Size(20, 1024), 5120, 2048)
+    assert describe_memory(report, history)[-1] == (
+        "The history of 5 months keeps 20 blocks, 1.0 KiB; remaking it "
+        "takes up to 5.0 KiB at once (2.0 KiB month by month)."
+    )
+
+
+def test_debug_trace():
+    with raises(InvalidArgumentError):
+        debug_trace(["debug", "1", "2"], None)
+    with raises(InvalidArgumentError):
+        debug_trace(["debug", "-1"], None)
+
+    trace = Trace()
+    for number in range(3):
+        trace.record(Trace_Event(Trace_Phase.demotion, Class_Name.others,
+                                 number))
+    with replace(globals, "trace", trace):
+        with replace(globals, "debug", False), \
+                capture_standard_output() as stdout:
+            debug_trace(["debug"], None)
+            assert "Demoted" not in stdout.getvalue()
+
+        with replace(globals, "debug", True):
+            with capture_standard_output() as stdout:
+                debug_trace(["debug"], None)
+                assert stdout.getvalue() == \
+                    "Demoted 0 others\nDemoted 1 others\nDemoted 2 others\n"
+            with capture_standard_output() as stdout:
+                debug_trace(["debug", "1"], None)
+                assert stdout.getvalue() == "Demoted 2 others\n"
+
+
+def test_confirm():
+    with capture_standard_output() as stdout, \
+            set_standard_input("ab\n2\n1\n0\n") as stdin:
+        assert confirm("first", "again", "wrong") is True
+        assert stdout.getvalue() == "firstwrong\nagainwrong\nagain"
+        assert stdin.tell() == 7
+
+    with capture_standard_output() as stdout, \
+            set_standard_input("0\n") as stdin:
+        assert confirm("first", "again") is False
+        assert stdin.tell() == 2
+
+    for answer in (True, False):
+        with replace(globals, "confirmation", answer), \
+                capture_standard_output() as stdout, \
+                set_standard_input("") as stdin:
+            assert confirm("first", "again") is answer
+            assert stdout.getvalue() == ""
+
+
+def test_run_script():
+    output = StringIO()
+    with capture_standard_output() as stdout:
+        status = cli.run_script("starting", [
+            "# comment", "", "state population", "next", "  help next  "
+        ], output)
+        assert stdout.getvalue() == ""
+    assert status == cli.SCRIPT_SUCCESS
+    assert "New month: February 0" in output.getvalue()
+    assert "Enter a command" not in output.getvalue()
+    assert globals.confirmation is None
+
+    output = StringIO()
+    status = cli.run_script("starting", ["next", "bogus", "next"], output)
+    assert status == cli.SCRIPT_COMMAND_ERROR
+    assert "New month: March 0" in output.getvalue()
+
+    # Prompts are aborted by default, the script goes on after exit
+    output = StringIO()
+    status = cli.run_script("starting", ["exit", "next"], output)
+    assert status == cli.SCRIPT_SUCCESS
+    assert "New month: February 0" in output.getvalue()
+
+    # Confirmed exit ends the script
+    output = StringIO()
+    with replace(globals, "confirmation", True):
+        status = cli.run_script("starting", ["exit", "next"], output)
+        assert globals.confirmation is True
+    assert status == cli.SCRIPT_SUCCESS
+    assert "New month" not in output.getvalue()
+
+    output = StringIO()
+    status = cli.run_script("starting", ["next 100"], output)
+    assert status == cli.SCRIPT_GAME_OVER
+    assert "GAME OVER" in output.getvalue()
+
+    output = StringIO()
+    status = cli.run_script("surely_nonexistent_save", ["next"], output)
+    assert status == cli.SCRIPT_LOAD_ERROR
+
+    # Output without a file is buffered, then written to standard output
+    with capture_standard_output() as stdout, \
+            replace(cli, "SCRIPT_BUFFER_SIZE", 100):
+        status = cli.run_script("starting", ["state population"] * 3)
+        assert stdout.getvalue().count("Current population") == 3
+
+    # Ctrl-C is not an unexpected exception
+    def interrupting_execute(command: str, interface: Any) -> bool:
+        raise KeyboardInterrupt
+
+    output = StringIO()
+    with replace(cli, "execute", interrupting_execute):
+        status = cli.run_script("starting", ["next"], output)
+    assert status == cli.SCRIPT_INTERRUPTED
+    assert "interrupted" in output.getvalue()
+    assert "unexpected" not in output.getvalue()
 
 
 def test_exit_game():
@@ -0,0 +1,147 @@
+from pytest import approx, raises  # type: ignore
+
+from ..sources.auxiliaries.enums import Class_Name, Resource
+from ..sources.auxiliaries.resources import Resources
+from ..sources.state.social_classes.cohorts import Cohorts
+from ..sources.state.social_classes.nobles import Nobles
+from ..sources.state.state_data import State_Data
+from ..sources.state.state_data_base_and_do_month import \
+    State_Data_Base_And_Do_Month
+
+
+def test_constructor():
+    cohorts = Cohorts([10, 20, 30], [1, 1, 2])
+    assert len(cohorts) == 3
+    assert cohorts.populations == [10, 20, 30]
+    assert cohorts.shares == [0.25, 0.25, 0.5]
+    assert cohorts.population == 60
+
+    assert Cohorts([10, 30], [0, 0]).shares == [0.25, 0.75]
+    assert Cohorts([0, 0], [0, 0]).shares == [0.5, 0.5]
+
+    with raises(ValueError):
+        Cohorts([10, 20], [1])
+    with raises(ValueError):
+        Cohorts([], [])
+    with raises(ValueError):
+        Cohorts([10, -1], [1, 1])
+    with raises(ValueError):
+        Cohorts([10, 10], [1, -1])
+
+
+def test_with_inequality():
+    cohorts = Cohorts.with_inequality(4, 100, 1)
+    assert cohorts.populations == [25, 25, 25, 25]
+    assert cohorts.shares == approx([0.1, 0.2, 0.3, 0.4])
+
+    cohorts = Cohorts.with_inequality(5, 100, 0)
+    assert cohorts.shares == approx([0.2] * 5)
+
+    with raises(ValueError):
+        Cohorts.with_inequality(0, 100)
+
+
+def test_set_population():
+    cohorts = Cohorts([10, 30], [1, 1])
+    cohorts.set_population(20)
+    assert cohorts.populations == approx([5, 15])
+    assert cohorts.shares == [0.5, 0.5]
+
+    cohorts.set_population(0)
+    assert cohorts.populations == [0, 0]
+    cohorts.set_population(10)
+    assert cohorts.populations == [5, 5]
+
+
+def test_add_per_capita():
+    cohorts = Cohorts([10, 30], [3, 1])
+    cohorts.add_per_capita(100, 140)
+    # 75 + 10 * 1, 25 + 30 * 1
+    assert cohorts.shares == approx([85 / 140, 55 / 140])
+
+    cohorts = Cohorts([10, 10], [1, 3])
+    cohorts.add_per_capita(100, 40)
+    # 25 - 30 -> 0, 75 - 30
+    assert cohorts.shares == approx([0, 1])
+
+
+def test_pay_taxes():
+    cohorts = Cohorts([50, 50], [0.2, 0.8])
+    # Personal tax worth 10% of the class's net worth
+    rel_tax = cohorts.pay_taxes(0.1, 0.1)
+    # Poorer cohort pays 0.25 + 0.1, richer 0.0625 + 0.1
+    assert rel_tax == approx(0.2 * 0.35 + 0.8 * 0.1625)
+    assert cohorts.shares == approx([
+        0.2 * 0.65 / (1 - rel_tax), 0.8 * 0.8375 / (1 - rel_tax)
+    ])
+
+    cohorts = Cohorts([90, 10], [0.1, 0.9])
+    rel_tax = cohorts.pay_taxes(0.5, 0)
+    assert rel_tax == approx(0.1 + 0.9 * 0.5 * 0.1 / 0.9)
+    assert cohorts.shares == approx([0, 1])
+
+
+def test_promote():
+    cohorts = Cohorts([50, 50], [0.2, 0.8])
+    math = State_Data_Base_And_Do_Month._promotion_math  # type: ignore
+    part_paid, transferred = cohorts.promote(1000, 900, 2, 10, math)
+
+    poor_paid, poor_transferred = math(100, 50, 10)
+    rich_paid, rich_transferred = math(700, 50, 10)
+    assert transferred == approx(poor_transferred + rich_transferred)
+    assert part_paid == approx((poor_paid * 100 + rich_paid * 700) / 900)
+    assert cohorts.populations == approx([
+        50 - poor_transferred, 50 - rich_transferred
+    ])
+    poor_left = 200 - poor_paid * 100 - 2 * poor_transferred
+    rich_left = 800 - rich_paid * 700 - 2 * rich_transferred
+    assert cohorts.shares == approx([
+        poor_left / (poor_left + rich_left),
+        rich_left / (poor_left + rich_left)
+    ])
+    # The rich are promoted more often than the poor
+    assert rich_transferred > poor_transferred
+
+
+def test_dict_conversion():
+    cohorts = Cohorts([10, 30], [1, 3])
+    dicted = cohorts.to_dict()
+    assert dicted == {"populations": [10, 30], "shares": [0.25, 0.75]}
+    new = Cohorts.from_dict(dicted)
+    assert new.populations == cohorts.populations
+    assert new.shares == cohorts.shares
+
+
+def test_class_cohorts():
+    state = State_Data.generate_empty_state()
+    state.prices = Resources(1)
+    nobles = Nobles(state, 100, Resources({Resource.food: 1000}))
+    nobles.lower_class = state.peasants
+    assert nobles.cohorts is None
+    assert "cohorts" not in nobles.to_dict()
+
+    nobles.split_into_cohorts(4, 0)
+    assert nobles.cohorts is not None
+    assert nobles.cohorts.populations == [25] * 4
+    nobles.population = 50
+    assert nobles.cohorts.populations == approx([12.5] * 4)
+
+    with nobles.per_capita_income():
+        nobles.resources.food += 100
+    assert nobles.cohorts.shares == approx([0.25] * 4)
+
+    dicted = nobles.to_dict()
+    assert dicted["cohorts"] == nobles.cohorts.to_dict()
+    new = Nobles.from_dict(state, dicted)
+    assert new.cohorts is not None
+    assert new.cohorts.populations == nobles.cohorts.populations
+
+
+def test_state_split_into_cohorts():
+    state = State_Data.generate_empty_state()
+    state.split_into_cohorts(300, 2)
+    for social_class in state:
+        assert social_class.cohorts is not None
+        assert len(social_class.cohorts) == 300
+    assert state.classes[Class_Name.others].cohorts.shares[0] < \
+        state.classes[Class_Name.others].cohorts.shares[-1]  # type: ignore
@@ -0,0 +1,104 @@
+import json
+from typing import Any
+
+from ..sources.abstract_interface.comparison import (Metric_Gap,
+                                                     compare_histories,
+                                                     iterate_deltas,
+                                                     load_history,
+                                                     months_since,
+                                                     relative_gap,
+                                                     starting_month)
+from ..sources.abstract_interface.history import History
+from ..sources.auxiliaries.testing import replace
+from ..sources.state.month_data import FLAT_KEYS
+from ..sources.state.state_data import State_Data
+
+
+def load_starting() -> dict[str, Any]:
+    with open("saves/starting/starting_state.json", 'r',
+              encoding="utf-8") as file:
+        return json.load(file)
+
+
+def test_relative_gap():
+    assert relative_gap(2, 2) == 0
+    assert relative_gap(10, 5) == 0.5
+    assert relative_gap(-4, 4) == 2
+    assert relative_gap(0.25, 0.5) == 0.25
+
+
+def test_iterate_months():
+    history = History(load_starting(), ["next 2", "skip 3 1", "next 1"])
+    months = list(history.iterate_months())
+    assert len(months) == 6
+    assert months[2] is months[3] is months[4] is months[1]
+    assert months == history.obtain_whole_history()
+
+
+def test_compare_histories():
+    history = load_history("starting")
+    assert starting_month(history) == 0
+
+    first = History(load_starting(), ["next 3", "laws set tax_personal "
+                                      "others 0.5", "next 3"])
+    second = History(load_starting(), ["next 5"])
+    deltas = list(iterate_deltas(first, second))
+    assert [month for month, _ in deltas] == [0, 1, 2, 3, 4]
+    assert all(len(values) == len(FLAT_KEYS) for _, values in deltas)
+    assert all(value == 0 for _, values in deltas[:3] for value in values)
+    assert any(value != 0 for value in deltas[3][1])
+
+    comparison = compare_histories(first, second, top=3)
+    assert (comparison.start, comparison.months) == (0, 5)
+    assert (comparison.first_months, comparison.second_months) == (6, 5)
+    divergence = comparison.divergence
+    assert divergence is not None
+    assert divergence.month == 3
+    assert divergence.gap == \
+        relative_gap(divergence.first, divergence.second)
+    assert len(comparison.gaps) == 3
+    assert comparison.gaps == sorted(comparison.gaps,
+                                     key=lambda gap: gap.gap, reverse=True)
+    assert comparison.gaps[0].gap >= divergence.gap
+
+    # A large tolerance finds a later divergence, or none
+    tolerant = compare_histories(first, second, 100)
+    assert tolerant.divergence is None
+    assert tolerant.gaps == compare_histories(first, second).gaps
+
+    assert compare_histories(second, second) == \
+        (0, 5, 5, 5, None, [])
+
+
+def test_compare_shifted():
+    later = load_starting()
+    later["month"] = "March"
+    first = History(load_starting(), ["next 4"])
+    second = History(later, ["next 2"])
+    comparison = compare_histories(first, second)
+    assert (comparison.start, comparison.months) == (2, 2)
+    assert (comparison.first_months, comparison.second_months) == (2, 2)
+    assert isinstance(comparison.divergence, Metric_Gap)
+    assert comparison.divergence.month == 2
+
+
+def test_months_since():
+    history = History(load_starting(), ["next 2", "secure food 5",
+                                        "skip 12 1", "next 1"])
+    assert months_since(history, 0) == 15
+    assert months_since(history, 5) == 10
+    assert months_since(history, 20) == 0
+
+    # Months of the longer history which aren't compared aren't remade
+    done: list[None] = []
+    do_month = State_Data.do_month
+
+    def counting_do_month(self: State_Data, *args: Any) -> Any:
+        done.append(None)
+        return do_month(self, *args)
+
+    with replace(State_Data, "do_month", counting_do_month):
+        comparison = compare_histories(History(load_starting(), ["next 2"]),
+                                       History(load_starting(), ["next 20"]))
+    assert (comparison.first_months, comparison.second_months) == (2, 20)
+    assert len(done) <= 5
@@ -0,0 +1,52 @@
+from pytest import raises
+
+from ..sources.abstract_interface.cycles import (MIN_REPEATS, Cycle_Detector,
+                                                 state_vector)
+from ..sources.auxiliaries.enums import Month
+from ..sources.state.state_data import State_Data
+
+
+def test_state_vector():
+    state = State_Data.generate_empty_state()
+    vector = state_vector(state)
+    assert all(isinstance(value, float) for value in vector)
+    assert list(vector) == state.digest_values()[2:]
+
+    state.month = Month.May
+    state.year = 20
+    assert state_vector(state) == vector
+
+    state.prices.food += 1
+    assert state_vector(state) != vector
+
+
+def test_steady_state():
+    with raises(ValueError):
+        Cycle_Detector(-1)
+
+    state = State_Data.generate_empty_state()
+    detector = Cycle_Detector(0.01)
+    for _ in range(MIN_REPEATS):
+        assert detector.add(state) is None
+        state.prices.food *= 1.001
+    assert detector.add(state) == 1
+
+    # Changes above the tolerance are not a steady state
+    detector = Cycle_Detector(0.01)
+    for _ in range(MIN_REPEATS + 5):
+        state.prices.food *= 1.1
+        assert detector.add(state) is None
+
+
+def test_yearly_cycle():
+    state = State_Data.generate_empty_state()
+    detector = Cycle_Detector(0)
+    for month in range(23):
+        state.prices.food = month % 12 + 1
+        assert detector.add(state) is None
+    state.prices.food = 12
+    assert detector.add(state) == 12
+
+    # The cycle is broken
+    state.prices.food = 2
+    assert detector.add(state) is None
@@ -0,0 +1,25 @@
+from math import inf, nan
+
+from pytest import raises
+
+from ..sources.auxiliaries.digest import digest, quantize
+
+
+def test_quantize():
+    with raises(ValueError):
+        quantize([1], 53)
+
+    assert quantize([-0.0, nan, -nan]) == quantize([0.0, nan, nan])
+    assert quantize([100, 0.1]) == quantize([100 + 1e-10, 0.1 + 1e-18])
+    assert quantize([100]) != quantize([100.001])
+    assert quantize([inf, 1]) != quantize([-inf, 1])
+    assert quantize([1.5], 0) == quantize([1.75], 0) != quantize([2], 0)
+
+
+def test_digest():
+    values = [1, 2.5, True, 1e300, 0]
+    assert digest(values) == digest(list(values))
+    assert len(digest(values)) == 32
+    assert digest(values) != digest(values[:-1])
+    assert digest(values) != digest([1, 2.5, False, 1e300, 0])
+    assert digest([1.5], 0) == digest([1.75], 0)
@@ -0,0 +1,71 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from pytest import raises
+
+from ..sources.abstract_interface.ensemble import (Ensemble,
+                                                   flatten_month_data,
+                                                   run_ensemble,
+                                                   run_replicate)
+from ..sources.auxiliaries import globals
+from ..sources.state.state_data import State_Data
+
+COMMANDS = [
+    "# plunder once", "next", "recruit peasants 5", "fight plunder", "",
+    "next 2"
+]
+
+
+def test_flatten_month_data():
+    with open("saves/starting/starting_state.json", 'r',
+              encoding="utf-8") as file:
+        state = State_Data.from_dict(json.load(file))
+    data = flatten_month_data(state.do_month())
+    assert data["prices.food"] == state.prices.food
+    assert data["resources_after.government.food"] == \
+        state.government.resources.food
+    assert data["growth_modifiers.nobles.starving"] in {0, 1}
+    assert all(isinstance(value, float) for value in data.values())
+
+
+def test_run_replicate():
+    months = run_replicate("starting", COMMANDS, 1)
+    assert len(months) == 3
+    assert globals.confirmation is None
+    assert run_replicate("starting", COMMANDS, 1) == months
+    assert run_replicate("starting", COMMANDS, 2) != months
+
+    # Replicates end with the game
+    assert len(run_replicate("starting", ["next 100", "next"], 1)) < 100
+
+
+def test_ensemble():
+    ensemble = Ensemble((0.5,))
+    ensemble.add([{"a": 1, "b": 2}, {"a": 3}])
+    ensemble.add([{"a": 3, "b": 4}])
+    assert ensemble.replicates == 2
+    summary = ensemble.summary()
+    assert len(summary) == 2
+    assert summary[0]["a"]["mean"] == 2
+    assert summary[0]["b"]["variance"] == 2
+    assert summary[0]["a"]["q0.5"] == 2
+    assert summary[1]["a"]["count"] == 1
+
+
+def test_run_ensemble():
+    with raises(ValueError):
+        run_ensemble("starting", COMMANDS, 0)
+
+    ensemble = run_ensemble("starting", COMMANDS, 4, seed=1)
+    assert ensemble.replicates == 4
+    assert len(ensemble.months) == 3
+    first = run_replicate("starting", COMMANDS, 1)
+    stats = ensemble.months[2]["resources_after.government.food"]
+    assert stats.count == 4
+    assert stats.min <= first[2]["resources_after.government.food"] \
+        <= stats.max
+
+    with ProcessPoolExecutor(2) as executor:
+        parallel = run_ensemble("starting", COMMANDS, 4, seed=1,
+                                executor=executor, window=3)
+    assert parallel.summary() == ensemble.summary()
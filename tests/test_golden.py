@@ -0,0 +1,62 @@
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from pytest import raises
+
+from ..benchmarks.golden import (TRACES_DIR, Trace, check, compare_traces,
+                                 read_trace, record, trace_path, write_trace)
+
+
+def test_golden_traces():
+    with ProcessPoolExecutor(2) as executor:
+        reports = check(executor=executor)
+    assert len(reports) > 1
+    for report in reports:
+        assert report.passed(), report
+
+
+def test_trace_files(tmp_path: Any):
+    trace = Trace(("a", "b"), [(1.0, 2.5), (-3.0, 1e-300)], "RebellionError")
+    path = str(tmp_path / "test.trace")
+    write_trace(path, trace)
+    assert read_trace(path) == trace
+
+    with open(path, 'r+b') as file:
+        file.write(b"XXXX")
+    with raises(ValueError):
+        read_trace(path)
+
+
+def test_compare_traces(tmp_path: Any):
+    expected = Trace(("a", "b"), [(1.0, 2.0), (2.0, 4.0), (3.0, 6.0)], None)
+    assert compare_traces("x", expected, expected).passed()
+
+    actual = Trace(("b", "a", "c"), [(2.0, 1.0, 0.0), (4.5, 2.0, 0.0)],
+                   "RebellionError")
+    report = compare_traces("x", expected, actual)
+    assert not report.passed()
+    assert (report.expected_months, report.months) == (3, 2)
+    assert report.error == "RebellionError"
+    assert [(error.metric, error.month, error.error)
+            for error in report.errors] == [("b", 1, 0.5 / 4.5)]
+    with raises(ValueError):
+        compare_traces("x", actual, expected)
+
+    # A changed trace is noticed
+    shutil.copytree(TRACES_DIR, tmp_path / "traces")
+    traces_dir = str(tmp_path / "traces")
+    path = trace_path("rich", traces_dir)
+    trace = read_trace(path)
+    months = trace.months.copy()
+    months[10] = (months[10][0] * 1.001,) + months[10][1:]
+    write_trace(path, trace._replace(months=months))
+    (report,) = check(["rich"], traces_dir=traces_dir)
+    assert not report.passed()
+    assert report.errors[0].metric == trace.keys[0]
+    assert report.errors[0].month == 10
+    assert report.passed(0.01)
+
+    assert record(["rich"], traces_dir=traces_dir) == \
+        {"rich": len(months)}
+    assert check(["rich"], traces_dir=traces_dir)[0].passed(0)
@@ -81,6 +81,11 @@ def test_real_resources():
     govt.secure_resources = Resources()
     assert govt.real_resources == {}
 
+    # Cached, but not after modification in place
+    assert govt.real_resources is govt.real_resources
+    govt.resources.food = 10
+    assert govt.real_resources.food == 10
+
 
 def test_max_employees_from_land():
     state = State_Data()
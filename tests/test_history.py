@@ -37,6 +37,21 @@ def test_obtain_whole_history():
                                  "did_month 3", "ex"]
 
 
+def test_obtain_whole_history_skip():
+    month = 0
+
+    def fake_do_month(self: State_Data) -> int:
+        nonlocal month
+        month += 1
+        self._advance_month()
+        return month
+
+    with replace(State_Data, "do_month", fake_do_month):
+        history = History(State_Data.generate_empty_state().to_dict(),
+                          ["next 3", "skip 4 2", "next 1"])
+        assert history.obtain_whole_history() == [1, 2, 3, 2, 3, 2, 3, 4]
+
+
 def test_population():
     def fake_whole_history(self: History) -> list[dict[str, int]]:
         return [{"population_after": i} for i in range(4)]
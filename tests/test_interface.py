@@ -2,21 +2,27 @@ import builtins
 import json
 from contextlib import contextmanager
 from io import StringIO
+from random import getstate
 from typing import Any, Generator
 
 from pytest import raises
 
 from ..sources.abstract_interface.history import History
-from ..sources.abstract_interface.interface import (AlreadyFoughtError,
+from ..sources.abstract_interface.interface import (UNDO_LIMIT,
+                                                    UNDO_REPLAY_STEPS,
+                                                    AlreadyFoughtError,
                                                     Interface,
                                                     InvalidArgumentError,
                                                     NoSoldiersError,
+                                                    NothingToRedoError,
+                                                    NothingToUndoError,
                                                     NotEnoughClassPopulation,
                                                     NotEnoughClassResources,
                                                     NotEnoughGovtResources,
                                                     check_arg)
+from ..sources.auxiliaries import globals
 from ..sources.auxiliaries.constants import INBUILT_RESOURCES, RECRUITMENT_COST
-from ..sources.auxiliaries.enums import Class_Name, Resource, Soldier
+from ..sources.auxiliaries.enums import Class_Name, Month, Resource, Soldier
 from ..sources.auxiliaries.resources import Resources
 from ..sources.auxiliaries.soldiers import Soldiers
 from ..sources.auxiliaries.testing import replace
@@ -176,6 +182,64 @@ def test_next_month_next() -> None:
         assert interface.history.history_lines == ["next 7"]
 
 
+def test_next_months() -> None:
+    did_month = 0
+
+    def fake_do_month(self: State_Data) -> None:
+        nonlocal did_month
+        did_month += 1
+        self._advance_month()
+
+    with replace(State_Data, "do_month", fake_do_month):
+        interface = Interface()
+        assert interface.next_months(30) is None
+        assert did_month == 30
+
+        did_month = 0
+        with replace(globals, "cycle_tolerance", 0):
+            interface = Interface()
+            interface.fought = True
+            assert interface.next_months(100) == (96, 1)
+        assert did_month == 4
+        assert interface.fought is False
+        assert interface.state.month == Month.May
+        assert interface.state.year == 8
+        assert interface.history.history_lines == ["next 4", "skip 96 1"]
+
+
+def test_next_months_cycle() -> None:
+    def fake_do_month(self: State_Data) -> None:
+        self.prices.food = self.month.value + 1
+        self._advance_month()
+
+    with replace(State_Data, "do_month", fake_do_month), \
+            replace(globals, "cycle_tolerance", 0.001):
+        interface = Interface()
+        assert interface.next_months(100) == (72, 12)
+        assert interface.history.history_lines == [
+            "next 24", "skip 72 12", "next 4"
+        ]
+        assert interface.state.month == Month.May
+        assert interface.state.year == 8
+
+
+def test_on_month() -> None:
+    interface = Interface("starting")
+    months: list[Any] = []
+    interface.on_month = months.append
+    interface.next_month()
+    assert months == [Interface("starting").state.do_month()]
+
+    def fake_do_month(self: State_Data) -> Any:
+        self._advance_month()
+        return self.month.value
+
+    with replace(State_Data, "do_month", fake_do_month):
+        interface.next_months(3)
+        interface.skip_months(4, 2)
+    assert months[1:] == [2, 3, 4, 3, 4, 3, 4]
+
+
 def test_transfer():
     transfers: list[Any] = []
     now_demotes = 0
@@ -569,3 +633,153 @@ def test_fight():
             "fight crime None"
         ]
         assert interface.fought is True
+
+
+def test_seeded_fight():
+    fights: list[int | None] = []
+
+    def fake_do_fight(self: State_Data, target: str, enemies: int | None
+                      ) -> tuple[bool, Soldiers, float]:
+        fights.append(enemies)
+        return True, Soldiers(), 0
+
+    with replace(State_Data, "do_fight", fake_do_fight):
+        for seed in [1, 1, 2]:
+            state = State_Data.generate_empty_state()
+            state.government.soldiers = Soldiers({Soldier.footmen: 40})
+            interface = Interface(state, seed=seed)
+            interface.fight("plunder")
+            interface.fought = False
+            interface.fight("plunder")
+    assert fights[:2] == fights[2:4]
+    assert fights[:2] != fights[4:]
+
+
+def test_estimate_fight():
+    state = State_Data.generate_empty_state()
+    soldiers = Soldiers({Soldier.knights: 5, Soldier.footmen: 40})
+    state.government.soldiers = soldiers
+    state.brigands = 30
+    interface = Interface(state)
+
+    random_state = getstate()
+    estimate = interface.estimate_fight("plunder", 500)
+    assert getstate() == random_state
+    assert len(estimate.ally_losses) == 500
+    assert 0 < estimate.victory_chance < 1
+    assert interface.estimate_fight("plunder", 500).profits == \
+        estimate.profits
+    assert interface.estimate_fight("plunder", 500, 1).profits != \
+        estimate.profits
+
+    estimate = interface.estimate_fight("crime", 100)
+    brigands, _ = interface.get_brigands()
+    assert len(estimate.profits) == 100
+    assert isinstance(brigands, tuple)
+    assert max(estimate.profits) <= brigands[1]
+
+    with replace(globals, "debug", True):
+        estimate = interface.estimate_fight("crime", 100)
+    assert len(estimate.profits) == 1
+
+    assert interface.state.government.soldiers == soldiers
+    assert interface.state.brigands == 30
+    assert interface.fought is False
+    with raises(InvalidArgumentError):
+        interface.estimate_fight("plunder", 0)
+
+
+def test_undo_redo():
+    interface = Interface("starting")
+    with raises(NothingToUndoError):
+        interface.undo()
+    with raises(NothingToRedoError):
+        interface.redo()
+
+    digests = [interface.state.digest()]
+    interface.next_month()
+    digests.append(interface.state.digest())
+    interface.next_month()
+    digests.append(interface.state.digest())
+    interface.transfer_resources(Class_Name.nobles, Resource.wood, 10)
+    digests.append(interface.state.digest())
+    # Failed commands can't be undone
+    with raises(NotEnoughGovtResources):
+        interface.transfer_resources(Class_Name.nobles, Resource.wood, 1e9)
+    assert len(interface.undo_stack) == 3
+    lines = interface.history.history_lines.copy()
+    checkpoints = interface.checkpoints.digests.copy()
+
+    interface.undo()
+    assert interface.state.digest() == digests[2]
+    assert interface.history.history_lines == ["next 2"]
+    interface.undo()
+    assert interface.state.digest() == digests[1]
+    assert interface.history.history_lines == ["next 1"]
+    assert interface.checkpoints.digests == checkpoints[:1]
+    interface.redo()
+    interface.redo()
+    assert interface.state.digest() == digests[3]
+    assert interface.history.history_lines == lines
+    assert interface.checkpoints.digests == checkpoints
+    with raises(NothingToRedoError):
+        interface.redo()
+
+    # A new command discards the undone ones
+    interface.undo()
+    interface.set_law("wage_minimum", None, 0.9)
+    assert not interface.redo_stack
+    assert interface.history.history_lines == \
+        ["next 2", "laws set wage_minimum None 0.9"]
+    interface.undo()
+    assert interface.history.history_lines == ["next 2"]
+    assert interface.state.digest() == digests[2]
+
+    # Months advanced by one command are undone together
+    interface.next_months(3)
+    interface.undo()
+    assert interface.state.digest() == digests[2]
+
+    for _ in range(UNDO_LIMIT + 2):
+        interface.set_law("wage_minimum", None, 0.5)
+        interface.set_law("wage_minimum", None, 0.4)
+    assert len(interface.undo_stack) == UNDO_LIMIT
+
+    interface.load_data("starting")
+    assert not interface.undo_stack
+
+
+def test_undo_by_replay():
+    interface = Interface("starting")
+    digests = [interface.state.digest()]
+    for _ in range(UNDO_REPLAY_STEPS + 3):
+        interface.next_month()
+        digests.append(interface.state.digest())
+    interface.secure_resources(Resource.food, 10)
+    digests.append(interface.state.digest())
+    interface.next_months(2)
+    digests.append(interface.state.digest())
+
+    # Only some states from before advancing the month are copied
+    kept = [entry.state is not None for entry in interface.undo_stack]
+    assert kept == [False] * (UNDO_REPLAY_STEPS + 1) + [True, False, True,
+                                                       False]
+
+    while interface.undo_stack:
+        interface.undo()
+        digests.pop()
+        assert interface.state.digest() == digests[-1]
+        assert interface.checkpoints.matches(
+            interface.history.history_lines
+        )
+        assert interface.checkpoints.digests[-1:] == digests[-1:] \
+            or len(digests) == 1
+    while interface.redo_stack:
+        interface.redo()
+    assert interface.history.history_lines == \
+        [f"next {UNDO_REPLAY_STEPS + 3}", "secure food 10", "next 2"]
+
+    # Histories not covered by the checkpoints are never replayed
+    interface = Interface(interface.state, interface.history)
+    interface.next_month()
+    assert interface.undo_stack[-1].state is not None
@@ -511,11 +511,11 @@ def test_delete_trade_attributes():
     market._buy_needed_resources()  # type: ignore
     market._delete_trade_attributes()  # type: ignore
 
-    assert not hasattr(market, "available_resources")
-    assert not hasattr(market, "needed_resources")
+    assert market.available_resources == Resources()
+    assert market.needed_resources == Resources()
     for social_class in social_classes:
-        assert not hasattr(social_class, "money")
-        assert not hasattr(social_class, "market_res")
+        assert social_class.money == 0
+        assert social_class.market_res is None
         assert social_class.resources == Resources({
             Resource.food: 50,
             Resource.wood: 50,
@@ -617,3 +617,64 @@ def test_do_trade():  # EXCEL CALCULATIONS USED
         Resource.tools: approx(57.1, abs=0.15),
         Resource.land: 0
     }
+
+
+class Counting_Trading_Obj(Trading_Obj):
+    def __init__(self, resources: Resources, optimal_resources: Resources
+                 ) -> None:
+        super().__init__(resources, optimal_resources)
+        self.optimal_reads = 0
+
+    @property
+    def optimal_resources(self) -> Resources:
+        self.optimal_reads += 1
+        return self._optimal_resources
+
+
+def test_do_trade_many_trading_objects():
+    trading_objs = [
+        Counting_Trading_Obj(
+            Resources({
+                Resource.food: 10 * (i + 1),
+                Resource.wood: 5 * i,
+                Resource.tools: 2 * (i % 7)
+            }),
+            Resources({
+                Resource.food: 20,
+                Resource.wood: 10,
+                Resource.tools: 3
+            })
+        )
+        for i in range(100)
+    ]
+    total = sum((obj.resources for obj in trading_objs), Resources())
+    state = State_Data()
+    market = Market(trading_objs, state)  # type: ignore
+    market.do_trade()
+
+    for trading_obj in trading_objs:
+        assert trading_obj.optimal_reads == 1
+        assert trading_obj.money == 0
+        assert trading_obj.market_res is None
+    assert sum((obj.resources for obj in trading_objs), Resources()) == total
+    assert market._optimal_rows == []  # type: ignore
+
+
+def test_buy_other_resources_worthless_market():
+    class1 = Trading_Obj(Resources(), Resources())
+    class2 = Trading_Obj(Resources(), Resources())
+    empty_class = Trading_Obj(Resources(), Resources())
+    empty_class.population = 0  # type: ignore
+    social_classes = [class1, class2, empty_class]
+    for social_class in social_classes:
+        social_class.market_res = Resources()
+        social_class.money = 0
+    market = Market(social_classes, State_Data())
+    market.prices = Resources({Resource.food: 0})
+    market.available_resources = Resources({Resource.food: 10})
+    market._buy_other_resources()  # type: ignore
+
+    assert class1.market_res == {Resource.food: 5}
+    assert class2.market_res == {Resource.food: 5}
+    assert empty_class.market_res == {}
+    assert market.available_resources == {}
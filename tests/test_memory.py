@@ -0,0 +1,82 @@
+import pickle
+
+from pytest import raises
+
+from ..sources.abstract_interface.interface import Interface
+from ..sources.abstract_interface.memory_usage import (history_memory,
+                                                       profile_months,
+                                                       state_size)
+from ..sources.auxiliaries import globals
+from ..sources.auxiliaries.memory import (Memory_Phase, Memory_Profile,
+                                          peak_size, profiling, retained_size,
+                                          tracing)
+
+
+def test_profiling():
+    assert globals.memory is None
+    with profiling() as profile:
+        assert globals.memory is profile
+        with profiling() as inner:
+            assert globals.memory is inner
+        assert globals.memory is profile
+    assert globals.memory is None
+
+    profile = Memory_Profile()
+    kept = []
+    with tracing():
+        profile.start()
+        kept.append(bytearray(100000))
+        profile.mark(Memory_Phase.growth)
+        bytearray(200000)
+        profile.mark(Memory_Phase.trade)
+    report = {phase.phase: phase for phase in profile.report()}
+    assert list(report) == list(Memory_Phase)
+    assert report[Memory_Phase.growth].months == 1
+    assert 100000 <= report[Memory_Phase.growth].size < 110000
+    assert abs(report[Memory_Phase.trade].size) < 10000
+    assert report[Memory_Phase.trade].peak > 190000
+    assert report[Memory_Phase.happiness] == \
+        (Memory_Phase.happiness, 1, 0, 0, 0)
+
+
+def test_sizes():
+    size = retained_size(lambda: [bytearray(1000) for _ in range(100)])
+    assert size.blocks >= 100
+    assert 100000 <= size.size < 120000
+    assert retained_size(lambda: bytearray(100000) and None).size < 1000
+
+    assert peak_size(lambda: bytearray(100000) and None) > 95000
+    assert peak_size(lambda: None) < 1000
+
+
+def test_profile_months():
+    interface = Interface("starting")
+    state = interface.state
+    digest = state.digest()
+    with raises(ValueError):
+        profile_months(state, 0)
+    report = profile_months(state, 3)
+    assert state.digest() == digest
+    assert report.months == 3
+    assert [phase.phase for phase in report.phases] == list(Memory_Phase)
+    assert all(phase.peak > 0 for phase in report.phases)
+    assert report.state.size > 0
+    assert abs(report.state.size - state_size(state).size) < 1000
+
+    # The game ends before the given months
+    assert profile_months(state, 1000).months < 1000
+
+    # Profiling doesn't change the simulation
+    copy = pickle.loads(pickle.dumps(state))
+    with profiling():
+        profiled = copy.do_month()
+    assert profiled.flat_values() == state.do_month().flat_values()
+
+
+def test_history_memory():
+    interface = Interface("starting")
+    interface.next_months(4)
+    memory = history_memory(interface.history)
+    assert memory.months == 4
+    assert memory.retained.size > 0
+    assert memory.whole_peak > 0 and memory.iterate_peak > 0
@@ -0,0 +1,73 @@
+import json
+import pickle
+
+from pytest import raises
+
+from ..sources.auxiliaries.enums import Class_Name, Resource
+from ..sources.state.month_data import MONTH_DATA_KEYS, Month_Data
+from ..sources.state.state_data import State_Data
+
+
+def make_month_data() -> Month_Data:
+    return Month_Data(
+        (1, 2, 3, 4, 5, 6),
+        [tuple(float(10 * owner + resource) for resource in range(6))
+         for owner in range(5)],
+        [(1, 1, 1, 1, 1, 1)] * 5,
+        (100, 200, 300, 400),
+        (90, 210, 300, 400),
+        [(True, False, False, False, False, True)] * 4,
+        (1, 2, 3, 4, 5),
+        (0.5, 0.6, 0.7, 0.8, 0.9),
+        (1, -1, 2, -2)
+    )
+
+
+def test_month_data():
+    data = make_month_data()
+    assert list(data) == list(MONTH_DATA_KEYS)
+    assert len(data) == 9
+    with raises(KeyError):
+        data["to_dict"]
+
+    assert data["prices"] == {
+        "food": 1, "wood": 2, "stone": 3, "iron": 4, "tools": 5, "land": 6
+    }
+    assert data["resources_after"]["government"]["stone"] == 42
+    assert data["change_resources"]["artisans"]["iron"] == 12
+    assert data["change_population"] == {
+        "nobles": 10, "artisans": -10, "peasants": 0, "others": 0
+    }
+    assert data["growth_modifiers"]["others"] == {
+        "starving": True, "freezing": False, "demoted_from": False,
+        "demoted_to": False, "promoted_from": False, "promoted_to": True
+    }
+    assert data["employees"]["government"] == 5
+    assert data["wages"]["nobles"] == 0.5
+    assert data["happiness"]["others"] == -2
+
+    # Every access makes new dicts
+    data["prices"]["food"] = 10
+    assert data["prices"]["food"] == 1
+
+    legacy = data.to_dict()
+    assert data == legacy
+    assert dict(data.items()) == legacy
+    assert pickle.loads(pickle.dumps(data)) == legacy
+
+
+def test_do_month_data():
+    with open("saves/starting/starting_state.json", 'r',
+              encoding="utf-8") as file:
+        state = State_Data.from_dict(json.load(file))
+    nobles_food = state.nobles.real_resources.food
+    data = state.do_month()
+    assert isinstance(data, Month_Data)
+    assert data["resources_after"]["nobles"]["food"] == \
+        state.nobles.real_resources.food
+    assert data["change_resources"]["nobles"]["food"] == \
+        state.nobles.real_resources.food - nobles_food
+    assert data["prices"]["tools"] == state.prices[Resource.tools]
+    assert data["population_after"]["others"] == \
+        state.classes[Class_Name.others].population
+    assert data["wages"]["government"] == state.government.old_wage
@@ -272,6 +272,38 @@ def test_net_worth():
     assert nobles.net_worth == 234567 + inbuilt_worth
 
 
+def test_derived_properties_cache():
+    state = State_Data()
+    nobles = Nobles(state, 20)
+    nobles.resources.food = -10
+    real_resources = nobles.real_resources
+    assert nobles.real_resources is real_resources
+    assert nobles.missing_resources is nobles.missing_resources
+    old_worth = nobles.net_worth
+
+    nobles.resources.food += 20
+    assert nobles.real_resources is not real_resources
+    assert nobles.real_resources.food == real_resources.food + 20
+    assert nobles.missing_resources.food == 0
+    assert real_resources == \
+        INBUILT_RESOURCES[Class_Name.nobles] * 20 + \
+        Resources({Resource.food: -10})
+
+    worth = nobles.net_worth
+    assert worth > old_worth
+    state.prices.food *= 2
+    assert nobles.net_worth > worth
+
+    nobles.resources.tools = 3000
+    max_employees = nobles.max_employees
+    state.sm.worker_land_usage /= 2
+    assert nobles.max_employees != max_employees
+
+    nobles.population = 10
+    assert nobles.real_resources == \
+        INBUILT_RESOURCES[Class_Name.nobles] * 10 + nobles.resources
+
+
 def test_max_employees_from_land():
     state = State_Data()
     state.sm.worker_land_usage = 10
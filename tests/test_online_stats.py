@@ -0,0 +1,61 @@
+from math import isnan
+from random import Random
+from statistics import mean, quantiles, variance
+
+from pytest import approx, raises
+
+from ..sources.auxiliaries.online_stats import Online_Stats, P2_Quantile
+
+
+def test_p2_quantile_small():
+    with raises(ValueError):
+        P2_Quantile(1.5)
+
+    quantile = P2_Quantile(0.5)
+    assert isnan(quantile.value)
+    for value in [5, 1, 3]:
+        quantile.add(value)
+    assert quantile.value == 3
+    quantile.add(4)
+    assert quantile.value == 3.5
+    quantile.add(2)
+    assert quantile.value == 3
+
+
+def test_p2_quantile_stream():
+    generator = Random(1)
+    values = [generator.gauss(10, 2) for _ in range(5000)]
+    exact = quantiles(values, n=20, method="inclusive")
+    for part, exact_value in [(0.05, exact[0]), (0.5, exact[9]),
+                              (0.95, exact[18])]:
+        quantile = P2_Quantile(part)
+        for value in values:
+            quantile.add(value)
+        assert quantile.value == approx(exact_value, abs=0.1)
+
+
+def test_online_stats():
+    stats = Online_Stats()
+    assert stats.variance == 0
+    stats.add(3)
+    assert stats.mean == 3
+    assert stats.variance == 0
+
+    generator = Random(2)
+    values = [3] + [generator.uniform(0, 100) for _ in range(999)]
+    for value in values[1:]:
+        stats.add(value)
+    assert stats.count == 1000
+    assert stats.mean == approx(mean(values))
+    assert stats.variance == approx(variance(values))
+    assert stats.std ** 2 == approx(stats.variance)
+    assert stats.min == min(values)
+    assert stats.max == max(values)
+    assert stats.quantile(0.5) == approx(50, abs=5)
+
+    data = stats.to_dict()
+    assert data["count"] == 1000
+    assert data["mean"] == stats.mean
+    assert set(data) == {
+        "count", "mean", "variance", "min", "max", "q0.05", "q0.5", "q0.95"
+    }
@@ -0,0 +1,115 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+
+from pytest import raises
+
+from ..sources.abstract_interface.interface import Interface
+from ..sources.abstract_interface.planner import (Decision, apply_action,
+                                                  candidate_actions, govern,
+                                                  plan, rollout, score)
+from ..sources.auxiliaries.enums import Class_Name, Resource
+from ..sources.auxiliaries.soldiers import Soldiers
+
+
+def test_do_month_without_report():
+    first = Interface("starting").state
+    second = Interface("starting").state
+    for _ in range(3):
+        assert first.do_month(report=False) is None
+        assert second.do_month() is not None
+    assert first.digest() == second.digest()
+
+
+def test_rollout():
+    state = Interface("starting").state
+    digest = state.digest()
+    snapshot = pickle.dumps(state)
+    baseline = rollout(snapshot, None, 2)
+    assert state.digest() == digest
+
+    for _ in range(2):
+        state.do_month()
+    assert baseline == score(state, 2, 2)
+    assert rollout(snapshot, "transfer peasants food 10", 2) != baseline
+
+
+def test_score():
+    state = Interface("starting").state
+    value = score(state, 3, 3)
+    assert score(state, 2, 3) == value - 1e6
+    state.classes[Class_Name.peasants].happiness = -50
+    assert score(state, 3, 3) == value - 25
+
+
+def test_candidate_actions():
+    state = Interface("starting").state
+    actions = candidate_actions(state)
+    assert actions[0] is None
+    assert "transfer peasants food 25.0" in actions
+    assert "secure food 25" in actions
+    assert "promote artisans 25" in actions
+    assert "laws set tax_personal nobles 0.05" in actions
+    assert not any(action.startswith(("promote others", "fight"))
+                   for action in actions[1:])
+
+    interface = Interface("starting")
+    for action in actions[1:]:
+        assert apply_action(interface, action), action
+        interface.undo()
+
+    state.government.soldiers = Soldiers(2)
+    assert {"fight crime None", "fight plunder 100"} \
+        <= set(candidate_actions(state))
+    assert not any(action and action.startswith("fight")
+                   for action in candidate_actions(state, fought=True))
+
+
+def test_apply_action():
+    interface = Interface("starting")
+    assert not apply_action(interface, None)
+    food = interface.state.government.resources.food
+    assert apply_action(interface, "transfer peasants food 10.0")
+    assert interface.state.government.resources.food == food - 10
+    assert interface.history.history_lines[-1] == \
+        "transfer peasants food 10.0"
+    assert not apply_action(interface, "transfer peasants food 1e9")
+    assert not apply_action(interface, "fight crime None")
+    assert apply_action(interface, "secure food 5")
+    assert interface.state.government.secure_resources[Resource.food] == 5
+    with raises(ValueError):
+        apply_action(interface, "dance")
+
+
+def test_plan():
+    state = Interface("starting").state
+    digest = state.digest()
+    decision = plan(state, horizon=2)
+    assert state.digest() == digest
+    assert decision.evaluated == decision.candidates
+    assert decision.score >= decision.baseline
+    assert decision.score == rollout(pickle.dumps(state), decision.action, 2)
+    with raises(ValueError):
+        plan(state, horizon=0)
+
+    with ProcessPoolExecutor(2) as executor:
+        assert plan(state, horizon=2, executor=executor) == decision
+
+    # The budget runs out at once - only doing nothing is rolled out
+    ticks = count()
+    assert plan(state, horizon=2, budget=0.5,
+                clock=lambda: next(ticks)) == \
+        Decision(None, decision.baseline, decision.baseline, 1,
+                 decision.candidates)
+
+
+def test_govern():
+    interface = Interface("starting")
+    months = interface.state.year * 12 + interface.state.month.value
+    decisions = govern(interface, 2, horizon=1)
+    assert len(decisions) == 2
+    assert interface.state.year * 12 + interface.state.month.value == \
+        months + 2
+    for decision in decisions:
+        if decision.action is not None:
+            assert decision.action in interface.history.history_lines
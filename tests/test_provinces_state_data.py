@@ -0,0 +1,187 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+
+from pytest import approx, raises  # type: ignore
+
+from ..sources.auxiliaries.enums import Class_Name, Month, Resource, Soldier
+from ..sources.auxiliaries.memory import profiling
+from ..sources.auxiliaries.resources import Resources
+from ..sources.auxiliaries.soldiers import Soldiers
+from ..sources.state.government import Government
+from ..sources.state.provinces_state_data import Provinces_State_Data
+from ..sources.state.social_classes.artisans import Artisans
+from ..sources.state.social_classes.nobles import Nobles
+from ..sources.state.social_classes.others import Others
+from ..sources.state.social_classes.peasants import Peasants
+from ..sources.state.state_data import State_Data
+
+
+def create_province(size: float) -> State_Data:
+    state = State_Data(Month.March, 3)
+    resources = Resources({
+        Resource.food: 200 * size,
+        Resource.wood: 100 * size,
+        Resource.stone: 50 * size,
+        Resource.iron: 20 * size,
+        Resource.tools: 50 * size,
+        Resource.land: 0
+    })
+    nobles = Nobles(
+        state, 5 * size, resources + Resources({Resource.land: 500 * size})
+    )
+    artisans = Artisans(state, 20 * size, resources)
+    peasants = Peasants(
+        state, 50 * size, resources + Resources({Resource.land: 100 * size})
+    )
+    others = Others(state, 100 * size, resources)
+    state.classes = {
+        Class_Name.nobles: nobles,
+        Class_Name.artisans: artisans,
+        Class_Name.peasants: peasants,
+        Class_Name.others: others
+    }
+    state.government = Government(
+        state, resources + Resources({Resource.land: 50 * size}),
+        soldiers=Soldiers({Soldier.footmen: 10 * size})
+    )
+    state.brigands = size
+    return state
+
+
+def test_from_states():
+    provinces = [create_province(1), create_province(2)]
+    country = Provinces_State_Data.from_states(provinces)
+
+    assert country.month == Month.March
+    assert country.year == 3
+    assert country.provinces == provinces
+    assert len(list(country)) == 8
+    assert len(country.market.trading_objs) == 9
+    assert country.market.trading_objs[-1] is country.government
+
+    assert country.government.soldiers.footmen == approx(30)
+    assert country.government.resources == Resources({
+        Resource.food: 600,
+        Resource.wood: 300,
+        Resource.stone: 150,
+        Resource.iron: 60
+    })
+    assert country.brigands == approx(3)
+    for province, size in zip(provinces, [1, 2]):
+        assert province.government.soldiers.footmen == 0
+        assert province.government.resources == Resources({
+            Resource.tools: 50 * size,
+            Resource.land: 50 * size
+        })
+        assert province.brigands == 0
+
+    with raises(ValueError):
+        Provinces_State_Data.from_states([])
+
+
+def test_do_month():
+    country = Provinces_State_Data.from_states(
+        [create_province(size) for size in (1, 2, 3)]
+    )
+    country.sm.others_minimum_wage = 0.3
+    month_data = country.do_provinces_month()
+
+    assert len(month_data) == 3
+    assert country.month == Month.April
+    for province in country.provinces:
+        assert province.month == Month.April
+        assert province.prices == country.prices
+        assert province.sm.others_minimum_wage == 0.3
+        assert province.government.resources.food == 0
+    for data in month_data:
+        assert data["prices"] == country.prices.to_raw_dict()
+        assert set(data["population_after"]) == \
+            {class_name.name for class_name in Class_Name}
+
+
+def test_country_month_data():
+    country = Provinces_State_Data.from_states(
+        [create_province(size) for size in (1, 2)]
+    )
+    population = sum(social_class.population for social_class in country)
+    data = country.do_month()
+    assert data is not None
+    assert sum(data.old_population) == approx(population)
+    assert sum(data.population) == approx(
+        sum(social_class.population for social_class in country)
+    )
+    assert data.resources[-1][Resource.land.value] == approx(sum(
+        province.government.real_resources.land
+        for province in country.provinces
+    ) + country.government.real_resources.land)
+    for index, class_name in enumerate(Class_Name):
+        classes = [province.classes[class_name]
+                   for province in country.provinces]
+        assert data.happiness[index] == approx(
+            sum(social_class.happiness * social_class.population
+                for social_class in classes)
+            / sum(social_class.population for social_class in classes)
+        )
+    assert country.do_month(report=False) is None
+    assert country.month == Month.May
+
+
+def test_memory_profile():
+    country = Provinces_State_Data.from_states(
+        [create_province(size) for size in (1, 2)]
+    )
+    with profiling() as profile, ProcessPoolExecutor(2) as executor:
+        country.do_provinces_month(executor, 2)
+    assert profile.months == 1
+    assert all(phase.peak > 0 for phase in profile.report())
+
+
+def test_digest():
+    country = Provinces_State_Data.from_states(
+        [create_province(size) for size in (1, 2)]
+    )
+    digest = country.digest()
+    assert Provinces_State_Data.from_states(
+        [create_province(size) for size in (1, 2)]
+    ).digest() == digest
+    country.provinces[1].others.resources.food += 1
+    assert country.digest() != digest
+
+
+def test_do_month_with_executor():
+    sequential = Provinces_State_Data.from_states(
+        [create_province(size) for size in (1, 2, 3, 4)]
+    )
+    sharded = Provinces_State_Data.from_states(
+        [create_province(size) for size in (1, 2, 3, 4)]
+    )
+    with ProcessPoolExecutor(2) as executor:
+        for _ in range(3):
+            assert sharded.do_provinces_month(executor, 2) == \
+                sequential.do_provinces_month()
+
+    assert sharded.government.resources == sequential.government.resources
+    assert sharded.digest() == sequential.digest()
+    for province in sharded.provinces:
+        assert province.nobles.parent is province
+    assert sharded.market.trading_objs[:4] == \
+        list(sharded.provinces[0])
+
+
+def test_held_executor():
+    sequential = Provinces_State_Data.from_states(
+        [create_province(size) for size in (1, 2, 3)]
+    )
+    with ProcessPoolExecutor(2) as executor:
+        sharded = Provinces_State_Data.from_states(
+            [create_province(size) for size in (1, 2, 3)], executor, 2
+        )
+        assert sharded.do_month() == sequential.do_month()
+        assert sharded.digest() == sequential.digest()
+
+        copy = pickle.loads(pickle.dumps(sharded))
+        assert copy.executor is None and sharded.executor is executor
+        assert deepcopy(sharded).executor is None
+        assert copy.do_month() == sharded.do_month()
+        assert copy.digest() == sharded.digest()
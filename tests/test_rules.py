@@ -0,0 +1,54 @@
+import pickle
+from copy import deepcopy
+
+from ..sources.auxiliaries.constants import (FOOD_RATIOS, INBUILT_RESOURCES,
+                                             WOOD_CONSUMPTION)
+from ..sources.auxiliaries.enums import Class_Name, Month, Resource
+from ..sources.auxiliaries.resources import Resources
+from ..sources.state.rules import Rules
+from ..sources.state.state_data import State_Data
+
+
+def test_constant_tables():
+    assert Rules.inbuilt_deltas[Class_Name.nobles, Class_Name.peasants] == \
+        INBUILT_RESOURCES[Class_Name.nobles] - \
+        INBUILT_RESOURCES[Class_Name.peasants]
+    assert Rules.inbuilt_deltas[Class_Name.others, Class_Name.others] == \
+        Resources()
+    assert Rules.demotion_deltas[Class_Name.artisans, Class_Name.others] == (
+        (Resource.wood, 2), (Resource.iron, 1), (Resource.tools, 3)
+    )
+    assert Rules.demotion_deltas[Class_Name.others, Class_Name.nobles] == ()
+    assert Rules.yearly_wood_consumption == sum(WOOD_CONSUMPTION.values())
+
+
+def test_modifier_tables():
+    state = State_Data.generate_empty_state()
+    rules = state.sm.rules
+    assert rules.food_production == FOOD_RATIOS * state.sm.avg_food_production
+    assert state.sm.food_production is rules.food_production
+    assert rules.production[Month.August] == Resources({
+        Resource.food: rules.food_production[Month.August],
+        Resource.wood: state.sm.wood_production,
+        Resource.stone: state.sm.stone_production,
+        Resource.iron: state.sm.iron_production
+    })
+
+    # Only the tables depending on the changed modifier are recalculated
+    food_production = rules.food_production
+    state.sm.stone_production = 3
+    assert rules.food_production is food_production
+    assert all(production.stone == 3
+               for production in rules.production.values())
+    state.sm.avg_food_production = 1
+    assert rules.food_production == FOOD_RATIOS * 1
+    assert rules.production[Month.August].food == FOOD_RATIOS[Month.August]
+    assert rules.production[Month.August].stone == 3
+
+    # Copies keep their own, consistent tables
+    for copy in [deepcopy(state), pickle.loads(pickle.dumps(state))]:
+        assert copy.sm.rules is not rules
+        copy.sm.iron_production = 7
+        assert copy.sm.rules.production[Month.May].iron == 7
+        assert copy.sm.rules.production[Month.May].stone == 3
+        assert rules.production[Month.May].iron != 7
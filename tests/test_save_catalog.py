@@ -0,0 +1,200 @@
+import json
+import os
+import time
+from threading import Thread
+from typing import Any
+
+from ..sources.abstract_interface.interface import Interface
+from ..sources.abstract_interface.save_catalog import (CATALOG_LOCK_TIMEOUT,
+                                                       Save_Catalog,
+                                                       _last_checkpoint)
+from ..sources.auxiliaries.enums import Month
+from ..sources.auxiliaries.testing import replace
+from ..sources.state.state_data import State_Data
+
+
+def make_save(saves_dir: Any, name: str, history_lines: list[str]
+              ) -> State_Data:
+    """
+    Writes a save with the starting state and the given history, returns the
+    state after the history is executed.
+    """
+    with open("saves/starting/starting_state.json", 'r',
+              encoding="utf-8") as file:
+        state = State_Data.from_dict(json.load(file))
+    os.mkdir(saves_dir / name)
+    with open(saves_dir / name / "starting_state.json", 'w',
+              encoding="utf-8") as file:
+        json.dump(state.to_dict(), file)
+    with open(saves_dir / name / "history.txt", 'w', encoding="utf-8") as file:
+        for line in history_lines:
+            file.write(line + '\n')
+    state.execute_commands(history_lines)
+    return state
+
+
+def test_last_checkpoint():
+    assert _last_checkpoint([]) == 0
+    assert _last_checkpoint(["secure food 10"]) == 0
+    assert _last_checkpoint(["next 1", "secure food 10"]) == 1
+    assert _last_checkpoint(["next 1", "next 1", "transfer x", "next 1",
+                             "secure food 10", "optimal food 5"]) == 4
+
+
+def test_list_saves(tmp_path: Any):
+    state = make_save(tmp_path, "abc", ["next 1", "next 1"])
+    make_save(tmp_path, "empty", [])
+    os.mkdir(tmp_path / "incomplete")
+    catalog = Save_Catalog(str(tmp_path))
+
+    saves = catalog.list_saves()
+    assert list(saves) == ["abc", "empty"]
+    assert saves["abc"]["month"] == Month.March.name
+    assert saves["abc"]["year"] == 0
+    assert saves["abc"]["population"] == state.total_population
+    assert saves["abc"]["history_length"] == 2
+    assert saves["abc"]["last_checkpoint"] == 2
+    assert saves["abc"]["digest"] == state.digest()
+    assert saves["abc"]["size"] == \
+        os.path.getsize(tmp_path / "abc" / "starting_state.json") + \
+        os.path.getsize(tmp_path / "abc" / "history.txt")
+    assert saves["empty"]["month"] == Month.January.name
+    assert os.path.exists(tmp_path / "catalog.json")
+
+    # Entries are not rebuilt while the saves do not change
+    rebuilt: list[str] = []
+    old_rebuild = Save_Catalog._rebuild_info
+
+    def counting_rebuild(self: Save_Catalog, name: str, *args: Any) -> Any:
+        rebuilt.append(name)
+        return old_rebuild(self, name, *args)
+
+    with replace(Save_Catalog, "_rebuild_info", counting_rebuild):
+        assert catalog.list_saves() == saves
+        assert rebuilt == []
+
+        # Stale entries are rebuilt, removed saves are forgotten
+        with open(tmp_path / "abc" / "history.txt", 'a',
+                  encoding="utf-8") as file:
+            file.write("next 1\n")
+        os.remove(tmp_path / "empty" / "history.txt")
+        new_saves = catalog.list_saves()
+        assert rebuilt == ["abc"]
+        assert list(new_saves) == ["abc"]
+        assert new_saves["abc"]["month"] == Month.April.name
+        assert new_saves["abc"]["history_length"] == 3
+
+
+def test_broken_saves(tmp_path: Any):
+    make_save(tmp_path, "abc", [])
+    with open(tmp_path / "abc" / "history.txt", 'w', encoding="utf-8") as file:
+        file.write("nonsense\n")
+    catalog = Save_Catalog(str(tmp_path))
+    assert catalog.list_saves() == {}
+
+    rebuilt: list[str] = []
+
+    def counting_rebuild(self: Save_Catalog, name: str, *args: Any) -> Any:
+        rebuilt.append(name)
+        raise ValueError
+
+    with replace(Save_Catalog, "_rebuild_info", counting_rebuild):
+        assert catalog.list_saves() == {}
+        assert rebuilt == []
+
+    # Unreadable catalog files are ignored
+    with open(tmp_path / "catalog.json", 'w', encoding="utf-8") as file:
+        file.write("{")
+    assert catalog.list_saves() == {}
+
+
+def test_record_and_remove(tmp_path: Any):
+    state = make_save(tmp_path, "abc", ["next 1"])
+    catalog = Save_Catalog(str(tmp_path))
+    catalog.record("abc", state, ["next 1"])
+    with open(tmp_path / "catalog.json", 'r', encoding="utf-8") as file:
+        assert "abc" in json.load(file)["saves"]
+
+    with replace(Save_Catalog, "_rebuild_info", None):
+        saves = catalog.list_saves()
+    assert saves["abc"]["month"] == Month.February.name
+    assert saves["abc"]["last_checkpoint"] == 1
+
+    # Saves not written yet are not recorded
+    catalog.record("nothing", state, [])
+    assert list(catalog.list_saves()) == ["abc"]
+
+    catalog.remove("abc")
+    with open(tmp_path / "catalog.json", 'r', encoding="utf-8") as file:
+        assert json.load(file)["saves"] == {}
+    assert [name for name in os.listdir(tmp_path)
+            if name.endswith(".tmp")] == []
+
+
+def test_lock(tmp_path: Any):
+    state = make_save(tmp_path, "abc", [])
+    catalog = Save_Catalog(str(tmp_path))
+
+    # Another process holds the lock - recording waits until it's released
+    with catalog._locked():
+        thread = Thread(target=catalog.record, args=("abc", state, []))
+        thread.start()
+        time.sleep(0.1)
+        assert thread.is_alive()
+        assert not os.path.exists(catalog.catalog_path)
+    thread.join()
+    assert "abc" in catalog._read()["saves"]
+    assert not os.path.exists(catalog.lock_path)
+
+    # A lock left by a crashed process is taken over
+    open(catalog.lock_path, 'w').close()
+    old = time.time() - CATALOG_LOCK_TIMEOUT - 1
+    os.utime(catalog.lock_path, (old, old))
+    catalog.remove("abc")
+    assert catalog._read()["saves"] == {}
+    assert not os.path.exists(catalog.lock_path)
+
+
+def test_malformed_history(tmp_path: Any):
+    for name, line in [("transfer", "transfer"),
+                       ("conquest", "fight conquest"),
+                       ("recruit", "recruit nobles")]:
+        make_save(tmp_path, name, [])
+        with open(tmp_path / name / "history.txt", 'w',
+                  encoding="utf-8") as file:
+            file.write(line + "\n")
+    catalog = Save_Catalog(str(tmp_path))
+    assert catalog.list_saves() == {}
+    assert set(catalog._read()["broken"]) == \
+        {"transfer", "conquest", "recruit"}
+
+
+def test_game_over_history(tmp_path: Any):
+    make_save(tmp_path, "abc", [])
+    with open(tmp_path / "abc" / "history.txt", 'w', encoding="utf-8") as file:
+        file.write("next 1000\n")
+    catalog = Save_Catalog(str(tmp_path))
+    assert catalog.list_saves() == {}
+    assert list(catalog._read()["broken"]) == ["abc"]
+
+
+def test_interface_save_data_records(tmp_path: Any):
+    interface = Interface()
+    interface.load_data("starting")
+    interface.next_month()
+
+    records: list[Any] = []
+
+    def fake_record(self: Save_Catalog, name: str, state: State_Data,
+                    history_lines: list[str]) -> None:
+        records.append((self.saves_dir, name, state, list(history_lines)))
+
+    old_cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        os.makedirs("saves/abc")
+        with replace(Save_Catalog, "record", fake_record):
+            interface.save_data("abc")
+    finally:
+        os.chdir(old_cwd)
+    assert records == [("saves", "abc", interface.state, ["next 1"])]
@@ -0,0 +1,74 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from pytest import approx, raises
+
+from ..sources.abstract_interface.sensitivity import (analyse, get_modifier,
+                                                      modifier_names,
+                                                      set_modifier, simulate)
+from ..sources.auxiliaries.enums import Class_Name
+from ..sources.state.state_data import State_Data
+
+
+def load_starting() -> State_Data:
+    with open("saves/starting/starting_state.json", 'r',
+              encoding="utf-8") as file:
+        return State_Data.from_dict(json.load(file))
+
+
+def test_modifiers():
+    state = load_starting()
+    names = modifier_names(state.sm)
+    assert "worker_land_usage" in names
+    assert "tax_rates.income.peasants" in names
+    assert "parent" not in names and "max_prices" not in names
+
+    set_modifier(state.sm, "tax_rates.income.peasants", 0.3)
+    assert state.sm.tax_rates["income"][Class_Name.peasants] == 0.3
+    assert get_modifier(state.sm, "tax_rates.income.peasants") == 0.3
+    set_modifier(state.sm, "increase_price_factor", 2)
+    assert get_modifier(state.sm, "increase_price_factor") == 2
+    with raises(KeyError):
+        set_modifier(state.sm, "tax_rates.income.kings", 1)
+    with raises(KeyError):
+        set_modifier(state.sm, "kings", 1)
+
+
+def test_simulate():
+    state = load_starting()
+    outcomes = simulate(state.to_dict(), 3)
+    for _ in range(3):
+        state.do_month()
+    assert outcomes["months"] == 3
+    assert outcomes["population"] == \
+        sum(social_class.population for social_class in state)
+
+    # The game ends before the given months
+    assert simulate(state.to_dict(), 100)["months"] < 100
+
+
+def test_analyse():
+    state = load_starting()
+    with raises(ValueError):
+        analyse(state, 0)
+    digest = state.digest()
+    modifiers = ["default_growth_factor", "worker_land_usage",
+                 "tax_rates.personal.nobles"]
+    analysis = analyse(state, 6, modifiers)
+    assert state.digest() == digest
+    assert analysis.baseline == simulate(state.to_dict(), 6)
+    assert [sensitivity.modifier for sensitivity in analysis.sensitivities] \
+        == modifiers
+
+    growth = analysis.sensitivities[0]
+    assert (growth.low, growth.high) == (approx(0.09), approx(0.11))
+    # More growth means more people
+    assert growth.elasticities["population"] > 0
+    taxes = analysis.sensitivities[2]
+    assert (taxes.low, taxes.high) == (0, 0.01)
+    assert analysis.ranked("population")[0].elasticities["population"] == \
+        max(abs(sensitivity.elasticities["population"])
+            for sensitivity in analysis.sensitivities)
+
+    with ProcessPoolExecutor(2) as executor:
+        assert analyse(state, 6, modifiers, executor=executor) == analysis
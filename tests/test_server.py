@@ -0,0 +1,256 @@
+import asyncio
+import json
+import os
+import shutil
+from typing import Any
+
+from ..sources.auxiliaries import globals
+from ..sources.server.server import (SESSIONS_DIR, Simulation_Server,
+                                     _Thread_Output)
+
+
+def load_starting_dict() -> dict[str, Any]:
+    with open("saves/starting/starting_state.json", 'r',
+              encoding="utf-8") as file:
+        return json.load(file)
+
+
+def test_thread_output():
+    default: list[str] = []
+
+    class Fake_Output:
+        def write(self, __s: str, /) -> int:
+            default.append(__s)
+            return len(__s)
+
+    output = _Thread_Output(Fake_Output())  # type: ignore
+    output.write("a")
+    with output.capture() as buffer:
+        output.write("b")
+    output.write("c")
+    assert default == ["a", "c"]
+    assert buffer.getvalue() == "b"
+
+
+def test_requests():
+    async def run() -> None:
+        with Simulation_Server(2, 8) as server:
+            assert globals.confirmation is False
+            response = await server.handle({"op": "create"})
+            assert response["ok"] is True
+            assert response["month"] == "January"
+            session = response["session"]
+
+            response = await server.handle(
+                {"op": "next", "session": session, "months": 2}
+            )
+            assert response == {
+                "ok": True, "month": "March", "year": 0,
+                "population": response["population"]
+            }
+
+            response = await server.handle({
+                "op": "command", "session": session,
+                "command": "state population"
+            })
+            assert response["ok"] is True
+            assert response["succeeded"] is True
+            assert "Current population" in response["output"]
+
+            response = await server.handle({
+                "op": "command", "session": session, "command": "bogus"
+            })
+            assert response["succeeded"] is False
+
+            # Commands reaching beyond the session are not available, also
+            # abbreviated
+            for command in ["exit", "save x", "delete x", "deb on",
+                            "memory", "sensitivity", "govern 1"]:
+                response = await server.handle({
+                    "op": "command", "session": session, "command": command
+                })
+                assert response["ok"] is False
+                assert "not available" in response["error"]
+            assert globals.debug is False
+
+            # Ambiguous ones are left to the CLI
+            response = await server.handle({
+                "op": "command", "session": session, "command": "s"
+            })
+            assert response["ok"] is True
+            assert response["succeeded"] is False
+
+            response = await server.handle({
+                "op": "history", "session": session, "stat": "prices",
+                "months": 1
+            })
+            assert response["ok"] is True
+            assert len(response["data"]) == 1
+
+            for request in [
+                {"op": "nothing"}, [], {"op": "state", "session": "x"},
+                {"op": "next", "session": session, "months": 0},
+                {"op": "history", "session": session, "stat": "nothing"},
+                {"op": "command", "session": session},
+                {"op": "create", "save": "surely_nonexistent_save"}
+            ]:
+                response = await server.handle(request)
+                assert response["ok"] is False
+                assert response["error"] != ""
+
+            response = await server.handle({"op": "close",
+                                            "session": session})
+            assert response == {"ok": True}
+            response = await server.handle({"op": "state",
+                                            "session": session})
+            assert response["ok"] is False
+        assert globals.confirmation is None
+
+    asyncio.run(run())
+
+
+def test_eviction(tmp_path: Any):
+    starting = load_starting_dict()
+    old_cwd = os.getcwd()
+    os.chdir(tmp_path)
+    os.mkdir("saves")
+
+    async def run() -> None:
+        with Simulation_Server(2, 1) as server:
+            first = (await server.handle(
+                {"op": "create", "state": starting}
+            ))["session"]
+            await server.handle({"op": "next", "session": first})
+            await server.handle({
+                "op": "command", "session": first,
+                "command": "transfer nobles food 1"
+            })
+            # Secures everything - a fractional amount
+            await server.handle({
+                "op": "command", "session": first, "command": "secure wood"
+            })
+            interface = server.sessions[first].interface
+            assert interface is not None
+            interface.fought = True
+            interface.random.random()
+            random_state = interface.random.getstate()
+            history_lines = list(interface.history.history_lines)
+            digest = interface.state.digest()
+            second = (await server.handle(
+                {"op": "create", "state": starting}
+            ))["session"]
+            assert server.resident == 1
+            assert server.evictions == 1
+            assert server.sessions[first].interface is None
+            assert os.path.isfile(server.sessions[first].eviction_path)
+
+            response = await server.handle({"op": "state",
+                                            "session": first})
+            assert response["month"] == "February"
+            assert server.sessions[second].interface is None
+            interface = server.sessions[first].interface
+            assert interface is not None
+            assert interface.save_name is None
+            assert interface.fought is True
+            assert interface.history.history_lines == history_lines
+            assert len(history_lines) == 3
+            assert interface.state.digest() == digest
+            assert interface.random.getstate() == random_state
+            assert not os.path.exists(server.sessions[first].eviction_path)
+            response = await server.handle({
+                "op": "command", "session": first, "command": "undo"
+            })
+            assert response["succeeded"] is True
+            assert interface.history.history_lines == history_lines[:2]
+        assert not os.path.exists(f"saves/{SESSIONS_DIR}")
+
+    try:
+        asyncio.run(run())
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(tmp_path / "saves")
+
+
+def test_eviction_by_size(tmp_path: Any):
+    starting = load_starting_dict()
+    old_cwd = os.getcwd()
+    os.chdir(tmp_path)
+    os.mkdir("saves")
+
+    async def run() -> None:
+        with Simulation_Server(2, 8, 1) as server:
+            first = (await server.handle(
+                {"op": "create", "state": starting}
+            ))["session"]
+            size = server.sessions[first].size
+            assert size > 0
+            await server.handle({"op": "next", "session": first})
+            assert server.sessions[first].size > size
+            # A single session is kept even if it is too large
+            assert server.resident == 1
+
+            await server.handle({"op": "create", "state": starting})
+            assert server.resident == 1
+            assert server.sessions[first].interface is None
+        with Simulation_Server(2, 8, 10 ** 9) as server:
+            for _ in range(3):
+                await server.handle({"op": "create", "state": starting})
+            assert server.resident == 3
+
+        # Sessions aren't measured without the limit
+        with Simulation_Server(2, 8) as server:
+            session = (await server.handle(
+                {"op": "create", "state": starting}
+            ))["session"]
+            await server.handle({"op": "next", "session": session})
+            assert server.sessions[session].size == 0
+
+    try:
+        asyncio.run(run())
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(tmp_path / "saves")
+
+
+def test_concurrent_close():
+    async def run() -> None:
+        with Simulation_Server(2, 8) as server:
+            session = (await server.handle({"op": "create"}))["session"]
+            # Both requests find the session, then wait for its lock
+            lock = server.sessions[session].lock
+            await lock.acquire()
+            closes = [
+                asyncio.create_task(
+                    server.handle({"op": "close", "session": session})
+                )
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0)
+            lock.release()
+            responses = await asyncio.gather(*closes)
+            assert responses == [
+                {"ok": True}, {"ok": False, "error": "no such session"}
+            ]
+            assert server.sessions == {}
+
+    asyncio.run(run())
+
+
+def test_connection():
+    async def run() -> None:
+        with Simulation_Server(1, 4) as server:
+            tcp_server = await server.start()
+            port = tcp_server.sockets[0].getsockname()[1]
+            async with tcp_server:
+                reader, writer = await asyncio.open_connection(
+                    "127.0.0.1", port
+                )
+                writer.write(b'{"op": "create"}\nnot json\n')
+                await writer.drain()
+                created = json.loads(await reader.readline())
+                invalid = json.loads(await reader.readline())
+                writer.close()
+        assert created["ok"] is True
+        assert invalid == {"ok": False, "error": "invalid JSON"}
+
+    asyncio.run(run())
@@ -1,3 +1,4 @@
+import json
 from math import inf
 from random import randint
 from typing import Any, Callable, ParamSpec, Type, TypeVar
@@ -521,6 +522,33 @@ def test_set_employers_employees_not_all_employed():
     assert employers[3].increase_wage
 
 
+def test_split_employees_many_employers():
+    class Employer_Class:
+        def __init__(self, wage: float, max_emps: float) -> None:
+            self.wage = wage
+            self.max_employees = max_emps
+            self.employees = 0
+
+    employers = [
+        Employer_Class(randint(1, 100) / 100, randint(0, 1000))
+        for _ in range(500)
+    ]
+    employees = sum(employer.max_employees for employer in employers) / 2
+    split = State_Data._split_employees(employers,  # type: ignore
+                                        employees)
+
+    assert sum(split.values()) == approx(employees)
+    level = max(split[employer] / employer.wage
+                for employer in employers
+                if split[employer] < employer.max_employees)
+    for employer in employers:
+        assert split[employer] <= employer.max_employees
+        if split[employer] < employer.max_employees:
+            assert split[employer] == approx(level * employer.wage)
+        else:
+            assert employer.max_employees <= level * employer.wage + 1e-9
+
+
 def test_employees_to_profit():
     class Employer_Class:
         def __init__(self, employees: float) -> None:
@@ -564,6 +592,10 @@ def test_distribute_produced_and_used():
         def __init__(self, wage_share: float, resources: Resources) -> None:
             self.wage_share = wage_share
             self.resources = resources.copy()
+            self.cohorts = None
+
+        per_capita_income = Class.per_capita_income
+        _per_capita = Class._per_capita
 
     state = State_Data()
     state.prices = Resources({
@@ -1083,6 +1115,8 @@ def test_to_dict():
     })
     state.sm.others_minimum_wage = 0.6
     state.sm.max_prices = res * 2
+    state.brigands = 3
+    nobles.wage = 0.7
 
     data = {
         "year": 81,
@@ -1116,10 +1150,31 @@ def test_to_dict():
             },
             "wage_minimum": 0.6,
             "max_prices": (res * 2).to_raw_dict(),
+        },
+        "runtime": {
+            "brigands": 3,
+            "brigands_strength": state.brigands_strength,
+            "wages": {
+                "nobles": 0.7,
+                "artisans": 0,
+                "peasants": 0,
+                "others": 0
+            },
+            "market": None
         }
     }
     assert state.to_dict() == data
 
+    state.market.old_avail_res = res
+    data["runtime"]["market"] = res.to_raw_dict()  # type: ignore
+    assert state.to_dict() == data
+
+    loaded = State_Data.from_dict(data)
+    assert loaded.brigands == 3
+    assert loaded.nobles.wage == 0.7
+    assert loaded.market.old_avail_res == res
+    assert loaded.digest() == state.digest()
+
 
 def test_do_growth():
     grown: dict[Class_Name, float] = {}
@@ -2200,3 +2255,38 @@ def test_do_month():
         "peasants": state.peasants.happiness,
         "others": state.others.happiness
     }
+
+
+def test_digest():
+    with open("saves/starting/starting_state.json", 'r',
+              encoding="utf-8") as file:
+        state = State_Data.from_dict(json.load(file))
+    state.prices.food = 3.0
+    digest = state.digest()
+    assert len(digest) == 32
+    assert state.digest() == digest
+    assert State_Data.from_dict(state.to_dict()).digest() == digest
+
+    state.prices.food += 1e-12
+    assert state.digest() == digest
+    assert state.digest(52) != digest
+
+    state.nobles.resources.food += 1
+    changed = state.digest()
+    assert changed != digest
+    state.nobles.resources.food -= 1
+    assert state.digest() == digest
+
+    for change in [
+        lambda: setattr(state, "brigands", 5),
+        lambda: setattr(state.sm, "nobles_cap", 2),
+        lambda: state.sm.tax_rates["income"].__setitem__(
+            Class_Name.others, 0.5
+        ),
+        lambda: setattr(state.government, "wage_autoregulation", False),
+        lambda: setattr(state, "month", Month.May),
+        lambda: state.nobles.split_into_cohorts(2)
+    ]:
+        change()
+        assert state.digest() not in {digest, changed}
+        changed = state.digest()
@@ -1,8 +1,9 @@
 from math import inf
 from typing import Any
 
-from pytest import approx  # type: ignore
+from pytest import approx, raises  # type: ignore
 
+from ..sources.abstract_interface.interface import Interface
 from ..sources.auxiliaries.constants import (BASE_BATTLE_LOSSES,
                                              INBUILT_RESOURCES,
                                              KNIGHT_FIGHTING_STRENGTH,
@@ -12,14 +13,15 @@ from ..sources.auxiliaries.constants import (BASE_BATTLE_LOSSES,
 from ..sources.auxiliaries.enums import Class_Name, Resource, Soldier
 from ..sources.auxiliaries.resources import Resources
 from ..sources.auxiliaries.soldiers import Soldiers
-from ..sources.auxiliaries.testing import replace
+from ..sources.auxiliaries.testing import attributes, replace
 from ..sources.state.government import Government
 from ..sources.state.social_classes.artisans import Artisans
 from ..sources.state.social_classes.class_file import Class
 from ..sources.state.social_classes.nobles import Nobles
 from ..sources.state.social_classes.others import Others
 from ..sources.state.social_classes.peasants import Peasants
-from ..sources.state.state_data import State_Data
+from ..sources.state.state_data import (Fight_Estimate, InvalidCommandError,
+                                        State_Data)
 
 
 def test_generate_empty_state():
@@ -35,11 +37,11 @@ def test_generate_empty_state():
     empties[2].lower_class = state.others
     empties[3].lower_class = state.others
     assert state.market is not None
-    assert vars(state.nobles) == vars(empties[0])
-    assert vars(state.artisans) == vars(empties[1])
-    assert vars(state.peasants) == vars(empties[2])
-    assert vars(state.others) == vars(empties[3])
-    assert vars(state.government) == vars(Government(state))
+    assert attributes(state.nobles) == attributes(empties[0])
+    assert attributes(state.artisans) == attributes(empties[1])
+    assert attributes(state.peasants) == attributes(empties[2])
+    assert attributes(state.others) == attributes(empties[3])
+    assert attributes(state.government) == attributes(Government(state))
 
 
 def test_demote_now():
@@ -302,6 +304,19 @@ def test_do_set_law():
     state.do_set_law("wage_minimum", None, 0.4)
     assert state.sm.others_minimum_wage == 0.4
 
+    # The government's old wage is not set until the next employment
+    state = Interface("starting").state
+    state.do_month()
+    state.do_set_law("wage_government", None, 0.5)
+    assert state.government.wage == 0.5
+    assert state.government.old_wage is None
+    assert state.to_dict()["government"]["old_wage"] is None
+    assert State_Data.from_dict(state.to_dict()).digest() == state.digest()
+    state.do_set_law("wage_autoregulation", None, 1)
+    assert state.government.wage == 0.5
+    state.do_month()
+    assert state.government.old_wage == 0.5
+
 
 def test_do_force_promotion():
     state = State_Data.generate_empty_state()
@@ -515,6 +530,61 @@ def test_do_fight_plunder_victory():
     assert state.government.resources == Resources(100) + gains
 
 
+def test_fight_estimate():
+    estimate = Fight_Estimate([(0.5, 0.1, 3), (0.1, 0.4, 1), (0.2, 0.3, 2)])
+    assert estimate.ally_losses == [0.1, 0.2, 0.5]
+    assert estimate.enemy_losses == [0.1, 0.3, 0.4]
+    assert estimate.profits == [1, 2, 3]
+    assert estimate.victory_chance == approx(2 / 3)
+
+    assert Fight_Estimate.quantile([1, 2, 3, 4], 0) == 1
+    assert Fight_Estimate.quantile([1, 2, 3, 4], 0.5) == 3
+    assert Fight_Estimate.quantile([1, 2, 3, 4], 1) == 4
+    values = list(range(100))
+    assert Fight_Estimate.summary(values, 0.9) == (5, 49.5, 95)
+
+    with raises(ValueError):
+        Fight_Estimate([])
+
+
+def test_estimate_fight():
+    state = State_Data()
+    soldiers = Soldiers({
+        Soldier.knights: 60 / KNIGHT_FIGHTING_STRENGTH,
+        Soldier.footmen: 60
+    })
+    state.government = Government(state, Resources(100), soldiers=soldiers)
+    state.brigands = 50
+    state.brigands_strength = 1.2
+
+    estimate = state.estimate_fight("conquest", [60, 240])
+    won_ally_loss, won_enemy_loss = \
+        State_Data._get_battle_losses(2)  # type: ignore
+    lost_ally_loss, lost_enemy_loss = \
+        State_Data._get_battle_losses(0.5)  # type: ignore
+    assert estimate.victory_chance == 0.5
+    assert estimate.ally_losses == [won_ally_loss, lost_ally_loss]
+    assert estimate.enemy_losses == [lost_enemy_loss, won_enemy_loss]
+    assert estimate.profits == [0, won_enemy_loss * PLUNDER_FACTOR]
+
+    estimate = state.estimate_fight("plunder", [240])
+    assert estimate.profits == [lost_enemy_loss * PLUNDER_FACTOR]
+
+    estimate = state.estimate_fight("crime", [50, 100], [1.2, 1.2])
+    assert estimate.ally_losses == [won_ally_loss, BASE_BATTLE_LOSSES]
+    assert estimate.profits == approx([
+        50 * won_enemy_loss, 100 * BASE_BATTLE_LOSSES
+    ])
+    assert estimate.victory_chance == 0.5
+
+    assert state.government.soldiers == soldiers
+    assert state.government.resources == Resources(100)
+    assert state.brigands == 50
+
+    with raises(InvalidCommandError):
+        state.estimate_fight("invalid", [60])
+
+
 def test_execute_commands():
     did_month = 0
     transfers: list[Any] = []
@@ -610,8 +680,8 @@ def test_execute_commands():
 
         state.execute_commands(["transfer nobles food -100",
                                 "transfer artisans land 50",
-                                "secure tools 340",
-                                "optimal wood 1000",
+                                "secure tools 340.5",
+                                "optimal wood 1000.25",
                                 "fight crime None",
                                 "recruit artisans 30"])
         assert did_month == 106
@@ -622,10 +692,10 @@ def test_execute_commands():
         ]
         assert secures == [
             (Resource.food, 200),
-            (Resource.tools, 340)
+            (Resource.tools, 340.5)
         ]
         assert optimals == [
-            (Resource.wood, 1000)
+            (Resource.wood, 1000.25)
         ]
         assert setlaws == [
             ("tax_property", "nobles", 0.4)
@@ -655,10 +725,10 @@ def test_execute_commands():
         ]
         assert secures == [
             (Resource.food, 200),
-            (Resource.tools, 340)
+            (Resource.tools, 340.5)
         ]
         assert optimals == [
-            (Resource.wood, 1000),
+            (Resource.wood, 1000.25),
             (Resource.iron, 0)
         ]
         assert setlaws == [
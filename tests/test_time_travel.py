@@ -0,0 +1,57 @@
+import json
+
+from pytest import raises
+
+from ..sources.abstract_interface.history import History
+from ..sources.abstract_interface.interface import Interface
+from ..sources.abstract_interface.time_travel import Time_Machine
+from ..sources.auxiliaries.enums import Class_Name, Resource
+from ..sources.state.state_data import State_Data
+
+
+def test_state_at():
+    interface = Interface("starting")
+    digests = [interface.state.digest()]
+    for month in range(15):
+        interface.next_month()
+        if month % 4 == 0:
+            interface.transfer_resources(Class_Name.nobles, Resource.wood, 1)
+        digests.append(interface.state.digest())
+
+    with raises(ValueError):
+        Time_Machine(interface.history, 0)
+    machine = Time_Machine(interface.history, 4, 3)
+    assert machine.months == 15
+    with raises(ValueError):
+        machine.state_at(16)
+    for month in [15, 3, 9, 0, 12, 13, 1, 9]:
+        assert machine.state_at(month).digest() == digests[month]
+    assert len(machine._cache) == 3
+    assert machine.state_at(9) is machine.state_at(9)
+
+    # Commands of the last month
+    interface.transfer_resources(Class_Name.nobles, Resource.wood, 1)
+    assert machine.state_at(15).digest() == interface.state.digest()
+    assert machine.state_at(12).digest() == digests[12]
+
+    # Undone months
+    interface.undo()
+    interface.undo()
+    assert machine.months == 14
+    assert machine.state_at(14).digest() == digests[14]
+    assert machine.state_at(5).digest() == digests[5]
+
+
+def test_state_at_skipped():
+    with open("saves/starting/starting_state.json", 'r',
+              encoding="utf-8") as file:
+        starting_state = json.load(file)
+    lines = ["next 2", "skip 4 1", "next 1"]
+    machine = Time_Machine(History(starting_state, lines), 2)
+    assert machine.months == 7
+
+    for month, commands in [(3, ["next 2", "skip 1 1"]),
+                            (6, ["next 2", "skip 4 1"]), (7, lines)]:
+        state = State_Data.from_dict(starting_state)
+        state.execute_commands(commands)
+        assert machine.state_at(month).digest() == state.digest()
@@ -0,0 +1,91 @@
+import json
+from io import StringIO
+
+from pytest import raises
+
+from ..sources.auxiliaries import globals
+from ..sources.auxiliaries.enums import Class_Name, Month
+from ..sources.auxiliaries.testing import replace
+from ..sources.auxiliaries.trace import Trace, Trace_Event, Trace_Phase
+from ..sources.state.state_data import State_Data
+
+
+def test_event_format():
+    assert Trace_Event(
+        Trace_Phase.month, date=(Month.March, 2)
+    ).format() == "Ending month March 2"
+    assert Trace_Event(
+        Trace_Phase.month, quantity=4, date=(Month.March, 2)
+    ).format() == "Ending month March 2 in 4 provinces"
+    assert Trace_Event(
+        Trace_Phase.growth, Class_Name.nobles, 1.5
+    ).format() == "Grown 1.5 nobles"
+    assert Trace_Event(
+        Trace_Phase.starvation, Class_Name.others, 3
+    ).format() == "Starved 3 others"
+    assert Trace_Event(
+        Trace_Phase.demotion, Class_Name.artisans, 2
+    ).format() == "Demoted 2 artisans"
+    assert Trace_Event(
+        Trace_Phase.promotion, Class_Name.peasants, 2, (Class_Name.nobles,)
+    ).format() == "Promoted 2 peasants to nobles"
+    assert Trace_Event(
+        Trace_Phase.double_promotion, Class_Name.others, 2,
+        (Class_Name.artisans, Class_Name.peasants)
+    ).format() == "Double promoted 2 others to artisans and peasants"
+
+
+def test_ring_buffer():
+    with raises(ValueError):
+        Trace(0)
+
+    trace = Trace(3)
+    assert trace.capacity == 3
+    for number in range(5):
+        trace.record(Trace_Event(Trace_Phase.growth, Class_Name.nobles,
+                                 number))
+    assert len(trace) == 3
+    assert trace.recorded == 5
+    assert trace.dropped == 2
+    assert trace.format() == [
+        "Grown 2 nobles", "Grown 3 nobles", "Grown 4 nobles"
+    ]
+    assert trace.format(1) == ["Grown 4 nobles"]
+    assert trace.format(0) == []
+    assert trace.format(10) == trace.format()
+
+    out = StringIO()
+    trace.dump(out, 2)
+    assert out.getvalue() == "Grown 3 nobles" "Grown 4 nobles"
+
+    trace.clear()
+    assert len(trace) == 0
+    assert trace.dropped == 0
+
+
+def test_do_month_trace():
+    with open("saves/starting/starting_state.json", 'r',
+              encoding="utf-8") as file:
+        data = json.load(file)
+
+    trace = Trace()
+    formatted: list[Trace_Event] = []
+
+    def counting_format(self: Trace_Event) -> str:
+        formatted.append(self)
+        return ""
+
+    with replace(globals, "trace", trace), \
+            replace(Trace_Event, "format", counting_format):
+        with replace(globals, "debug", False):
+            State_Data.from_dict(data).do_month()
+        assert len(trace) == 0
+
+        with replace(globals, "debug", True):
+            State_Data.from_dict(data).do_month()
+        assert trace.events[0] == \
+            Trace_Event(Trace_Phase.month, date=(Month.January, 0))
+        phases = {event.phase for event in trace.events}
+        assert {Trace_Phase.growth, Trace_Phase.demotion} <= phases
+        # Nothing is formatted until the trace is viewed
+        assert formatted == []